@@ -2,110 +2,216 @@
 """
 Build CMS Logo Sprite Sheet
 Downloads logos from sources and creates a monochrome SVG sprite sheet
-Usage: python3 build-logo-sprite.py
+Usage: python3 build-logo-sprite.py [--optimize-rasters] [--raster-format auto|png|webp|avif]
+                                    [--minify] [--precision N] [--trace-memory]
+                                    [--workers N] [--per-host N] [--retries N] [--offline]
+                                    [--shared-library] [--symbols [--preview]]
+
+Downloads go into a content-addressed store (scripts/asset_store.py): each
+logo is saved once as temp_logos/store/<sha256>.<ext>, and
+logo-sources.lock.json records the blob and ETag/Last-Modified of every
+source URL. Reruns revalidate with conditional requests, so only changed
+logos are transferred, and share keep-alive connections per host through
+scripts/http_client.py. The lockfile is rewritten after every online run;
+URLs no longer in logo-sources.json are dropped with their blobs.
+
+All logos are fetched first, by --workers threads with at most --per-host
+requests to one host at a time; failed requests are retried --retries
+times with exponential backoff. The sheet is then built from the store
+only, and the run ends with the time spent in each phase.
+
+--offline makes no requests at all: every logo is taken from the lockfile
+and its blob is checked against the locked SHA256. A logo that is not
+locked, or whose blob is missing or modified, fails the build, so the same
+lockfile always gives the same sheet.
+
+--optimize-rasters (needs Pillow) downscales PNG logos to 2x the logo size,
+strips metadata and re-encodes them before embedding; results are cached in
+temp_logos/.optimized/ (see scripts/raster_optimize.py).
+
+--minify rounds each logo's coordinates to --precision decimals and strips
+editor metadata, empty groups and duplicate defs (scripts/svg_minify.py),
+printing the bytes saved per logo.
+
+The sheet is written one logo at a time: each logo's group is serialized as
+soon as it is built (PNG data is base64-encoded into it in chunks, see
+scripts/sprite_stream.py) and only one logo is held in memory. The output is
+the same as indenting and writing the whole tree at once. --trace-memory
+prints the peak heap next to the largest logo: a fixed ~0.2 MB (copy buffer
+and interpreter state) plus the parsed tree of one logo, whatever the
+number of logos, so for small logos it is many times the largest one.
+
+--shared-library stores each vector logo once in shared-symbols.svg, the
+library shared with the druplicon sprite (scripts/symbol_library.py), and
+draws it with <use>. PNG logos stay inline: they rely on the theme filters
+defined in this sheet.
+
+--symbols writes cms-logo-symbols.svg instead of the positioned grid: one
+<symbol id="cms-logo-<name>"> per logo, with the logo's internal ids
+prefixed by its symbol id so logos cannot clash, for slides to reference
+one logo with <use href="cms-logo-symbols.svg#cms-logo-drupal"/>. The
+symbol sheet carries the theme CSS and the theme-light/theme-dark filters
+itself, so PNG logos keep their theming when used from it. --preview
+also writes cms-logos-preview.svg, the same grid drawn with <use>, whose
+CSS points at the symbol sheet's filters.
+scripts/bench_logo_sheet.py compares the two forms in a headless browser.
+
+Logos are merged into either output without id clashes: every id inside a
+logo is prefixed with the logo's own id (url(#...), href and CSS references
+are rewritten to match), and <filter>s, such as the theme-light/theme-dark
+filters every PNG wrapper declares, are hoisted into one shared <defs> at
+the top of the sheet, once per distinct filter. The run reports duplicate
+ids before and after merging, and the output size.
 """
 
+import argparse
+import io
 import json
 import re
-import urllib.request
+import sys
+import threading
+import time
 import urllib.error
 import base64
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from xml.etree import ElementTree as ET
 
+# Shared helpers live in the repository's scripts/ directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from asset_store import AssetStore, OfflineError  # noqa: E402
+import build_stats  # noqa: E402
+from http_client import HttpClient  # noqa: E402
+from css_colors import luminance as css_luminance, parse_rgb  # noqa: E402
+import raster_optimize  # noqa: E402
+import sprite_stream  # noqa: E402
+import svg_minify  # noqa: E402
+import symbol_library  # noqa: E402
+
 # Configuration
 SOURCE_FILE = Path(__file__).parent / "logo-sources.json"
 OUTPUT_FILE = Path(__file__).parent / "cms-logos.svg"
+SYMBOLS_FILE = Path(__file__).parent / "cms-logo-symbols.svg"  # --symbols output
+PREVIEW_FILE = Path(__file__).parent / "cms-logos-preview.svg"  # --preview grid of <use>s
+SYMBOL_PREFIX = 'cms-logo-'
 TEMP_DIR = Path(__file__).parent / "temp_logos"
+STORE_DIR = TEMP_DIR / "store"  # downloaded logos, named by SHA256
+LOCK_FILE = Path(__file__).parent / "logo-sources.lock.json"
 GRID_SIZE = 150  # Spacing between logos
 LOGO_MAX_SIZE = 100  # Maximum width/height for each logo
+DOWNLOAD_TIMEOUT = 10  # seconds per request
+DEFAULT_WORKERS = 8
+DEFAULT_PER_HOST = 2
+DEFAULT_RETRIES = 2
+PRINT_LOCK = threading.Lock()  # download status lines come from worker threads
+LUMINANCE_MODEL = 'rec601'  # Greyscale weights (see scripts/css_colors.py)
+OPTIMIZED_DIR = TEMP_DIR / ".optimized"  # --optimize-rasters output cache
+IMAGE_MIME_TYPES = {'.png': 'image/png', '.jpg': 'image/jpeg', '.webp': 'image/webp', '.avif': 'image/avif'}
+BODY_FILE = TEMP_DIR / ".sheet-body.part"  # logos are streamed here until the sheet height is known
+RASTER_PLACEHOLDER = 'RASTER-DATA'  # stands in for base64 PNG data until write_element()
+XMLNS_RE = re.compile(r' xmlns(?::([\w.-]+))?="([^"]*)"')
+NS_SVG = 'http://www.w3.org/2000/svg'
+KNOWN_NAMESPACES = {NS_SVG, 'http://www.w3.org/1999/xlink'}
+# CSS for light/dark mode theming of the grid
+SHEET_CSS = '''
+        /* Default: dark text for light backgrounds */
+        .logo-sprite { color: #2d2d2d; }
+
+        /* Dark mode: light text for dark backgrounds */
+        @media (prefers-color-scheme: dark) {
+            .logo-sprite { color: #cccccc; }
+            .logo-sprite .png-logo .theme-aware { filter: url(#theme-dark); }
+        }
+
+        /* Explicit theme classes */
+        .logo-sprite.theme-light { color: #2d2d2d; }
+        .logo-sprite.theme-light .png-logo .theme-aware { filter: url(#theme-light); }
+        .logo-sprite.theme-dark { color: #cccccc; }
+        .logo-sprite.theme-dark .png-logo .theme-aware { filter: url(#theme-dark); }
+
+        /* Default PNG filter for light mode */
+        .png-logo .theme-aware { filter: url(#theme-light); }
+    '''
+# Filters every PNG wrapper declares; the CSS above applies them by id
+THEME_FILTERS = '''    <filter id="theme-light">
+      <feColorMatrix type="saturate" values="0"/>
+      <feComponentTransfer>
+        <feFuncR type="linear" slope="0.8"/>
+        <feFuncG type="linear" slope="0.8"/>
+        <feFuncB type="linear" slope="0.8"/>
+      </feComponentTransfer>
+    </filter>
+    <filter id="theme-dark">
+      <feColorMatrix type="saturate" values="0"/>
+      <feComponentTransfer>
+        <feFuncR type="linear" slope="1.5" intercept="0.2"/>
+        <feFuncG type="linear" slope="1.5" intercept="0.2"/>
+        <feFuncB type="linear" slope="1.5" intercept="0.2"/>
+      </feComponentTransfer>
+    </filter>
+'''
 
 def ensure_temp_dir():
     """Create temporary directory for downloads"""
     TEMP_DIR.mkdir(exist_ok=True)
     return TEMP_DIR
 
-def download_logo(url, name):
-    """Download logo from URL"""
-    safe_name = re.sub(r'[^a-z0-9]+', '-', name.lower())
+def log(message):
+    with PRINT_LOCK:
+        print(message)
+
+def download_logo(url, name, store, retries=0, offline=False):
+    """Fetch a logo into the asset store (or, offline, look it up); returns its blob path"""
+    if offline:
+        try:
+            return Path(store.resolve(url))
+        except OfflineError as e:
+            log(f"✗ {name}: {e}")
+            return None
     ext = '.svg' if url.endswith('.svg') else '.png'
-    output_path = TEMP_DIR / f"{safe_name}{ext}"
-    
-    if output_path.exists():
-        print(f"✓ Already downloaded: {name}")
-        return output_path
     
     try:
-        print(f"Downloading {name} from {url}")
-        headers = {'User-Agent': 'Mozilla/5.0 (CMS Logo Sprite Builder)'}
-        req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=10) as response:
-            content = response.read()
-            output_path.write_bytes(content)
-        print(f"✓ Downloaded: {name}")
-        return output_path
+        path, status = store.fetch(url, ext, timeout=DOWNLOAD_TIMEOUT, retries=retries)
+        if status in ('not-modified', 'unchanged'):
+            log(f"✓ Not modified: {name}")
+        elif status == 'changed':
+            log(f"✓ Updated (changed upstream): {name}")
+        else:
+            log(f"✓ Downloaded: {name}")
+        return Path(path)
     except urllib.error.URLError as e:
-        print(f"✗ Failed to download {name}: {e}")
-        return None
+        try:
+            path = Path(store.resolve(url))
+        except OfflineError:
+            log(f"✗ Failed to download {name}: {e}")
+            return None
+        log(f"⚠ Could not revalidate {name} ({e}); using locked copy")
+        return path
     except Exception as e:
-        print(f"✗ Error downloading {name}: {e}")
+        log(f"✗ Error downloading {name}: {e}")
         return None
 
 def rgb_to_grayscale(color_str):
     """Convert RGB/hex color to grayscale hex"""
     if not color_str or color_str in ['none', 'transparent', 'currentColor']:
         return color_str
-    
-    # Handle hex colors
-    if color_str.startswith('#'):
-        hex_color = color_str.lstrip('#')
-        if len(hex_color) == 3:
-            hex_color = ''.join([c*2 for c in hex_color])
-        if len(hex_color) == 6:
-            r, g, b = int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
-            # Use luminance formula for better grayscale conversion
-            gray = int(0.299 * r + 0.587 * g + 0.114 * b)
-            return f'#{gray:02x}{gray:02x}{gray:02x}'
-    
-    # Handle rgb() colors
-    rgb_match = re.match(r'rgb\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)', color_str)
-    if rgb_match:
-        r, g, b = map(int, rgb_match.groups())
-        gray = int(0.299 * r + 0.587 * g + 0.114 * b)
-        return f'#{gray:02x}{gray:02x}{gray:02x}'
-    
-    # Default to black for unknown formats
-    return '#000000'
+    rgb = parse_color(color_str)
+    if not rgb:
+        # Default to black for unknown formats
+        return '#000000'
+    gray = int(luminance(rgb) * 255)
+    return f'#{gray:02x}{gray:02x}{gray:02x}'
 
 
 def parse_color(color_str):
     """Return (r,g,b) for a color string or None"""
-    if not color_str:
-        return None
-    s = color_str.strip().lower()
-    if s in ['none', 'transparent', 'currentcolor', 'currentcolor']:
-        return None
-    if s.startswith('#'):
-        hex_color = s.lstrip('#')
-        if len(hex_color) == 3:
-            hex_color = ''.join([c*2 for c in hex_color])
-        if len(hex_color) == 6:
-            try:
-                r = int(hex_color[0:2], 16)
-                g = int(hex_color[2:4], 16)
-                b = int(hex_color[4:6], 16)
-                return (r, g, b)
-            except Exception:
-                return None
-    m = re.match(r'rgb\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)', s)
-    if m:
-        return tuple(map(int, m.groups()))
-    return None
+    return parse_rgb(color_str)
 
 
 def luminance(rgb):
-    r, g, b = rgb
-    return 0.299 * r + 0.587 * g + 0.114 * b
+    """Luminance (0-1) used to sort colours into shade bins"""
+    return css_luminance(rgb, LUMINANCE_MODEL)
 
 def convert_to_grayscale(svg_path, desired_shades=None):
     """Convert SVG colors to currentColor for theme support.
@@ -352,35 +458,34 @@ def get_svg_viewbox(tree):
     height = re.sub(r'[^0-9.]', '', height)
     return [0, 0, float(width or 100), float(height or 100)]
 
-def convert_png_to_svg(png_path, max_size=100):
-    """Convert PNG to embedded SVG with base64 encoding and theme support"""
+def optimize_png(png_path, raster_format, reports):
+    """Downscaled/re-encoded copy of a PNG logo (or the original if not smaller)"""
+    sha1 = raster_optimize.sha1_file(png_path)
+    path, report = raster_optimize.optimize_raster(str(png_path), sha1, str(OPTIMIZED_DIR),
+                                                   size=LOGO_MAX_SIZE, fmt=raster_format)
+    reports.append(report)
+    return Path(path)
+
+def convert_png_to_svg(png_path, max_size=100, inline=True):
+    """Convert PNG to embedded SVG with base64 encoding and theme support
+
+    With inline=False the image data is left as RASTER_PLACEHOLDER for
+    write_element() to stream in.
+    """
     try:
-        # Read PNG file
-        png_data = png_path.read_bytes()
-        b64_data = base64.b64encode(png_data).decode('ascii')
+        # Read PNG file (or its optimized WebP/AVIF/PNG copy)
+        if inline:
+            b64_data = base64.b64encode(png_path.read_bytes()).decode('ascii')
+        else:
+            b64_data = RASTER_PLACEHOLDER
+        mime = IMAGE_MIME_TYPES.get(png_path.suffix.lower(), 'image/png')
         
         # Create SVG wrapper with filters for light/dark mode
         svg_str = f'''<?xml version="1.0" encoding="utf-8"?>
 <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {max_size} {max_size}" width="{max_size}" height="{max_size}" class="png-logo">
   <defs>
-    <filter id="theme-light">
-      <feColorMatrix type="saturate" values="0"/>
-      <feComponentTransfer>
-        <feFuncR type="linear" slope="0.8"/>
-        <feFuncG type="linear" slope="0.8"/>
-        <feFuncB type="linear" slope="0.8"/>
-      </feComponentTransfer>
-    </filter>
-    <filter id="theme-dark">
-      <feColorMatrix type="saturate" values="0"/>
-      <feComponentTransfer>
-        <feFuncR type="linear" slope="1.5" intercept="0.2"/>
-        <feFuncG type="linear" slope="1.5" intercept="0.2"/>
-        <feFuncB type="linear" slope="1.5" intercept="0.2"/>
-      </feComponentTransfer>
-    </filter>
-  </defs>
-  <image href="data:image/png;base64,{b64_data}" width="{max_size}" height="{max_size}" 
+{THEME_FILTERS}  </defs>
+  <image href="data:{mime};base64,{b64_data}" width="{max_size}" height="{max_size}" 
          class="theme-aware" preserveAspectRatio="xMidYMid meet"/>
 </svg>'''
         
@@ -390,147 +495,451 @@ def convert_png_to_svg(png_path, max_size=100):
         print(f"✗ Error converting PNG: {e}")
         return None
 
-def build_sprite_sheet(sources_data):
-    """Build the complete sprite sheet"""
+def minify_logo(tree, name, precision, extra=0):
+    """Minify a logo tree in place and print the bytes saved
+
+    `extra` counts bytes streamed in later (PNG data) in both totals.
+    """
+    root = tree.getroot()
+    before = len(ET.tostring(root)) + extra
+    stats = svg_minify.minify_tree(root, precision)
+    after = len(ET.tostring(root)) + extra
+    print(svg_minify.format_stats(name, before, after, stats))
+    return before, after
+
+def register_foreign_namespaces(elem, foreign):
+    """Give namespaces other than SVG/XLink one prefix for the whole sheet.
+
+    ElementTree numbers unknown namespaces ns0, ns1... per serialization, so
+    two logos written separately could otherwise reuse a prefix.
+    """
+    for e in elem.iter():
+        for name in [e.tag, *e.attrib]:
+            if isinstance(name, str) and name.startswith('{'):
+                uri = name[1:name.index('}')]
+                if uri not in KNOWN_NAMESPACES and uri not in foreign:
+                    foreign[uri] = f'n{len(foreign)}'
+                    ET.register_namespace(foreign[uri], uri)
+
+def share_logo(logo_svg, library, logo_id):
+    """Replace a vector logo's content with a <use> of its copy in the shared library
+
+    <title>/<desc> stay in place. Logos with markup in other namespaces are
+    left inline.
+    """
+    content = [child for child in logo_svg if child.tag not in (f'{{{NS_SVG}}}title', f'{{{NS_SVG}}}desc')]
+    inner = ''.join(ET.tostring(child, encoding='unicode') for child in content)
+    if any(uri not in KNOWN_NAMESPACES for _, uri in XMLNS_RE.findall(inner)):
+        return False
+    lib_id = library.add(logo_svg.get('viewBox'), XMLNS_RE.sub('', inner), logo_id)
+    for child in content:
+        logo_svg.remove(child)
+    ET.SubElement(logo_svg, 'use', library.use_attrs(lib_id, str(OUTPUT_FILE.parent)))
+    return True
+
+def count_duplicates(ids):
+    """How many ids in `ids` (a Counter) repeat an earlier one"""
+    return sum(n - 1 for n in ids.values() if n > 1)
+
+def merge_logo(elem, prefix, hoisted, stats):
+    """Scope one logo's ids before it joins the sheet; returns the hoisted ids it uses
+
+    <filter> definitions are moved into `hoisted` (id -> element), the
+    sheet's shared <defs>: the first of each distinct filter keeps its id
+    (the sheet CSS refers to #theme-light/#theme-dark), identical copies are
+    dropped and a different filter whose id is taken is renamed. Every other
+    id under `elem` gets `prefix`. References are rewritten to match.
+    """
+    mapping = {}
+    keys = {svg_minify.def_key(el): ident for ident, el in hoisted.items()}
+    for parent in list(elem.iter()):
+        for defs in [c for c in parent if c.tag == f'{{{NS_SVG}}}defs']:
+            for child in [c for c in defs if c.tag == f'{{{NS_SVG}}}filter' and c.get('id')]:
+                ident = child.get('id')
+                defs.remove(child)
+                key = svg_minify.def_key(child)
+                if key in keys:
+                    stats['dropped'] += 1
+                    stats['dropped_bytes'] += len(ET.tostring(child))
+                else:
+                    target = prefix + ident if ident in hoisted else ident
+                    child.set('id', target)
+                    hoisted[target] = child
+                    keys[key] = target
+                mapping[ident] = keys[key]
+            if len(defs) == 0:
+                parent.remove(defs)
+    svg_minify.rewrite_refs(elem, mapping)
+    stats['prefixed'] += svg_minify.prefix_ids(elem, prefix)
+    return set(mapping.values())
+
+def write_element(out, elem, namespaces, raster=None):
+    """Write one child of the sheet's root, indented as ET.indent() would
+
+    Namespace declarations are moved from the element into `namespaces`
+    (prefix -> URI) for the root tag. If `raster` is given, its base64 data
+    replaces RASTER_PLACEHOLDER a chunk at a time.
+    """
+    ET.indent(elem, space='  ', level=1)
+    elem.tail = None
+    text = ET.tostring(elem, encoding='unicode')
+    end = text.index('>')
+    for prefix, uri in XMLNS_RE.findall(text[:end]):
+        namespaces[prefix] = uri
+    text = XMLNS_RE.sub('', text[:end]) + text[end:]
+    out.write(b'\n  ')
+    if raster:
+        head, tail = text.split(RASTER_PLACEHOLDER, 1)
+        out.write(head.encode('utf-8'))
+        sprite_stream.write_base64(out, raster)
+        out.write(tail.encode('utf-8'))
+    else:
+        out.write(text.encode('utf-8'))
+
+def defs_bytes(hoisted, namespaces):
+    """The shared <defs> element, serialized like the other root children"""
+    if not hoisted:
+        return b''
+    defs = ET.Element('defs')
+    defs.extend(hoisted.values())
+    buf = io.BytesIO()
+    write_element(buf, defs, namespaces)
+    return buf.getvalue()
+
+def write_sheet(body_path, namespaces, height, hoisted=None):
+    """Wrap the streamed logos in the root <svg> now that the height is known"""
+    defs = defs_bytes(hoisted, namespaces)
+    decls = ''.join(f' xmlns{":" + prefix if prefix else ""}="{uri}"'
+                    for prefix, uri in sorted(namespaces.items()))
+    with open(OUTPUT_FILE, 'wb') as out:
+        out.write(b"<?xml version='1.0' encoding='utf-8'?>\n")
+        out.write(f'<svg{decls} viewBox="0 0 1200 {height}" width="1200" height="{height}" '
+                  f'class="logo-sprite">'.encode('utf-8'))
+        out.write(defs)
+        sprite_stream.copy_file(out, body_path)
+        out.write(b'\n</svg>')
+
+def write_symbol_sheet(body_path, namespaces, hoisted=None):
+    """Wrap the streamed <symbol>s (after the theme <style>) in the root <svg> of SYMBOLS_FILE"""
+    defs = defs_bytes(hoisted, namespaces)
+    decls = ''.join(f' xmlns{":" + prefix if prefix else ""}="{uri}"'
+                    for prefix, uri in sorted(namespaces.items()))
+    with open(SYMBOLS_FILE, 'wb') as out:
+        out.write(b"<?xml version='1.0' encoding='utf-8'?>\n")
+        out.write(f'<svg{decls}>'.encode('utf-8'))
+        out.write(defs)
+        sprite_stream.copy_file(out, body_path)
+        out.write(b'\n</svg>')
+
+def write_preview(placements, height):
+    """PREVIEW_FILE: the grid layout, drawing each logo with <use> from SYMBOLS_FILE
+
+    The theme filters live in SYMBOLS_FILE, so the CSS refers to them there.
+    """
+    root = ET.Element('svg', {'xmlns': NS_SVG, 'viewBox': f'0 0 1200 {height}', 'width': '1200',
+                              'height': str(height), 'class': 'logo-sprite'})
+    ET.SubElement(root, 'style').text = SHEET_CSS.replace('url(#', f'url({SYMBOLS_FILE.name}#')
+    ET.SubElement(root, 'title').text = 'Open Source Platform Logos (preview)'
+    for symbol_id, name, x, y, w, h in placements:
+        group = ET.SubElement(root, 'g', {'transform': f'translate({x}, {y})'})
+        ET.SubElement(group, 'title').text = name
+        ET.SubElement(group, 'use', {'href': f'{SYMBOLS_FILE.name}#{symbol_id}', 'width': str(w), 'height': str(h)})
+    ET.indent(root, space='  ')
+    ET.ElementTree(root).write(PREVIEW_FILE, encoding='utf-8', xml_declaration=True)
+
+def prefetch_logos(sources_data, workers=DEFAULT_WORKERS, per_host=DEFAULT_PER_HOST, retries=DEFAULT_RETRIES,
+                   offline=False, stats=None):
+    """Download every logo concurrently; returns {(name, url): blob path or None}"""
+    stats = stats or build_stats.BuildStats('build-logo-sprite')
     ensure_temp_dir()
+    client = HttpClient(headers={'User-Agent': 'Mozilla/5.0 (CMS Logo Sprite Builder)'},
+                        timeout=DOWNLOAD_TIMEOUT, max_per_host=per_host)
+    store = AssetStore(str(STORE_DIR), str(LOCK_FILE), client=client)
+    keys = list(dict.fromkeys((item['name'], item['url']) for items in sources_data.values() for item in items))
     
-    # Create root SVG element
-    NS = {'svg': 'http://www.w3.org/2000/svg'}
-    ET.register_namespace('', NS['svg'])
+    def fetch(key):
+        start = time.perf_counter()
+        path = download_logo(key[1], key[0], store, retries, offline)
+        stats.add('fetch', key[0], time.perf_counter() - start,
+                  read=build_stats.file_size(path), cached=True if offline and path else None)
+        return path
     
-    root = ET.Element('svg', {
-        'viewBox': '0 0 1200 1200',
-        'width': '1200',
-        'height': '1200',
-        'class': 'logo-sprite'
-    })
-
-    # Add CSS for light/dark mode theming
-    style = ET.SubElement(root, 'style')
-    style.text = '''
-        /* Default: dark text for light backgrounds */
-        .logo-sprite { color: #2d2d2d; }
-
-        /* Dark mode: light text for dark backgrounds */
-        @media (prefers-color-scheme: dark) {
-            .logo-sprite { color: #cccccc; }
-            .logo-sprite .png-logo .theme-aware { filter: url(#theme-dark); }
-        }
-
-        /* Explicit theme classes */
-        .logo-sprite.theme-light { color: #2d2d2d; }
-        .logo-sprite.theme-light .png-logo .theme-aware { filter: url(#theme-light); }
-        .logo-sprite.theme-dark { color: #cccccc; }
-        .logo-sprite.theme-dark .png-logo .theme-aware { filter: url(#theme-dark); }
+    with stats.stage('fetch'):
+        if offline:
+            print(f"Resolving {len(keys)} logos from {LOCK_FILE.name} (offline)")
+            paths = [fetch(key) for key in keys]
+        else:
+            print(f"Fetching {len(keys)} logos with {workers} workers ({per_host} per host, {retries} retries)")
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                paths = list(pool.map(fetch, keys))
+            store.save(urls=[url for _, url in keys])
+            client.close()
+    stats.count('asset store', **store.stats)
+    print(f"  {store.summary()}")
+    if not offline:
+        stats.count('http', **client.stats)
+        print(f"  {client.summary()}")
+    return dict(zip(keys, paths))
 
-        /* Default PNG filter for light mode */
-        .png-logo .theme-aware { filter: url(#theme-light); }
-    '''
+def build_sprite_sheet(sources_data, downloaded, raster_format=None, precision=None, library=None,
+                       layout='grid', preview=False, stats=None):
+    """Build the complete sprite sheet from prefetch_logos() results
 
-    # Add title and description
-    title = ET.SubElement(root, 'title')
-    title.text = 'Open Source Platform Logos'
-    desc = ET.SubElement(root, 'desc')
-    desc.text = 'Monochrome logos for open source content management systems, frameworks, and platforms'
+    `precision` enables the minifier (decimal places kept in coordinates);
+    vector logos are moved into `library` (a SymbolLibrary) if given.
+    layout='symbols' writes SYMBOLS_FILE (and PREVIEW_FILE if `preview`)
+    instead of the grid. Per-logo timings go to `stats` (a BuildStats).
+    """
+    stats = stats or build_stats.BuildStats('build-logo-sprite')
+    ensure_temp_dir()
+    raster_reports = []
+    minified = [0, 0]  # bytes before/after --minify
     
-    # Position tracking
-    x_offset = 50
-    y_offset = 50
-    max_x = 0
-    row_height = 0
+    NS = {'svg': 'http://www.w3.org/2000/svg'}
+    ET.register_namespace('', NS['svg'])
     
-    # Process each category
-    for category, items in sources_data.items():
-        print(f"\n{'='*60}")
-        print(f"Processing category: {category}")
-        print(f"{'='*60}")
+    # Children of the root <svg> are streamed to BODY_FILE as they are built;
+    # write_sheet() adds the root once the final height is known
+    with sprite_stream.partial(BODY_FILE) as body:
+        namespaces = {}
+        foreign = {}
+        largest = (0, None)  # (size, path) of the largest logo, for --trace-memory
+        placements = []  # (symbol id, name, x, y, width, height) for the preview
+        hoisted = {}  # shared <defs> children by id, see merge_logo()
+        merge_stats = {'prefixed': 0, 'dropped': 0, 'dropped_bytes': 0}
+        raw_ids = Counter()  # ids as a plain concatenation of the logos would have them
+        final_ids = Counter()
+
+        style = ET.Element('style')
+        style.text = SHEET_CSS
+        write_element(body, style, namespaces)
+        if layout == 'symbols':
+            # The symbol sheet always defines the filters its CSS refers to
+            for theme_filter in ET.fromstring(f'<defs xmlns="{NS_SVG}">{THEME_FILTERS}</defs>'):
+                hoisted[theme_filter.get('id')] = theme_filter
+
+        # Add title and description
+        title = ET.Element('title')
+        title.text = 'Open Source Platform Logos'
+        write_element(body, title, namespaces)
+        desc = ET.Element('desc')
+        desc.text = 'Monochrome logos for open source content management systems, frameworks, and platforms'
+        write_element(body, desc, namespaces)
         
-        for item in items:
-            name = item['name']
-            description = item['description']
-            url = item['url']
-            
-            # Download logo
-            logo_path = download_logo(url, name)
-            if not logo_path or not logo_path.exists():
-                continue
+        # Position tracking
+        x_offset = 50
+        y_offset = 50
+        max_x = 0
+        row_height = 0
+        
+        # Process each category
+        for category, items in sources_data.items():
+            print(f"\n{'='*60}")
+            print(f"Processing category: {category}")
+            print(f"{'='*60}")
             
-            # Handle PNG files
-            if logo_path.suffix == '.png':
-                tree = convert_png_to_svg(logo_path, LOGO_MAX_SIZE)
-                if not tree:
-                    print(f"⚠ Skipping {name}: PNG conversion failed")
-                    continue
-            else:
-                # Convert SVG to grayscale; allow per-item shade overrides
-                tree = convert_to_grayscale(logo_path, item.get('shades'))
-                if not tree:
+            for item in items:
+                name = item['name']
+                description = item['description']
+                url = item['url']
+                
+                logo_path = downloaded.get((name, url))
+                if not logo_path or not logo_path.exists():
                     continue
-            
-            # Get original viewBox
-            viewbox = get_svg_viewbox(tree)
-            vb_width = viewbox[2] - viewbox[0]
-            vb_height = viewbox[3] - viewbox[1]
-            
-            # Calculate scaling to fit in LOGO_MAX_SIZE
-            scale = min(LOGO_MAX_SIZE / vb_width, LOGO_MAX_SIZE / vb_height)
-            scaled_width = vb_width * scale
-            scaled_height = vb_height * scale
-            
-            # Create group for this logo
-            group = ET.SubElement(root, 'g', {
-                'id': re.sub(r'[^a-z0-9]+', '-', name.lower()),
-                'transform': f'translate({x_offset}, {y_offset})'
-            })
-            
-            # Add title and description
-            g_title = ET.SubElement(group, 'title')
-            g_title.text = name
-            g_desc = ET.SubElement(group, 'desc')
-            g_desc.text = description
-            
-            # Add logo content with viewBox preserved
-            logo_root = tree.getroot()
-            logo_svg = ET.SubElement(group, 'svg', {
-                'width': str(scaled_width),
-                'height': str(scaled_height),
-                'viewBox': f"{viewbox[0]} {viewbox[1]} {vb_width} {vb_height}",
-                'preserveAspectRatio': 'xMidYMid meet'
-            })
-            
-            # Copy all child elements
-            for child in logo_root:
-                logo_svg.append(child)
-            
-            print(f"✓ Added {name} at ({x_offset}, {y_offset})")
-            
-            # Update position for next logo
-            x_offset += GRID_SIZE
-            row_height = max(row_height, scaled_height)
-            
-            # Move to next row if needed
-            if x_offset > 1100:
-                x_offset = 50
-                y_offset += GRID_SIZE
-                row_height = 0
-    
+                largest = max(largest, (logo_path.stat().st_size, logo_path), key=lambda item: item[0])
+                
+                # Handle PNG files
+                raster = None
+                if logo_path.suffix == '.png':
+                    if raster_format:
+                        with stats.timed('optimize-rasters', name) as record:
+                            record['read'] = logo_path.stat().st_size
+                            logo_path = optimize_png(logo_path, raster_format, raster_reports)
+                            record['written'] = logo_path.stat().st_size
+                    # The base64 data is streamed into the output by write_element()
+                    raster = logo_path
+                    with stats.timed('convert', name) as record:
+                        record['read'] = logo_path.stat().st_size
+                        tree = convert_png_to_svg(logo_path, LOGO_MAX_SIZE, inline=False)
+                    if not tree:
+                        print(f"⚠ Skipping {name}: PNG conversion failed")
+                        continue
+                else:
+                    # Convert SVG to grayscale; allow per-item shade overrides
+                    with stats.timed('convert', name) as record:
+                        record['read'] = logo_path.stat().st_size
+                        tree = convert_to_grayscale(logo_path, item.get('shades'))
+                    if not tree:
+                        continue
+                
+                if precision is not None:
+                    extra = 0
+                    if raster:
+                        extra = sprite_stream.base64_size(raster.stat().st_size) - len(RASTER_PLACEHOLDER)
+                    with stats.timed('minify', name):
+                        before, after = minify_logo(tree, name, precision, extra)
+                    minified[0] += before
+                    minified[1] += after
+                
+                # Get original viewBox
+                viewbox = get_svg_viewbox(tree)
+                vb_width = viewbox[2] - viewbox[0]
+                vb_height = viewbox[3] - viewbox[1]
+                
+                # Calculate scaling to fit in LOGO_MAX_SIZE
+                scale = min(LOGO_MAX_SIZE / vb_width, LOGO_MAX_SIZE / vb_height)
+                scaled_width = vb_width * scale
+                scaled_height = vb_height * scale
+                
+                logo_id = re.sub(r'[^a-z0-9]+', '-', name.lower())
+                logo_root = tree.getroot()
+                raw_ids.update(el.get('id') for el in logo_root.iter() if el is not logo_root and el.get('id'))
+                if layout == 'symbols':
+                    symbol_id = SYMBOL_PREFIX + logo_id
+                    elem = ET.Element('symbol', {
+                        'id': symbol_id,
+                        'viewBox': f"{viewbox[0]} {viewbox[1]} {vb_width} {vb_height}"
+                    })
+                    if logo_root.get('class'):
+                        # png-logo, which the theme CSS selects on
+                        elem.set('class', logo_root.get('class'))
+                    ET.SubElement(elem, 'title').text = name
+                    ET.SubElement(elem, 'desc').text = description
+                    for child in logo_root:
+                        elem.append(child)
+                    raw_ids[symbol_id] += 1
+                    with stats.timed('merge', name):
+                        uses_hoisted = merge_logo(elem, symbol_id + '-', hoisted, merge_stats)
+                        final_ids.update(el.get('id') for el in elem.iter() if el.get('id'))
+                        if library and not raster and not uses_hoisted:
+                            share_logo(elem, library, symbol_id)
+                    placements.append((symbol_id, name, x_offset, y_offset, scaled_width, scaled_height))
+                    register_foreign_namespaces(elem, foreign)
+                    with stats.timed('serialize', name) as record:
+                        start = body.tell()
+                        write_element(body, elem, namespaces, raster)
+                        record['written'] = body.tell() - start
+                    print(f"✓ Added {name} as #{symbol_id}")
+                else:
+                    # Create group for this logo
+                    group = ET.Element('g', {
+                        'id': logo_id,
+                        'transform': f'translate({x_offset}, {y_offset})'
+                    })
+                    
+                    # Add title and description
+                    g_title = ET.SubElement(group, 'title')
+                    g_title.text = name
+                    g_desc = ET.SubElement(group, 'desc')
+                    g_desc.text = description
+                    
+                    # Add logo content with viewBox preserved
+                    logo_svg = ET.SubElement(group, 'svg', {
+                        'width': str(scaled_width),
+                        'height': str(scaled_height),
+                        'viewBox': f"{viewbox[0]} {viewbox[1]} {vb_width} {vb_height}",
+                        'preserveAspectRatio': 'xMidYMid meet'
+                    })
+                    
+                    # Copy all child elements
+                    for child in logo_root:
+                        logo_svg.append(child)
+                    raw_ids[logo_id] += 1
+                    with stats.timed('merge', name):
+                        uses_hoisted = merge_logo(group, logo_id + '-', hoisted, merge_stats)
+                        final_ids.update(el.get('id') for el in group.iter() if el.get('id'))
+                        if library and not raster and not uses_hoisted:
+                            share_logo(logo_svg, library, logo_id)
+                    
+                    register_foreign_namespaces(group, foreign)
+                    with stats.timed('serialize', name) as record:
+                        start = body.tell()
+                        write_element(body, group, namespaces, raster)
+                        record['written'] = body.tell() - start
+                    print(f"✓ Added {name} at ({x_offset}, {y_offset})")
+                
+                # Update position for next logo
+                x_offset += GRID_SIZE
+                row_height = max(row_height, scaled_height)
+                
+                # Move to next row if needed
+                if x_offset > 1100:
+                    x_offset = 50
+                    y_offset += GRID_SIZE
+                    row_height = 0
+        
     # Calculate actual SVG dimensions
     final_height = y_offset + GRID_SIZE if row_height > 0 else y_offset
-    root.set('viewBox', f'0 0 1200 {final_height}')
-    root.set('height', str(final_height))
     
     # Write output file
-    tree = ET.ElementTree(root)
-    ET.indent(tree, space='  ')
-    tree.write(OUTPUT_FILE, encoding='utf-8', xml_declaration=True)
-    
     print(f"\n{'='*60}")
-    print(f"✓ Sprite sheet created: {OUTPUT_FILE}")
-    print(f"  Dimensions: 1200 × {final_height}")
+    with stats.stage('write') as totals:
+        try:
+            if layout == 'symbols':
+                write_symbol_sheet(BODY_FILE, namespaces, hoisted)
+                output = SYMBOLS_FILE
+                print(f"✓ Symbol sprite created: {SYMBOLS_FILE} ({len(placements)} symbols)")
+                if preview:
+                    write_preview(placements, final_height)
+                    totals['written'] += PREVIEW_FILE.stat().st_size
+                    print(f"✓ Preview grid created: {PREVIEW_FILE}")
+            else:
+                write_sheet(BODY_FILE, namespaces, final_height, hoisted)
+                output = OUTPUT_FILE
+                print(f"✓ Sprite sheet created: {OUTPUT_FILE}")
+                print(f"  Dimensions: 1200 × {final_height}")
+        finally:
+            BODY_FILE.unlink()
+        totals['written'] += output.stat().st_size
+    final_ids.update(hoisted.keys())
+    print(f"  Size: {output.stat().st_size} bytes")
+    print(f"  Duplicate ids: {count_duplicates(raw_ids)} before merging, {count_duplicates(final_ids)} after "
+          f"({merge_stats['prefixed']} ids prefixed, {len(hoisted)} filters in shared <defs>, "
+          f"{merge_stats['dropped']} duplicate filters dropped, -{merge_stats['dropped_bytes']} bytes)")
     print(f"{'='*60}")
+    if raster_reports:
+        raster_optimize.print_report(raster_reports)
+    if precision is not None:
+        print(f"Minify total: {minified[0]} -> {minified[1]} bytes ({minified[1] - minified[0]:+d})")
+    sprite_stream.print_peak([str(largest[1])] if largest[1] else [])
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Build the monochrome CMS logo sprite sheet.')
+    parser.add_argument('--optimize-rasters', action='store_true',
+                        help='downscale, strip and re-encode PNG logos before embedding (requires Pillow)')
+    parser.add_argument('--raster-format', choices=raster_optimize.FORMATS, default='auto',
+                        help='encoding for --optimize-rasters (default auto: lossless PNG)')
+    parser.add_argument('--minify', action='store_true',
+                        help='round coordinates and strip editor cruft from each logo')
+    parser.add_argument('--precision', type=int, default=svg_minify.DEFAULT_PRECISION,
+                        help=f'decimal places kept by --minify (default {svg_minify.DEFAULT_PRECISION})')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='report the peak Python heap against the largest logo')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'concurrent downloads (default {DEFAULT_WORKERS}; 1 = serial)')
+    parser.add_argument('--per-host', type=int, default=DEFAULT_PER_HOST,
+                        help=f'max concurrent requests to one host (default {DEFAULT_PER_HOST})')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                        help=f'retries for network errors and 429/5xx responses (default {DEFAULT_RETRIES})')
+    parser.add_argument('--shared-library', action='store_true',
+                        help='store vector logos once in the library shared with the druplicon sprite')
+    parser.add_argument('--symbols', action='store_true',
+                        help=f'write {SYMBOLS_FILE.name} (one <symbol> per logo) instead of the grid')
+    parser.add_argument('--preview', action='store_true',
+                        help=f'with --symbols, also write {PREVIEW_FILE.name}, a grid of <use> references')
+    parser.add_argument('--offline', action='store_true',
+                        help=f'no network: build only from {LOCK_FILE.name} and {STORE_DIR.relative_to(TEMP_DIR.parent)}/')
+    build_stats.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.preview and not args.symbols:
+        parser.error('--preview needs --symbols')
+    return args
 
-def main():
+def main(argv=None):
     """Main execution"""
+    args = parse_args(argv)
+    if args.trace_memory:
+        sprite_stream.start_trace()
     print("CMS Logo Sprite Builder")
     print("=" * 60)
     
@@ -544,13 +953,39 @@ def main():
     
     print(f"✓ Loaded {sum(len(items) for items in sources_data.values())} logos from {len(sources_data)} categories")
     
-    # Build sprite sheet
-    build_sprite_sheet(sources_data)
+    raster_format = None
+    if args.optimize_rasters:
+        if raster_optimize.available():
+            raster_format = args.raster_format
+        else:
+            print("⚠ Pillow is not installed; --optimize-rasters ignored (pip install Pillow)")
+    
+    # Fetch everything first, then build from the local copies
+    stats = build_stats.BuildStats('build-logo-sprite', keep_files=build_stats.wanted(args))
+    start = time.perf_counter()
+    downloaded = prefetch_logos(sources_data, args.workers, args.per_host, args.retries, args.offline, stats)
+    missing = [name for (name, _), path in downloaded.items() if path is None]
+    if args.offline and missing:
+        print(f"✗ Offline build needs {len(missing)} logo(s) missing from the lockfile: {', '.join(missing)}")
+        print("  Run once without --offline to fetch and lock them.")
+        sys.exit(1)
+    fetch_time = time.perf_counter() - start
+    start = time.perf_counter()
+    library = symbol_library.SymbolLibrary('cms-logos') if args.shared_library else None
+    build_sprite_sheet(sources_data, downloaded, raster_format, args.precision if args.minify else None, library,
+                       'symbols' if args.symbols else 'grid', args.preview, stats)
+    if library:
+        with stats.stage('shared-library'):
+            library.save()
+        print(library.summary())
+    build_time = time.perf_counter() - start
+    print(f"\nTiming: fetch {fetch_time:.2f}s, build {build_time:.2f}s")
     
     print("\nTo add more logos:")
     print(f"  1. Edit {SOURCE_FILE.name}")
     print("  2. Add entries to existing categories or create new ones")
     print("  3. Run this script again")
+    stats.finish(args)
 
 if __name__ == '__main__':
     main()
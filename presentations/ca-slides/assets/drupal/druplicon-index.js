@@ -0,0 +1,2 @@
+// Generated by scripts/build_druplicon_sprite.py -- do not edit.
+window.DrupliconIndex = {"version":2,"shards":["druplicon-sprite.svg"],"symbols":{"druplicon-5net-company":{"shard":"druplicon-sprite.svg","bytes":27302,"viewBox":"0 0 100 100","file":"5net-company.png","type":"raster","sha1":"47857d5150b652eee021fba517b7948a3eab0185","width":341,"height":417},"druplicon-a11y_druplicon-a11y":{"shard":"druplicon-sprite.svg","bytes":28601,"viewBox":"0 0 100 100","file":"a11y_druplicon-a11y.png","type":"raster","sha1":"8e6c0c92961cc659b55787b02cf93e170fdf68ff","width":724,"height":824},"druplicon-agiledrop":{"shard":"druplicon-sprite.svg","bytes":79872,"viewBox":"0 0 100 100","file":"agiledrop.jpg","type":"raster","sha1":"b65b0c654dd9d4e1ec76f046667ea6d69a216bae","width":500,"height":500},"druplicon-angry-drop_angry":{"shard":"druplicon-sprite.svg","bytes":596326,"viewBox":"0 0 100 100","file":"angry-drop_angry.png","type":"raster","sha1":"c4893c7934654dd202dfe5c4d2df4d54f28f1a0a","width":1687,"height":1477},"druplicon-annoying-druplicon":{"shard":"druplicon-sprite.svg","bytes":130216,"viewBox":"0 0 100 100","file":"annoying-druplicon.png","type":"raster","sha1":"7921130d17eee24271db0d981a4ded779daee130","width":397,"height":278},"druplicon-association-drupal-france":{"shard":"druplicon-sprite.svg","bytes":11583,"viewBox":"0 0 100 100","file":"association-drupal-france.png","type":"raster","sha1":"b54b3f75cbfc6a53842c0a75adbf47a2fc794da1","width":160,"height":191},"druplicon-badcamp-2014_badcamp-logo_0":{"shard":"druplicon-sprite.svg","bytes":21885,"viewBox":"0 0 100 100","file":"badcamp-2014_badcamp-logo_0.png","type":"raster","sha1":"3aba02b891067e4ba560bd45733e49e62f8835ba","width":369,"height":451},"druplicon-badcamp-2016_badcamp-2016-logo":{"shard":"druplicon-sprite.svg","bytes":69524,"viewBox":"0 0 100 100","file":"badcamp-2016_badcamp-2016-logo.png","type":"raster","sha1":"0776ab4d7093d074ef71c2a284c18bf53825022c","width":164,"height":330},"druplicon-badcamp-2017_badcamp17":{"shard":"druplicon-sprite.svg","bytes":43869,"viewBox":"0 0 100 100","file":"badcamp-2017_badcamp17.jpg","type":"raster","sha1":"4a2b06a9e7f4388b5530716fc247a562aaaa0f07","width":512,"height":512},"druplicon-badcamp-2020_badcamp-20logo-20--202011-20-28site-20version-20--20lq-29":{"shard":"druplicon-sprite.svg","bytes":11948,"viewBox":"0 0 100 100","file":"badcamp-2020_BADCamp%20Logo%20-%202011%20%28Site%20Version%20-%20LQ%29.png","type":"raster","sha1":"2f470adc00c2a7b87805318175b92703fd2e1348","width":142,"height":162},"druplicon-baltimore-drupal-camp_bdc":{"shard":"druplicon-sprite.svg","bytes":30403,"viewBox":"0 0 100 100","file":"baltimore-drupal-camp_BDC.png","type":"raster","sha1":"f6a7a69410eab7a32d64a70e5b504b856fa82398","width":720,"height":715},"druplicon-behat-drupal-extension":{"shard":"druplicon-sprite.svg","bytes":811972,"viewBox":"0 0 100 100","file":"behat-drupal-extension.png","type":"raster","sha1":"af2eff194d6e2666d1981e3a75d03dd16606c97d","width":1205,"height":1401},"druplicon-brazilian-drupal-community":{"shard":"druplicon-sprite.svg","bytes":10068,"viewBox":"0 0 100 100","file":"brazilian-drupal-community.gif","type":"raster","sha1":"31925ec329d887c14b039b44fb1a5c3f1892b075","width":200,"height":195},"druplicon-cheppers":{"shard":"druplicon-sprite.svg","bytes":9406,"viewBox":"0 0 100 100","file":"cheppers.png","type":"raster","sha1":"cfdaae825d184468060f8f071fc0f626e166c095","width":194,"height":258},"druplicon-composer":{"shard":"druplicon-sprite.svg","bytes":70650,"viewBox":"0 0 100 100","file":"composer.png","type":"raster","sha1":"bce25c2898eac0f56a26eb0760be36f4ff88f598","width":360,"height":360},"druplicon-cornell-drupalcamp-2017_drupal_blue":{"shard":"druplicon-sprite.svg","bytes":8465,"viewBox":"0 0 100 100","file":"cornell-drupalcamp-2017_drupal_blue.png","type":"raster","sha1":"245fb3b4f7c8db3fba8c65a3607375bbb2b5e428","width":150,"height":171},"druplicon-czech-drupal-association":{"shard":"druplicon-sprite.svg","bytes":10350,"viewBox":"0 0 100 100","file":"czech-drupal-association.png","type":"raster","sha1":"388353a86eed6c4d3028bd1656b968e146faeb3b","width":270,"height":270},"druplicon-deploytron":{"shard":"druplicon-sprite.svg","bytes":86744,"viewBox":"0 0 100 100","file":"deploytron.png","type":"raster","sha1":"c231280d112081d7e457235a329226b5460f58ba","width":704,"height":671},"druplicon-drombie_sve-20nalepnice_dombie":{"shard":"druplicon-sprite.svg","bytes":22176,"viewBox":"0 0 100 100","file":"drombie_sve%20nalepnice_dombie.png","type":"raster","sha1":"91f49387dc7690959a018dc87db054bf8e78d547","width":109,"height":125},"druplicon-dropsolid-digital-agency":{"shard":"druplicon-sprite.svg","bytes":33126,"viewBox":"0 0 100 100","file":"dropsolid-digital-agency.png","type":"raster","sha1":"1d70e1fbd86ac1a095ca0204ad4492d80e943d79","width":1000,"height":1000},"druplicon-dropsolid":{"shard":"druplicon-sprite.svg","bytes":4940,"viewBox":"0 0 100 100","file":"dropsolid.jpeg","type":"raster","sha1":"27bb11c35cd8c3010529ec3cd1a00ca1202dc35a","width":214,"height":236},"druplicon-druapal-camp-bolivia-2013_drupalcamp-20bolivia-202013":{"shard":"druplicon-sprite.svg","bytes":71735,"viewBox":"0 0 100 100","file":"druapal-camp-bolivia-2013_DrupalCamp%20Bolivia%202013.png","type":"raster","sha1":"f40fd2624070742a8edeeabfd8cf86f54ebed764","width":288,"height":316},"druplicon-druid":{"shard":"druplicon-sprite.svg","bytes":48327,"viewBox":"0 0 100 100","file":"druid.png","type":"raster","sha1":"439372368fca1ce6c8dec8af4b5c5e56af79f299","width":531,"height":675},"druplicon-drupacamp-ohio_ohio":{"shard":"druplicon-sprite.svg","bytes":11314,"viewBox":"0 0 100 100","file":"drupacamp-ohio_Ohio.jpg","type":"raster","sha1":"d0fbf201bb3dc600d46f1e1a37aa0b674185ad56","width":236,"height":224},"druplicon-drupal-8":{"shard":"druplicon-sprite.svg","bytes":39642,"viewBox":"0 0 100 100","file":"drupal-8.png","type":"raster","sha1":"dc16f1c2adf6cce527dde00a8176c8238efaae88","width":414,"height":464},"druplicon-drupal-australia-0":{"shard":"druplicon-sprite.svg","bytes":83948,"viewBox":"0 0 100 100","file":"drupal-australia-0.png","type":"raster","sha1":"43461bb9fc3581773674584f0eec0d0078a1ebe9","width":265,"height":261},"druplicon-drupal-austria-roadshow":{"shard":"druplicon-sprite.svg","bytes":2361,"viewBox":"0 0 100 100","file":"drupal-austria-roadshow.gif","type":"raster","sha1":"9d70e13aada69c795faf79c21d333c0a18df168b","width":177,"height":204},"druplicon-drupal-bolivia_logo-drupal-bolivia-oficial_150dpi-20-281-29":{"shard":"druplicon-sprite.svg","bytes":96333,"viewBox":"0 0 100 100","file":"drupal-bolivia_logo-Drupal-Bolivia-OFICIAL_150dpi%20%281%29.png","type":"raster","sha1":"5f98b4973a6858d1f385abcbb452716718d68e9d","width":947,"height":520},"druplicon-drupal-business-and-community-days_drupal-business-and-community-days-druplicon":{"shard":"druplicon-sprite.svg","bytes":121909,"viewBox":"0 0 100 100","file":"drupal-business-and-community-days_drupal-business-and-community-days-druplicon.png","type":"raster","sha1":"656ea2750946ea47b98b794833a8b990cdd96b4e","width":329,"height":393},"druplicon-drupal-camp-2016":{"shard":"druplicon-sprite.svg","bytes":31866,"viewBox":"0 0 100 100","file":"drupal-camp-2016.png","type":"raster","sha1":"57b2bc6b0b8d2c5da2190ba48b9e6dbe3e94b701","width":346,"height":382},"druplicon-drupal-camp-alpe-adria-2014":{"shard":"druplicon-sprite.svg","bytes":20565,"viewBox":"0 0 100 100","file":"drupal-camp-alpe-adria-2014.png","type":"raster","sha1":"232080bff7cbde6e692adc68af7c08622a597e9d","width":364,"height":423},"druplicon-drupal-camp-australia-2008":{"shard":"druplicon-sprite.svg","bytes":64917,"viewBox":"0 0 100 100","file":"drupal-camp-australia-2008.jpg","type":"raster","sha1":"844c8442d64ff9ad7a69985913b1f6ae795a8174","width":558,"height":473},"druplicon-drupal-camp-buenos-aires-2009":{"shard":"druplicon-sprite.svg","bytes":164971,"viewBox":"0 0 100 100","file":"drupal-camp-buenos-aires-2009.png","type":"raster","sha1":"8e1e461f4a4feb8d02b87d6dbe714ce0b269d364","width":450,"height":394},"druplicon-drupal-camp-costa-rica-2017":{"shard":"druplicon-sprite.svg","bytes":13541,"viewBox":"0 0 100 100","file":"drupal-camp-costa-rica-2017.png","type":"raster","sha1":"fb4101ecbf17b51b44623dae76204006aec3c93b","width":170,"height":226},"druplicon-drupal-camp-lahore-2016":{"shard":"druplicon-sprite.svg","bytes":756017,"viewBox":"0 0 100 100","file":"drupal-camp-lahore-2016.png","type":"raster","sha1":"d244aa4307da662e463beea0e88715b110537ad3","width":1980,"height":2000},"druplicon-drupal-camp-london":{"shard":"druplicon-sprite.svg","bytes":32381,"viewBox":"0 0 100 100","file":"drupal-camp-london.jpg","type":"raster","sha1":"bb2ab320dcba507178aab8adf8fbfba7440869ab","width":288,"height":288},"druplicon-drupal-camp-michigan-2015":{"shard":"druplicon-sprite.svg","bytes":34663,"viewBox":"0 0 100 100","file":"drupal-camp-michigan-2015.png","type":"raster","sha1":"79a046a9e844555700a01710b749f1adf933f71a","width":300,"height":308},"druplicon-drupal-camp-minsk-2014":{"shard":"druplicon-sprite.svg","bytes":257604,"viewBox":"0 0 100 100","file":"drupal-camp-minsk-2014.png","type":"raster","sha1":"7eed963113289e4184cfb93c6c6095f316b0dd3c","width":388,"height":438},"druplicon-drupal-camp-mumbai":{"shard":"druplicon-sprite.svg","bytes":201732,"viewBox":"0 0 100 100","file":"drupal-camp-mumbai.png","type":"raster","sha1":"5521198401f88be300eda992e08657b2799d8335","width":300,"height":300},"druplicon-drupal-camp-north-west_media_1397582142112_0":{"shard":"druplicon-sprite.svg","bytes":45110,"viewBox":"0 0 100 100","file":"drupal-camp-north-west_media_1397582142112_0.png","type":"raster","sha1":"c9e9b3d5183f6ca960cdf9db8fac4839466d8ba1","width":370,"height":230},"druplicon-drupal-camp-rs":{"shard":"druplicon-sprite.svg","bytes":91532,"viewBox":"0 0 100 100","file":"drupal-camp-rs.png","type":"raster","sha1":"ebdba1bad4bc971b285ae053d03391e8ca8b907c","width":400,"height":400},"druplicon-drupal-camp-schwerin-2017":{"shard":"druplicon-sprite.svg","bytes":55927,"viewBox":"0 0 100 100","file":"drupal-camp-schwerin-2017.png","type":"raster","sha1":"9563bd6ffba4a0b39fdb77daa6a22b8646db6640","width":182,"height":211},"druplicon-drupal-camp-skopje":{"shard":"druplicon-sprite.svg","bytes":71332,"viewBox":"0 0 100 100","file":"drupal-camp-skopje.png","type":"raster","sha1":"5f808f8ebee1978f3882779c7ed726496df07ae9","width":212,"height":310},"druplicon-drupal-camp-toronto-2013":{"shard":"druplicon-sprite.svg","bytes":20198,"viewBox":"0 0 100 100","file":"drupal-camp-toronto-2013.png","type":"raster","sha1":"bb95ed9659d147d34b0e2f2652377df6c4b303ee","width":153,"height":170},"druplicon-drupal-camp-utah-2017":{"shard":"druplicon-sprite.svg","bytes":15607,"viewBox":"0 0 100 100","file":"drupal-camp-utah-2017.png","type":"raster","sha1":"e6a8106c621981a7d88aa3e48428479ac1f36fdc","width":400,"height":202},"druplicon-drupal-camp-victoria_drupal_camp_victoria":{"shard":"druplicon-sprite.svg","bytes":75636,"viewBox":"0 0 100 100","file":"drupal-camp-victoria_drupal_camp_victoria.jpg","type":"raster","sha1":"1171571d33a2ca15b9eecb82a1e049e5552269e1","width":576,"height":472},"druplicon-drupal-camp-wi":{"shard":"druplicon-sprite.svg","bytes":115340,"viewBox":"0 0 100 100","file":"drupal-camp-wi.png","type":"raster","sha1":"34936966022cbb5da0b94617d5e55c86c943c300","width":500,"height":496},"druplicon-drupal-camps-pakistan":{"shard":"druplicon-sprite.svg","bytes":90319,"viewBox":"0 0 100 100","file":"drupal-camps-pakistan.png","type":"raster","sha1":"8dde62fcd39dcd85793b0942aca366337c2150bf","width":243,"height":280},"druplicon-drupal-code-sprint-manila":{"shard":"druplicon-sprite.svg","bytes":95823,"viewBox":"0 0 100 100","file":"drupal-code-sprint-manila.png","type":"raster","sha1":"d30b840af9adcd860d0ca34def24517e6d47c5fb","width":685,"height":400},"druplicon-drupal-commerce_sve-20nalepnice_drupal-20commerce":{"shard":"druplicon-sprite.svg","bytes":44939,"viewBox":"0 0 100 100","file":"drupal-commerce_sve%20nalepnice_drupal%20commerce.png","type":"raster","sha1":"e2d532c5dc8fb25059cdbdb6520b6065ef2ac790","width":165,"height":200},"druplicon-drupal-community-macedonia":{"shard":"druplicon-sprite.svg","bytes":19968,"viewBox":"0 0 100 100","file":"drupal-community-macedonia.png","type":"raster","sha1":"4e0b0455d7da23c0de02bdcd2bb554d920380ac8","width":366,"height":366},"druplicon-drupal-day-abidjan-2012_el":{"shard":"druplicon-sprite.svg","bytes":21016,"viewBox":"0 0 100 100","file":"drupal-day-abidjan-2012_el.png","type":"raster","sha1":"c4e9ce6ff87377ebaaaafc6ca9ca2a41b2a510d1","width":269,"height":184},"druplicon-drupal-day-bilbao-2014":{"shard":"druplicon-sprite.svg","bytes":10440,"viewBox":"0 0 100 100","file":"drupal-day-bilbao-2014.png","type":"raster","sha1":"16145ff1dbdbc2e8a3bdef04f0769a1f614dcbd6","width":129,"height":116},"druplicon-drupal-day-caceres-2017":{"shard":"druplicon-sprite.svg","bytes":85649,"viewBox":"0 0 100 100","file":"drupal-day-caceres-2017.png","type":"raster","sha1":"0bb3c17f7d2c3b37b8e47e66fa2b65ba70382c4b","width":265,"height":310},"druplicon-drupal-day-valencia-2012":{"shard":"druplicon-sprite.svg","bytes":21254,"viewBox":"0 0 100 100","file":"drupal-day-valencia-2012.png","type":"raster","sha1":"6b821797acd133997a1304d9fb15995d4eeb248b","width":131,"height":150},"druplicon-drupal-denmark":{"shard":"druplicon-sprite.svg","bytes":146320,"viewBox":"0 0 100 100","file":"drupal-denmark.png","type":"raster","sha1":"b4bde38ced37544e15b628af78238b5cf3f6c4bb","width":400,"height":400},"druplicon-drupal-dev-days-ghent-2022":{"shard":"druplicon-sprite.svg","bytes":38584,"viewBox":"0 0 100 100","file":"drupal-dev-days-ghent-2022.png","type":"raster","sha1":"47e097cf8e244f71d0b96224a41b0c2b562a4250","width":927,"height":1020},"druplicon-drupal-dev-days-lisbon-2018":{"shard":"druplicon-sprite.svg","bytes":43285,"viewBox":"0 0 100 100","file":"drupal-dev-days-lisbon-2018.png","type":"raster","sha1":"91bb2e5f17ba438f47596f295d9d215f6c41cab7","width":650,"height":651},"druplicon-drupal-e-v":{"shard":"druplicon-sprite.svg","bytes":31764,"viewBox":"0 0 100 100","file":"drupal-e-v.png","type":"raster","sha1":"8f01facf1ffc19855dd1277a14069af68cec1666","width":396,"height":480},"druplicon-drupal-ecuador":{"shard":"druplicon-sprite.svg","bytes":33301,"viewBox":"0 0 100 100","file":"drupal-ecuador.jpg","type":"raster","sha1":"bdf1ad00fc57f5e285a74da7bab5d77d836d56b6","width":512,"height":512},"druplicon-drupal-europe-2018":{"shard":"druplicon-sprite.svg","bytes":24152,"viewBox":"0 0 100 100","file":"drupal-europe-2018.png","type":"raster","sha1":"d046cbfa298b3cba66d565c6f54ba756c96f35e3","width":300,"height":300},"druplicon-drupal-france":{"shard":"druplicon-sprite.svg","bytes":54844,"viewBox":"0 0 100 100","file":"drupal-france.jpg","type":"raster","sha1":"8ce7e309fa2e6010dde27c491a6232b9fb20fd17","width":300,"height":452},"druplicon-drupal-glamp-sydney-2015":{"shard":"druplicon-sprite.svg","bytes":12346,"viewBox":"0 0 100 100","file":"drupal-glamp-sydney-2015.png","type":"raster","sha1":"008dc2829b5227ca712c34a63abc0dc86781e8a4","width":177,"height":177},"druplicon-drupal-global-training-days-canberra-2013":{"shard":"druplicon-sprite.svg","bytes":152611,"viewBox":"0 0 100 100","file":"drupal-global-training-days-canberra-2013.png","type":"raster","sha1":"917ccb41d6669002f5832ae6adf9d6ba2132cbdf","width":483,"height":546},"druplicon-drupal-hackcamp":{"shard":"druplicon-sprite.svg","bytes":53777,"viewBox":"0 0 100 100","file":"drupal-hackcamp.png","type":"raster","sha1":"7d16da9f634683c8756a839d924bf894646a033d","width":276,"height":361},"druplicon-drupal-hero_drupal-20hero":{"shard":"druplicon-sprite.svg","bytes":43647,"viewBox":"0 0 100 100","file":"drupal-hero_Drupal%20Hero.png","type":"raster","sha1":"a39e2601d1890cae1fa01532a387f383b7924d11","width":476,"height":273},"druplicon-drupal-italy-0":{"shard":"druplicon-sprite.svg","bytes":36696,"viewBox":"0 0 100 100","file":"drupal-italy-0.png","type":"raster","sha1":"83c4c24a7cfcf25ab0b849cd7662dfc8b13e0f8a","width":200,"height":211},"druplicon-drupal-jaipur":{"shard":"druplicon-sprite.svg","bytes":22820,"viewBox":"0 0 100 100","file":"drupal-jaipur.jpg","type":"raster","sha1":"eb0302a889cd8a762c7ffa01426bf0564a33e514","width":200,"height":200},"druplicon-drupal-kathakali":{"shard":"druplicon-sprite.svg","bytes":13643,"viewBox":"0 0 100 100","file":"drupal-kathakali.jpg","type":"raster","sha1":"cd446952293a31335e43931f5ea5e1da485edf95","width":162,"height":235},"druplicon-drupal-lego-im-drupalin_drupal-lego-20majica":{"shard":"druplicon-sprite.svg","bytes":128726,"viewBox":"0 0 100 100","file":"drupal-lego-im-drupalin_drupal-lego%20majica.png","type":"raster","sha1":"5e7f9af77447022946db1b01f7677ea5e61a6247","width":575,"height":829},"druplicon-drupal-malaysia":{"shard":"druplicon-sprite.svg","bytes":24345,"viewBox":"0 0 100 100","file":"drupal-malaysia.png","type":"raster","sha1":"02342c8526e79484ff5665cc163e53cb6dd5f5be","width":100,"height":101},"druplicon-drupal-meetup-montreal":{"shard":"druplicon-sprite.svg","bytes":604400,"viewBox":"0 0 100 100","file":"drupal-meetup-montreal.png","type":"raster","sha1":"d6420ef6ae6fb7567138e808900452e67053d2df","width":576,"height":576},"druplicon-drupal-nicaragua":{"shard":"druplicon-sprite.svg","bytes":175990,"viewBox":"0 0 100 100","file":"drupal-nicaragua.png","type":"raster","sha1":"55f6fc1374668fc2d16d735c86d9859db127c176","width":766,"height":861},"druplicon-drupal-north-regional-summit-2017":{"shard":"druplicon-sprite.svg","bytes":65395,"viewBox":"0 0 100 100","file":"drupal-north-regional-summit-2017.png","type":"raster","sha1":"20098e67c67bd92e78b755f7c6fb3fc585e6b68c","width":510,"height":689},"druplicon-drupal-poland":{"shard":"druplicon-sprite.svg","bytes":5999,"viewBox":"0 0 100 100","file":"drupal-poland.png","type":"raster","sha1":"6fcb17038d40d146fc02378a1036527232f8d00c","width":100,"height":115},"druplicon-drupal-serbia":{"shard":"druplicon-sprite.svg","bytes":40919,"viewBox":"0 0 100 100","file":"drupal-serbia.png","type":"raster","sha1":"1473997ba849239c950baca301229a3055210563","width":400,"height":400},"druplicon-drupal-skeleton_drupal-skeleton":{"shard":"druplicon-sprite.svg","bytes":57813,"viewBox":"0 0 100 100","file":"drupal-skeleton_drupal-skeleton.png","type":"raster","sha1":"2ce4b6452112a6076aa803074c781649476ad065","width":585,"height":585},"druplicon-drupal-slovenia":{"shard":"druplicon-sprite.svg","bytes":35525,"viewBox":"0 0 100 100","file":"drupal-slovenia.png","type":"raster","sha1":"837911bb5187f6b6ace84a46a25b9bbdb02a5fb0","width":435,"height":522},"druplicon-drupal-st-louis-fleur-de-drupal":{"shard":"druplicon-sprite.svg","bytes":1982265,"viewBox":"0 0 100 100","file":"drupal-st-louis-fleur-de-drupal.png","type":"raster","sha1":"c104d8fb5e25f0cd2590e9937a9b2082beabd7fc","width":1724,"height":2000},"druplicon-drupal-thailand":{"shard":"druplicon-sprite.svg","bytes":37866,"viewBox":"0 0 100 100","file":"drupal-thailand.jpg","type":"raster","sha1":"416e774f6fc800fdb3381d1b07298dece8db482e","width":1240,"height":773},"druplicon-drupal-uganda":{"shard":"druplicon-sprite.svg","bytes":9328,"viewBox":"0 0 100 100","file":"drupal-uganda.jpg","type":"raster","sha1":"fbfe52f726fb379873d0796a16cc7221582a3af0","width":181,"height":181},"druplicon-drupaladin-checkbox":{"shard":"druplicon-sprite.svg","bytes":104305,"viewBox":"0 0 100 100","file":"drupaladin-checkbox.png","type":"raster","sha1":"6e3f1264140563f5a72397e645e0bcd0ac68aee0","width":982,"height":839},"druplicon-drupalaton-2017":{"shard":"druplicon-sprite.svg","bytes":178965,"viewBox":"0 0 100 100","file":"drupalaton-2017.png","type":"raster","sha1":"26761813377e38d4c35a82b54a7adc1bcc2c68ee","width":512,"height":512},"druplicon-drupalcamp-antwerp-2017":{"shard":"druplicon-sprite.svg","bytes":47057,"viewBox":"0 0 100 100","file":"drupalcamp-antwerp-2017.png","type":"raster","sha1":"76a3c080f1145fab2f491cdcd6659e21004333ff","width":449,"height":508},"druplicon-drupalcamp-asheville-0_dcavl_online_edition_black":{"shard":"druplicon-sprite.svg","bytes":12835,"viewBox":"0 0 100 100","file":"drupalcamp-asheville-0_dcavl_online_edition_black.png","type":"raster","sha1":"062ec935e8bf72ff29b1faa87a090db2c119f7da","width":652,"height":290},"druplicon-drupalcamp-asheville_druplicon-20bear_0":{"shard":"druplicon-sprite.svg","bytes":57593,"viewBox":"0 0 100 100","file":"drupalcamp-asheville_Druplicon%20Bear_0.png","type":"raster","sha1":"f148e37fd662970fb3df75b3258d0ce6024f90bc","width":512,"height":512},"druplicon-drupalcamp-atlanta-2009_orange":{"shard":"druplicon-sprite.svg","bytes":26032,"viewBox":"0 0 100 100","file":"drupalcamp-atlanta-2009_orange.png","type":"raster","sha1":"ebe7f07bbe86105adb232986a0f95531afa152c1","width":140,"height":180},"druplicon-drupalcamp-atlanta_drupal_atlanta":{"shard":"druplicon-sprite.svg","bytes":33320,"viewBox":"0 0 100 100","file":"drupalcamp-atlanta_drupal_atlanta.jpg","type":"raster","sha1":"706ffcdeaab3517f0b0b7f2d8a09f7d634ddbc80","width":512,"height":512},"druplicon-drupalcamp-austin-2011":{"shard":"druplicon-sprite.svg","bytes":25120,"viewBox":"0 0 100 100","file":"drupalcamp-austin-2011.png","type":"raster","sha1":"ee2ec19373af0f81701d3a1c248b25a3348b2633","width":198,"height":217},"druplicon-drupalcamp-baltics":{"shard":"druplicon-sprite.svg","bytes":28012,"viewBox":"0 0 100 100","file":"drupalcamp-baltics.png","type":"raster","sha1":"bc9fd23d1db8b3670f7b5e0ebdaef947d9675e37","width":298,"height":372},"druplicon-drupalcamp-belgium-2018-ghent":{"shard":"druplicon-sprite.svg","bytes":338295,"viewBox":"0 0 100 100","file":"drupalcamp-belgium-2018-ghent.png","type":"raster","sha1":"0861c6980f5d0ca092a7e2f06e6319665bae9180","width":1454,"height":1263},"druplicon-drupalcamp-bolivia-2014":{"shard":"druplicon-sprite.svg","bytes":59953,"viewBox":"0 0 100 100","file":"drupalcamp-bolivia-2014.png","type":"raster","sha1":"a675f83183f1c7ffc27e7414a7fb2e08a1e14be2","width":230,"height":249},"druplicon-drupalcamp-bratislava":{"shard":"druplicon-sprite.svg","bytes":11724,"viewBox":"0 0 100 100","file":"drupalcamp-bratislava.jpg","type":"raster","sha1":"da9df11720938b1fc4dcf1e093fac1e3679392ff","width":180,"height":163},"druplicon-drupalcamp-brighton-2012":{"shard":"druplicon-sprite.svg","bytes":115191,"viewBox":"0 0 100 100","file":"drupalcamp-brighton-2012.jpg","type":"raster","sha1":"4cadea8da75099832fec59073ef530a80c93c647","width":473,"height":563},"druplicon-drupalcamp-bristol-2015":{"shard":"druplicon-sprite.svg","bytes":155813,"viewBox":"0 0 100 100","file":"drupalcamp-bristol-2015.png","type":"raster","sha1":"fcf2a3d2ee70ed0eeb03c04f74555b0cd411ba7f","width":310,"height":310},"druplicon-drupalcamp-byron-bay-2015":{"shard":"druplicon-sprite.svg","bytes":11960,"viewBox":"0 0 100 100","file":"drupalcamp-byron-bay-2015.jpg","type":"raster","sha1":"d94d4af943ef4804aaba8b0dd68dd141247da0d6","width":191,"height":220},"druplicon-drupalcamp-cebu-2014_campcebu-whale-alone":{"shard":"druplicon-sprite.svg","bytes":81895,"viewBox":"0 0 100 100","file":"drupalcamp-cebu-2014_campcebu-whale-alone.png","type":"raster","sha1":"d778b92f38acb1a9e8800f17ee01cc04ce2462d6","width":357,"height":333},"druplicon-drupalcamp-cebu-2015":{"shard":"druplicon-sprite.svg","bytes":89890,"viewBox":"0 0 100 100","file":"drupalcamp-cebu-2015.png","type":"raster","sha1":"26dad35d16260a7797c9a7cd2e4904dc17a1458d","width":228,"height":281},"druplicon-drupalcamp-cebu-2018":{"shard":"druplicon-sprite.svg","bytes":359103,"viewBox":"0 0 100 100","file":"drupalcamp-cebu-2018.jpg","type":"raster","sha1":"d38f9890b63ed336d56c8bc4d6af9d9d66a475bb","width":2000,"height":2000},"druplicon-drupalcamp-charlotte-2014_charlotte":{"shard":"druplicon-sprite.svg","bytes":269505,"viewBox":"0 0 100 100","file":"drupalcamp-charlotte-2014_charlotte.png","type":"raster","sha1":"8cc5b6a023c7c60309b2c806a8324764d3324923","width":400,"height":400},"druplicon-drupalcamp-chennai":{"shard":"druplicon-sprite.svg","bytes":212964,"viewBox":"0 0 100 100","file":"drupalcamp-chennai.png","type":"raster","sha1":"b6c22fb6fbd94eef80f4e1fbe7bfa23fb86d13b3","width":285,"height":281},"druplicon-drupalcamp-colorado-community":{"shard":"druplicon-sprite.svg","bytes":83367,"viewBox":"0 0 100 100","file":"drupalcamp-colorado-community.png","type":"raster","sha1":"2058f20644cf027e66086e9905af7cba389f8465","width":300,"height":300},"druplicon-drupalcamp-colorado":{"shard":"druplicon-sprite.svg","bytes":15802,"viewBox":"0 0 100 100","file":"drupalcamp-colorado.jpg","type":"raster","sha1":"d79bda922f5aec98401332e6ff0bc21817d0a10c","width":236,"height":271},"druplicon-drupalcamp-costa-rica-2012":{"shard":"druplicon-sprite.svg","bytes":67956,"viewBox":"0 0 100 100","file":"drupalcamp-costa-rica-2012.png","type":"raster","sha1":"bbf3a1a8057cab6b91db650b3522648accee9c11","width":379,"height":287},"druplicon-drupalcamp-delhi-2016":{"shard":"druplicon-sprite.svg","bytes":88855,"viewBox":"0 0 100 100","file":"drupalcamp-delhi-2016.png","type":"raster","sha1":"1efdcd64af831810ee20b594ce38e0dd8ec7aae4","width":557,"height":628},"druplicon-drupalcamp-dharamshala":{"shard":"druplicon-sprite.svg","bytes":37264,"viewBox":"0 0 100 100","file":"drupalcamp-dharamshala.png","type":"raster","sha1":"56a775fe0de21c8eff4b37d4834a1cd68639df08","width":402,"height":228},"druplicon-drupalcamp-florida-2017":{"shard":"druplicon-sprite.svg","bytes":41173,"viewBox":"0 0 100 100","file":"drupalcamp-florida-2017.png","type":"raster","sha1":"6dc97b0fcc8d61de23643d2043b2b73602b107b0","width":290,"height":293},"druplicon-drupalcamp-florida-2020":{"shard":"druplicon-sprite.svg","bytes":4299053,"viewBox":"0 0 100 100","file":"drupalcamp-florida-2020.png","type":"raster","sha1":"68c221cb1697dd795f1739d3c1ad4e6e19085e3d","width":1903,"height":2000},"druplicon-drupalcamp-florida":{"shard":"druplicon-sprite.svg","bytes":171568,"viewBox":"0 0 100 100","file":"drupalcamp-florida.png","type":"raster","sha1":"dec08b7d3b062fb121d485df7db50285529c8653","width":610,"height":553},"druplicon-drupalcamp-fox-valley-2014_fox":{"shard":"druplicon-sprite.svg","bytes":53532,"viewBox":"0 0 100 100","file":"drupalcamp-fox-valley-2014_fox.png","type":"raster","sha1":"b1e561517b13122f323eb0a353b9c45564089339","width":531,"height":366},"druplicon-drupalcamp-frankfurt":{"shard":"druplicon-sprite.svg","bytes":10479,"viewBox":"0 0 100 100","file":"drupalcamp-frankfurt.jpg","type":"raster","sha1":"7e8f29c63f8c83568f67c2bbed81762b14082bfe","width":241,"height":241},"druplicon-drupalcamp-ghent":{"shard":"druplicon-sprite.svg","bytes":8983,"viewBox":"0 0 100 100","file":"drupalcamp-ghent.jpg","type":"raster","sha1":"799c7da1ca6d161efd57aff82ffd37eb81cc46ba","width":220,"height":220},"druplicon-drupalcamp-idaho-2012_drupalcampidaho2012":{"shard":"druplicon-sprite.svg","bytes":149779,"viewBox":"0 0 100 100","file":"drupalcamp-idaho-2012_drupalcampidaho2012.png","type":"raster","sha1":"44a735af36dd1f9a2669c7c313f64b57f3a20b1b","width":712,"height":712},"druplicon-drupalcamp-lannion-2017_lannion":{"shard":"druplicon-sprite.svg","bytes":47989,"viewBox":"0 0 100 100","file":"drupalcamp-lannion-2017_lannion.png","type":"raster","sha1":"87fe7f1db5025b88b18e2d406179f3071b4ffad8","width":314,"height":318},"druplicon-drupalcamp-lisboa-2014":{"shard":"druplicon-sprite.svg","bytes":56805,"viewBox":"0 0 100 100","file":"drupalcamp-lisboa-2014.jpg","type":"raster","sha1":"8380687c3911481e2338ad4c8b357d9b9dfc852e","width":512,"height":512},"druplicon-drupalcamp-manila":{"shard":"druplicon-sprite.svg","bytes":2054095,"viewBox":"0 0 100 100","file":"drupalcamp-manila.png","type":"raster","sha1":"64088c20c5f1400aca2fc2ba3b8300c2b0598daa","width":2000,"height":2000},"druplicon-drupalcamp-mexico":{"shard":"druplicon-sprite.svg","bytes":7643,"viewBox":"0 0 100 100","file":"drupalcamp-mexico.png","type":"raster","sha1":"ee8c21c324291937710aba659a02ec4df1e2fb93","width":279,"height":213},"druplicon-drupalcamp-montreal-2017":{"shard":"druplicon-sprite.svg","bytes":88254,"viewBox":"0 0 100 100","file":"drupalcamp-montreal-2017.png","type":"raster","sha1":"e782c0676dd213c49474435e0ed09bb4049f3508","width":399,"height":374},"druplicon-drupalcamp-moscow-2014":{"shard":"druplicon-sprite.svg","bytes":169644,"viewBox":"0 0 100 100","file":"drupalcamp-moscow-2014.png","type":"raster","sha1":"882a9fec8161a2120e42360638ba348d3dd22843","width":640,"height":640},"druplicon-drupalcamp-munich-2019":{"shard":"druplicon-sprite.svg","bytes":143992,"viewBox":"0 0 100 100","file":"drupalcamp-munich-2019.png","type":"raster","sha1":"b4fc70fa777cfcc647d754df2816988ee1c5e70e","width":1024,"height":1213},"druplicon-drupalcamp-new-jersey_media_1397581263076":{"shard":"druplicon-sprite.svg","bytes":25863,"viewBox":"0 0 100 100","file":"drupalcamp-new-jersey_media_1397581263076.png","type":"raster","sha1":"05f8ede2e184bedb8e491a30c0c109ef68cfa3f2","width":300,"height":323},"druplicon-drupalcamp-new-orleans":{"shard":"druplicon-sprite.svg","bytes":35484,"viewBox":"0 0 100 100","file":"drupalcamp-new-orleans.png","type":"raster","sha1":"3ebeef7215f4b2aa785351a5b4a2c69e4dd12d3c","width":262,"height":300},"druplicon-drupalcamp-nj":{"shard":"druplicon-sprite.svg","bytes":61671,"viewBox":"0 0 100 100","file":"drupalcamp-nj.png","type":"raster","sha1":"0dc3f4e3eb62d4a93c74753e3382dbf24b107c50","width":201,"height":226},"druplicon-drupalcamp-nyc-2014_druplicon-apple":{"shard":"druplicon-sprite.svg","bytes":10886,"viewBox":"0 0 100 100","file":"drupalcamp-nyc-2014_Druplicon-apple.jpg","type":"raster","sha1":"2d67282838b2a3446f60e43361e6f8649a5e5e88","width":250,"height":250},"druplicon-drupalcamp-ohio-2015":{"shard":"druplicon-sprite.svg","bytes":32950,"viewBox":"0 0 100 100","file":"drupalcamp-ohio-2015.png","type":"raster","sha1":"45d2a8d01dcc2a3d505f4daec441922182f81685","width":549,"height":401},"druplicon-drupalcamp-ohio":{"shard":"druplicon-sprite.svg","bytes":90769,"viewBox":"0 0 100 100","file":"drupalcamp-ohio.png","type":"raster","sha1":"4cbc2cccac568add0d3e2f027d4d5c9c2371f177","width":400,"height":400},"druplicon-drupalcamp-oslo-2013":{"shard":"druplicon-sprite.svg","bytes":7018,"viewBox":"0 0 100 100","file":"drupalcamp-oslo-2013.png","type":"raster","sha1":"e71ce24e136d175c00973c2d5ecc7ec9e6ec2882","width":131,"height":145},"druplicon-drupalcamp-ottawa-2016":{"shard":"druplicon-sprite.svg","bytes":98368,"viewBox":"0 0 100 100","file":"drupalcamp-ottawa-2016.png","type":"raster","sha1":"4495f0d132a69c6b40a9aa031fdf300f2a6f25c2","width":497,"height":561},"druplicon-drupalcamp-panama-2012":{"shard":"druplicon-sprite.svg","bytes":174492,"viewBox":"0 0 100 100","file":"drupalcamp-panama-2012.png","type":"raster","sha1":"2ef2e759896136ab75027f9df9bcca79eec06dba","width":389,"height":201},"druplicon-drupalcamp-pannonia-dart-weder_sve-20nalepnice_dartweder":{"shard":"druplicon-sprite.svg","bytes":40274,"viewBox":"0 0 100 100","file":"drupalcamp-pannonia-dart-weder_sve%20nalepnice_dartweder.png","type":"raster","sha1":"b0f7a14f941ed02b3621dcbea6389220de3ddeb4","width":110,"height":170},"druplicon-drupalcamp-pannonia-headless-react-star-wars_sve-20nalepnice_headless":{"shard":"druplicon-sprite.svg","bytes":27879,"viewBox":"0 0 100 100","file":"drupalcamp-pannonia-headless-react-star-wars_sve%20nalepnice_headless.png","type":"raster","sha1":"bcaf28d5734548631f1ac33cef74289b17b59451","width":118,"height":135},"druplicon-drupalcamp-pannonia-palic_sve-20nalepnice_dcp-20palic":{"shard":"druplicon-sprite.svg","bytes":21211,"viewBox":"0 0 100 100","file":"drupalcamp-pannonia-palic_sve%20nalepnice_DCP%20palic.png","type":"raster","sha1":"2d37b6fae562a9cbef6f8db646c70178a33d8977","width":121,"height":156},"druplicon-drupalcamp-pannonia_sve-20nalepnice_drupalcamppannonia":{"shard":"druplicon-sprite.svg","bytes":23316,"viewBox":"0 0 100 100","file":"drupalcamp-pannonia_sve%20nalepnice_drupalcamppannonia.png","type":"raster","sha1":"3a4ab06b024f9a5caeb04e4f06ea6ca61a5cc562","width":109,"height":118},"druplicon-drupalcamp-quito-2015_774d53ba382b6fee9dc56825fb8d0042":{"shard":"druplicon-sprite.svg","bytes":31785,"viewBox":"0 0 100 100","file":"drupalcamp-quito-2015_774d53ba382b6fee9dc56825fb8d0042.jpg","type":"raster","sha1":"349a406de4fe435aba635266d47bad5b24978028","width":394,"height":460},"druplicon-drupalcamp-transylvania-2014_heto-t_0":{"shard":"druplicon-sprite.svg","bytes":60575,"viewBox":"0 0 100 100","file":"drupalcamp-transylvania-2014_heto-t_0.png","type":"raster","sha1":"6180c96a2b75434635c9ae9203f7e9140ab8573d","width":196,"height":220},"druplicon-drupalcamp-twin-cities-2012_twin":{"shard":"druplicon-sprite.svg","bytes":11603,"viewBox":"0 0 100 100","file":"drupalcamp-twin-cities-2012_twin.jpg","type":"raster","sha1":"bf63768098e971a47fd0ab83b63d8fde0e82a673","width":236,"height":236},"druplicon-drupalcamp-valencia-2014_media_1397573224805":{"shard":"druplicon-sprite.svg","bytes":17086,"viewBox":"0 0 100 100","file":"drupalcamp-valencia-2014_media_1397573224805.png","type":"raster","sha1":"55d5aa6684b06bdce3b6fadb3c5e615439df7b97","width":250,"height":109},"druplicon-drupalcon-szeged-2008-2_szeged2008":{"shard":"druplicon-sprite.svg","bytes":111744,"viewBox":"0 0 100 100","file":"drupalcon-szeged-2008-2_szeged2008.png","type":"raster","sha1":"032efd487faaf9fc0c8fff1bf24929ffc2d6d86c","width":400,"height":400},"druplicon-drupalcorn-camp-2015_drupalcorn_center_logo":{"shard":"druplicon-sprite.svg","bytes":197789,"viewBox":"0 0 100 100","file":"drupalcorn-camp-2015_DrupalCorn_center_logo.png","type":"raster","sha1":"b9a9cfab4452f97b23c78d1412781ad4ae28b2e4","width":234,"height":264},"druplicon-drupenstein_de-20-20drupenstein-20sticker":{"shard":"druplicon-sprite.svg","bytes":157587,"viewBox":"0 0 100 100","file":"drupenstein_DE%20%20drupenstein%20sticker.png","type":"raster","sha1":"a12f5b6fa6e817c13263a3b65ed9e101b1eb4396","width":463,"height":751},"druplicon-drupical_drupical":{"shard":"druplicon-sprite.svg","bytes":23611,"viewBox":"0 0 100 100","file":"drupical_drupical.png","type":"raster","sha1":"6dec5f55b736564c57f645d777ccc4f3183391ed","width":600,"height":600},"druplicon-druplicon-angel_druplicon-angel":{"shard":"druplicon-sprite.svg","bytes":90961,"viewBox":"0 0 100 100","file":"druplicon-angel_druplicon-angel.png","type":"raster","sha1":"9ee6d7a05c904a5d1ba93fa2b64eb1e04f2f1c27","width":576,"height":339},"druplicon-druplicon-batman_druplicon-batman":{"shard":"druplicon-sprite.svg","bytes":12991,"viewBox":"0 0 100 100","file":"druplicon-batman_druplicon-batman.png","type":"raster","sha1":"0aa26e4e820ec2936276ede5e17c8ce0d9f3ede9","width":202,"height":259},"druplicon-druplicon-engine-driver":{"shard":"druplicon-sprite.svg","bytes":70030,"viewBox":"0 0 100 100","file":"druplicon-engine-driver.jpg","type":"raster","sha1":"b6a668cf95945c6e1922dda3a8d79a3ba7d1063b","width":403,"height":397},"druplicon-druplicon-lemon_druplicon-lemone":{"shard":"druplicon-sprite.svg","bytes":28127,"viewBox":"0 0 100 100","file":"druplicon-lemon_druplicon-lemone.jpg","type":"raster","sha1":"4a2b31ba70d23919583d369894e98fac87f4bb03","width":391,"height":425},"druplicon-druplicon-shape-leaf_druplicon-leaf":{"shard":"druplicon-sprite.svg","bytes":27674,"viewBox":"0 0 100 100","file":"druplicon-shape-leaf_druplicon-leaf.jpg","type":"raster","sha1":"473a4b66b7d35eb4c2c46d3a36adeac7c6b6f428","width":380,"height":332},"druplicon-wunderkraut_wunderkraut-logo_0":{"shard":"druplicon-sprite.svg","bytes":29072,"viewBox":"0 0 100 100","file":"wunderkraut_wunderkraut-logo_0.png","type":"raster","sha1":"c02bcd7f06084caa97679088a8d61edb324c516b","width":275,"height":528}}};
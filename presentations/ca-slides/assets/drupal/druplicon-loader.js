@@ -0,0 +1,95 @@
+/**
+ * Druplicon Index Loader
+ *
+ * Shared by druplicon-random.js and druplicon-showcase.js: loads the
+ * generated symbol index (druplicon-index.js) once per page and resolves
+ * icon ids to the sprite shard that holds them.
+ *
+ * Include the index first and the ids are available synchronously:
+ *   <script src="ca-slides/assets/drupal/druplicon-index.js"></script>
+ *   <script src="ca-slides/assets/drupal/druplicon-loader.js"></script>
+ *   <script src="ca-slides/assets/drupal/druplicon-random.js"></script>
+ * Without it the index is loaded on demand; wait for load() before
+ * asking for ids.
+ */
+
+(function() {
+  'use strict';
+
+  // Resolve sibling files relative to this script so demo pages work too
+  const ASSET_DIR = (document.currentScript && document.currentScript.src)
+    ? document.currentScript.src.replace(/[^/]*$/, '')
+    : 'ca-slides/assets/drupal/';
+  const SPRITE_PATH = ASSET_DIR + 'druplicon-sprite.svg';
+  // Generated by scripts/build_druplicon_sprite.py; sets window.DrupliconIndex
+  // (id -> shard, viewBox, source file, type, dimensions, bytes, sha1).
+  // A <script> tag rather than fetch() so it also loads from file://.
+  const INDEX_SCRIPT = ASSET_DIR + 'druplicon-index.js';
+
+  let pending = null;
+
+  window.DrupliconLoader = {
+    /**
+     * Resolves with the symbol index (or null if it could not be loaded)
+     * @returns {Promise<Object|null>}
+     */
+    load: function() {
+      if (window.DrupliconIndex) return Promise.resolve(window.DrupliconIndex);
+      if (!pending) {
+        pending = new Promise(resolve => {
+          const script = document.createElement('script');
+          script.src = INDEX_SCRIPT;
+          script.onload = () => resolve(window.DrupliconIndex || null);
+          script.onerror = () => {
+            console.warn('Druplicon loader: could not load', INDEX_SCRIPT);
+            resolve(null);
+          };
+          document.head.appendChild(script);
+        });
+      }
+      return pending;
+    },
+
+    /**
+     * Whether the index is available synchronously
+     * @returns {boolean}
+     */
+    isReady: function() {
+      return Boolean(window.DrupliconIndex);
+    },
+
+    /**
+     * Every icon id in the index
+     * @returns {string[]}
+     * @throws {Error} if the index has not loaded yet
+     */
+    ids: function() {
+      if (!window.DrupliconIndex) {
+        throw new Error('Druplicon index not loaded: include druplicon-index.js first or wait for load()');
+      }
+      return Object.keys(window.DrupliconIndex.symbols);
+    },
+
+    /**
+     * Index entry for an icon
+     * @param {string} iconId
+     * @returns {Object|undefined}
+     */
+    info: function(iconId) {
+      return window.DrupliconIndex ? window.DrupliconIndex.symbols[iconId] : undefined;
+    },
+
+    /**
+     * <use> href for an icon: an explicit sprite path wins, otherwise the
+     * shard listed in the index (the single sprite unless built with shards)
+     * @param {string} iconId
+     * @param {string} [spritePath]
+     * @returns {string}
+     */
+    href: function(iconId, spritePath) {
+      if (spritePath) return `${spritePath}#${iconId}`;
+      const entry = this.info(iconId);
+      return `${entry ? ASSET_DIR + entry.shard : SPRITE_PATH}#${iconId}`;
+    }
+  };
+})();
@@ -3,162 +3,20 @@
  * Add class="druplicon-watermark" to any slide to display random druplicons
  * 
  * Works just like cms-showcase.js but for the druplicon collection.
+ *
+ *   <script src="ca-slides/assets/drupal/druplicon-loader.js"></script>
+ *   <script src="ca-slides/assets/drupal/druplicon-showcase.js"></script>
  */
 (function() {
   'use strict';
 
-  // All 162 available icon IDs from druplicon-manifest.txt
-  const ICON_IDS = [
-    'druplicon-42-druplicon',
-    'druplicon-5net-company',
-    'druplicon-a11y_druplicon-a11y',
-    'druplicon-agiledrop',
-    'druplicon-angry-drop_angry',
-    'druplicon-annoying-druplicon',
-    'druplicon-association-drupal-france',
-    'druplicon-badcamp-2014_badcamp-logo_0',
-    'druplicon-badcamp-2016_badcamp-2016-logo',
-    'druplicon-badcamp-2017_badcamp17',
-    'druplicon-badcamp-2020_badcamp-20logo-20--202011-20-28site-20version-20--20lq-29',
-    'druplicon-baltimore-drupal-camp_bdc',
-    'druplicon-behat-drupal-extension',
-    'druplicon-bootstrap-paragraphs',
-    'druplicon-brad-czerniak_image08',
-    'druplicon-brazilian-drupal-community',
-    'druplicon-cheppers',
-    'druplicon-composer',
-    'druplicon-cornell-drupalcamp-2017_drupal_blue',
-    'druplicon-czech-drupal-association',
-    'druplicon-d8-logo',
-    'druplicon-dc-drupal-meetup_dc-drupal-meetup',
-    'druplicon-dcgov_dcgov',
-    'druplicon-ddg',
-    'druplicon-dev-days-nola_dev-days-nola',
-    'druplicon-devcamp-2013_devcamp-2013',
-    'druplicon-dondi_dondi',
-    'druplicon-drupal-7-icon_drupal-7-icon',
-    'druplicon-drupal-8-logo_drupal-208-20logo',
-    'druplicon-drupal-9-logo_drupal-209-20logo',
-    'druplicon-drupal-awards_drupal-awards',
-    'druplicon-drupal-bartik-theme',
-    'druplicon-drupal-camp-baltics_drupal-camp-baltics',
-    'druplicon-drupal-camp-chicago_drupal-camp-chicago',
-    'druplicon-drupal-camp-fox-valley_drupal-camp-fox-valley',
-    'druplicon-drupal-camp-mn-2012_drupal-camp-mn-2012',
-    'druplicon-drupal-camp-mn-2013_drupal-camp-mn-2013',
-    'druplicon-drupal-camp-mn-2014_drupal-camp-mn-2014',
-    'druplicon-drupal-camp-mn-2015_drupal-camp-mn-2015',
-    'druplicon-drupal-camp-nrw-2013_drupal-camp-nrw-2013',
-    'druplicon-drupal-camp-spain_drupal-camp-spain',
-    'druplicon-drupal-community_drupal-community',
-    'druplicon-drupal-compose_drupal-compose',
-    'druplicon-drupal-conduct_drupal-conduct',
-    'druplicon-drupal-connection_drupal-connection',
-    'druplicon-drupal-content-management-system',
-    'druplicon-drupal-diversity-and-inclusion',
-    'druplicon-drupal-gopher_drupal-gopher-20logo-20for-20drupal-go-org',
-    'druplicon-drupal-hands-logo_drupal-hands-logo',
-    'druplicon-drupal-hero_drupal-20hero',
-    'druplicon-drupal-in-a-day_drupal-in-a-day',
-    'druplicon-drupal-lego-im-drupalin_drupal-lego-20majica',
-    'druplicon-drupal-meetup-logo_dc-drupal-meetup',
-    'druplicon-drupal-meetup-madison',
-    'druplicon-drupal-pie',
-    'druplicon-drupal-romania',
-    'druplicon-drupal-trainings',
-    'druplicon-drupal-tricolor-new_drupal-tricolor-new',
-    'druplicon-drupal-wordmark',
-    'druplicon-drupal-wordmark-black',
-    'druplicon-drupal-wordmark-blue',
-    'druplicon-drupalcamp-colorado_drupalcamp-colorado',
-    'druplicon-drupalcamp-prague-2013_drupalcamp-prague-2013',
-    'druplicon-drupalcamp-scotland_drupalcamp-scotland',
-    'druplicon-drupalcon-2013-portland_drupalcon-2013-portland',
-    'druplicon-drupalcon-asia_drupalcon-asia',
-    'druplicon-drupalcon-atlanta-2013-logo_drupalcon-atlanta-2013-logo',
-    'druplicon-drupalcon-barcelona_drupalcon-barcelona',
-    'druplicon-drupalcon-dublin-2016_drupalcon-dublin-2016',
-    'druplicon-drupalcon-europe-2020_drupalcon-europe-2020',
-    'druplicon-drupalcon-global-2020_drupalcon-global-2020',
-    'druplicon-drupalcon-global-2020-experience-drupal_drupalcon-global-2020-20-20experience-20drupal',
-    'druplicon-drupalcon-houston_drupalcon-houston',
-    'druplicon-drupalcon-north-america-2021_drupalcon-north-america-2021',
-    'druplicon-drupalcon-portland-2024_drupalcon-portland-2024',
-    'druplicon-drupalcon-singapore-2024_drupalcon-singapore-2024',
-    'druplicon-drupalgeddon',
-    'druplicon-drupalicon-d8-responsive-images',
-    'druplicon-druplicon-drupal-code_druplicon-drupal-code',
-    'druplicon-el-drupal-logo_el-drupal-logo',
-    'druplicon-euro-drupal-camp-paris',
-    'druplicon-evil-genius_evil-genius',
-    'druplicon-extended-metatag-module',
-    'druplicon-florida-drupalcamp-2016_florida-drupalcamp-2016',
-    'druplicon-florida-drupalcamp-2018_florida-drupalcamp-2018',
-    'druplicon-gatech_gatech',
-    'druplicon-globalevent_2024',
-    'druplicon-harvard_harvard',
-    'druplicon-hungarian-drupal-community',
-    'druplicon-indiana-university',
-    'druplicon-italian-drupal-community',
-    'druplicon-jdrupal',
-    'druplicon-jekyll',
-    'druplicon-lightning-icon',
-    'druplicon-los-angeles-drupal-meetup',
-    'druplicon-madison-drupal-meetup',
-    'druplicon-mdce_mdce',
-    'druplicon-mediacat',
-    'druplicon-mediacurrent',
-    'druplicon-midcamp-2013_midcamp-2013',
-    'druplicon-midcamp-2014_midcamp-2014',
-    'druplicon-midcamp-2015_midcamp-2015',
-    'druplicon-midcamp-2016_midcamp-2016',
-    'druplicon-midcamp-2018_midcamp-2018',
-    'druplicon-monster_monster-2',
-    'druplicon-montreal-drupal-users-group_montreal-drupal-users-group',
-    'druplicon-mountain-camp',
-    'druplicon-multi-druplicon',
-    'druplicon-nebraskacamp_nebraskacamp',
-    'druplicon-new-england-drupal-camp_new-england-drupal-camp',
-    'druplicon-north-carolina-drupal-users-group_north-carolina-drupal-users-group',
-    'druplicon-northeastern-university',
-    'druplicon-northwestern-university_northwestern-university',
-    'druplicon-nosh',
-    'druplicon-nyc-camp_nyc-camp',
-    'druplicon-nyccamp-2015_nyccamp-2015',
-    'druplicon-nyccamp-2016_nyccamp-2016',
-    'druplicon-nyccamp-2017_nyccamp-2017',
-    'druplicon-nyccamp-2018_nyccamp-2018',
-    'druplicon-oklahoma-drupal-users-group_oklahoma-drupal-users-group',
-    'druplicon-old-version-druplicon_old-version-druplicon',
-    'druplicon-oregon-state-university_oregon-state-university',
-    'druplicon-oscms_oscms',
-    'druplicon-photo-of-druplicon-pinata-at-barcamptampa',
-    'druplicon-picture1',
-    'druplicon-puppet-druplicon',
-    'druplicon-purdue-university',
-    'druplicon-redhat',
-    'druplicon-russia-drupal',
-    'druplicon-scary-clown',
-    'druplicon-siteimprove',
-    'druplicon-smiley-druplicon_smiley-druplicon',
-    'druplicon-sparkpost',
-    'druplicon-spain-drupal-community',
-    'druplicon-stanford',
-    'druplicon-stateofindiana_stateofindiana',
-    'druplicon-tufts-university',
-    'druplicon-twin-cities-drupal-camp-2013_twin-cities-drupal-camp-2013',
-    'druplicon-twin-cities-drupal-user-group',
-    'druplicon-university-of-adelaide',
-    'druplicon-university-of-colorado',
-    'druplicon-university-of-minnesota',
-    'druplicon-university-of-virginia',
-    'druplicon-vancouver-drupal-users-group_vancouver-drupal-users-group',
-    'druplicon-washington-dug',
-    'druplicon-white-house',
-    'druplicon-wisconsin-dug'
-  ];
-
-  const SPRITE_PATH = 'ca-slides/assets/drupal/druplicon-sprite.svg';
+  // Icon ids and sprite shards come from the generated symbol index,
+  // loaded once per page by druplicon-loader.js (include it first)
+  const loader = window.DrupliconLoader;
+  if (!loader) {
+    console.error('Druplicon showcase: include druplicon-loader.js before druplicon-showcase.js');
+    return;
+  }
 
   // Inject styles for blend modes (Light vs Dark)
   // We need 'multiply' for light mode (to hide white backgrounds)
@@ -183,38 +41,6 @@
   `;
   document.head.appendChild(style);
 
-  // Optional: verify sprite ids once and cache results for debugging
-  async function verifySpriteIds(path) {
-    try {
-      // Avoid CORS errors when opened directly via file://
-      const protocol = (window.location && window.location.protocol) || '';
-      if (!/^https?:$/.test(protocol)) {
-        return; // skip verification in non-web contexts
-      }
-      if (window._drupliconSpriteVerified) return;
-      const res = await fetch(path, { cache: 'no-store' });
-      if (!res.ok) return;
-      const text = await res.text();
-      const parser = new DOMParser();
-      const doc = parser.parseFromString(text, 'image/svg+xml');
-      const els = doc.querySelectorAll('[id]');
-      const ids = new Set();
-      const dupes = new Set();
-      els.forEach(el => {
-        const id = el.getAttribute('id');
-        if (!id) return;
-        if (ids.has(id)) dupes.add(id);
-        ids.add(id);
-      });
-      window._drupliconAvailableIds = ids;
-      window._drupliconDuplicateIds = dupes;
-      window._drupliconSpriteVerified = true;
-      if (dupes.size) console.warn('Druplicon sprite duplicate ids:', Array.from(dupes));
-    } catch (err) {
-      // best-effort; do not block rendering
-    }
-  }
-
   function addDrupliconsToSlide(slide) {
     // If a watermark container already exists or we marked it as loaded, skip
     if (slide.dataset.drupliconsLoaded === 'true') return;
@@ -240,7 +66,7 @@
     const opacity = parseFloat(slide.dataset.drupliconOpacity || slide.dataset.logoOpacity || 0.25); // Increased default opacity to 0.25
     const minScale = parseFloat(slide.dataset.drupliconScaleMin || 22); // percent (bumped min size)
     const maxScale = parseFloat(slide.dataset.drupliconScaleMax || 30); // percent (bumped max size)
-    const spritePath = slide.dataset.spritePath || SPRITE_PATH;
+    const spritePath = slide.dataset.spritePath || null;
 
     // Robust dimension selection - fix for display:none slides
     // Try reliable sources for dimensions, fallback to standard aspect ratio
@@ -286,7 +112,7 @@
       `;
       
       const use = document.createElementNS('http://www.w3.org/2000/svg', 'use');
-      use.setAttributeNS('http://www.w3.org/1999/xlink', 'xlink:href', `${spritePath}#${iconId}`);
+      use.setAttributeNS('http://www.w3.org/1999/xlink', 'xlink:href', loader.href(iconId, spritePath));
       el.appendChild(use);
       
       return el;
@@ -311,12 +137,7 @@
       const size = (Math.random() * (maxScale - minScale)) + minScale; // percent
 
       // Build candidate pool excluding names already placed.
-      // Prefer dynamically discovered IDs from the sprite when available.
-      let basePool = ICON_IDS;
-      if (window._drupliconAvailableIds && window._drupliconAvailableIds.size) {
-        // Use all discovered druplicon IDs from the sprite
-        basePool = Array.from(window._drupliconAvailableIds).filter(id => id && id.indexOf('druplicon-') === 0);
-      }
+      const basePool = loader.ids();
       let candidates = basePool.filter(id => !slideChosen.has(id));
       if (candidates.length === 0) candidates = basePool.slice();
 
@@ -338,9 +159,7 @@
       );
       if (sequenceMode) {
         const idx = window._drupliconSeqIndex || 0;
-        const seqPool = (window._drupliconAvailableIds && window._drupliconAvailableIds.size)
-          ? Array.from(window._drupliconAvailableIds).filter(id => id && id.indexOf('druplicon-') === 0)
-          : ICON_IDS;
+        const seqPool = basePool;
         chosenId = seqPool[idx % seqPool.length];
         window._drupliconSeqIndex = idx + 1;
       } else {
@@ -419,12 +238,6 @@
   function initDrupliconShowcase() {
     // Look for slides with class "druplicon" OR "druplicon-watermark" (backward compatibility)
     const slides = document.querySelectorAll('.slide.druplicon, section.slide.druplicon, .slide.druplicon-watermark, section.slide.druplicon-watermark');
-    // Kick off sprite id verification (best effort) only under http(s)
-    const protocol = (window.location && window.location.protocol) || '';
-    if (/^https?:$/.test(protocol)) {
-      verifySpriteIds(SPRITE_PATH);
-    }
-    
     // Use IntersectionObserver to ensure we only generate watermarks when the slide is rendered and has dimensions.
     // This fixes issues with slides hidden via display:none having 0x0 placement or content collisions.
     const observer = new IntersectionObserver((entries, obs) => {
@@ -445,7 +258,11 @@
       threshold: 0
     });
 
-    slides.forEach(slide => observer.observe(slide));
+    // Icon ids come from the index, so start observing once it has loaded
+    loader.load().then(index => {
+      if (!index) return;
+      slides.forEach(slide => observer.observe(slide));
+    });
   }
 
   // Initialize when DOM is ready
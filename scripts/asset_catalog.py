@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""SQLite catalog of the druplicon originals, shared by the crawler and the builder.
+
+Usage: python3 scripts/asset_catalog.py [--catalog FILE] [--import-csv FILE]
+                                        [--export-csv FILE] [--unprocessed VERSION]
+
+The crawler used to record what it saved only in a hand-quoted
+`druplicons_metadata.csv`, which the sprite builder never read: it listed
+`originals/` and re-hashed files to rediscover what it had. Both now share
+one catalog (`drupal/.asset-catalog.sqlite`, not committed), with a row per
+original in `assets`:
+
+    path (filename), directory, image_url, size, mtime_ns, sha1, sha256,
+    mime, width, height, build_version, processed_sha1
+
+plus `phashes` (perceptual hashes per algorithm, see `image_hash.py`),
+`pages` (the crawled detail page -> image URL -> filename list, in crawl
+order) and `directories` (the mtime each directory had when it was last
+listed, and the extensions listed). sha1, image_url and directory are
+indexed. Filenames are unique across the catalogued directories.
+
+- `listing(directory, extensions)` reads the directory only when its mtime
+  changed, i.e. files were added, removed or renamed, or when it was last
+  listed for fewer extensions; otherwise the names come from the catalog
+  rows of that directory.
+- `refresh(directory)` stats every file and hashes (SHA1 and SHA256 in one
+  read) only those new or whose size or mtime changed; a changed file loses
+  its perceptual hashes. Files that are gone are dropped. Callers that
+  hash in a pool use `listing()`, `stale()`, `record()` and `commit()`.
+- `record(name, path, ...)` also reads the pixel dimensions of rasters from
+  their header (`image_size()`) and the MIME type from the extension.
+- `mark_processed(names, version)` stores the build settings a file was last
+  processed with; `unprocessed(version)` lists files new or changed since.
+  The druplicon builder renders exactly those and takes every other symbol
+  from its build cache.
+- `set_pages(rows)` / `export_csv(path, directory)` keep the crawl record;
+  the committed CSV is written from the catalog with the `csv` module.
+  `--import-csv` seeds a fresh catalog's page and image URLs from it.
+
+The schema version is kept in `PRAGMA user_version`; a catalog written by
+another version is rebuilt from scratch, since everything in it can be
+recomputed from the files (and the CSV).
+
+The CMS logo sheet does not use the catalog: its inputs are blobs named by
+their SHA256 in `logo-sources.lock.json`, so it never scans or re-hashes,
+and it rebuilds the whole sheet on every run.
+"""
+import argparse
+import csv
+import hashlib
+import mimetypes
+import os
+import sqlite3
+import struct
+import time
+
+import raster_optimize
+
+SCHEMA_VERSION = 3
+# A directory modified this recently may still change within the same mtime
+# tick, so its listing is not trusted on the next run.
+RACY_NS = 2 * 10**9
+CATALOG_NAME = '.asset-catalog.sqlite'
+DEFAULT_CATALOG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'presentations', 'ca-slides', 'assets', 'drupal', CATALOG_NAME)
+CSV_FIELDS = ('page_url', 'image_url', 'saved_path')
+IMAGE_EXTENSIONS = ('.svg', '.png', '.jpg', '.jpeg', '.gif')
+
+SCHEMA = """
+CREATE TABLE assets (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    image_url TEXT,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha1 TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    mime TEXT,
+    width INTEGER,
+    height INTEGER,
+    build_version TEXT,
+    processed_sha1 TEXT
+);
+CREATE INDEX assets_sha1 ON assets (sha1);
+CREATE INDEX assets_image_url ON assets (image_url);
+CREATE INDEX assets_directory ON assets (directory);
+CREATE TABLE phashes (
+    path TEXT NOT NULL REFERENCES assets (path) ON DELETE CASCADE,
+    algo TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (path, algo)
+);
+CREATE TABLE directories (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    extensions TEXT NOT NULL
+);
+CREATE TABLE pages (
+    position INTEGER PRIMARY KEY,
+    page_url TEXT NOT NULL,
+    image_url TEXT NOT NULL,
+    path TEXT
+);
+"""
+
+
+def hash_file(path):
+    """(sha1, sha256) of a file, read once."""
+    sha1 = hashlib.sha1()
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            b = f.read(65536)
+            if not b:
+                break
+            sha1.update(b)
+            sha256.update(b)
+    return sha1.hexdigest(), sha256.hexdigest()
+
+
+def image_size(path):
+    """(width, height) in pixels from a PNG, GIF or JPEG header, or None.
+
+    Other formats (WebP/AVIF from --optimize-rasters) are read with Pillow
+    when it is installed.
+    """
+    with open(path, 'rb') as fh:
+        head = fh.read(24)
+        if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', head[6:10])
+        if head[:2] == b'\xff\xd8':
+            fh.seek(2)
+            while True:
+                marker = fh.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    return None
+                code = marker[1]
+                if code == 0xD8 or 0xD0 <= code <= 0xD7 or code == 0x01:
+                    continue  # markers without a length
+                length = struct.unpack('>H', fh.read(2))[0]
+                # SOFn frames carry the dimensions (C4/C8/CC are other tables)
+                if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+                    height, width = struct.unpack('>xHH', fh.read(5))
+                    return width, height
+                fh.seek(length - 2, 1)
+    if raster_optimize.available():
+        try:
+            with raster_optimize.Image.open(path) as img:
+                return img.size
+        except OSError:
+            pass
+    return None
+
+
+class AssetCatalog:
+    """Rows describing the files of the originals directories."""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA foreign_keys = ON')
+        self.stats = {'hashed': 0, 'unchanged': 0, 'removed': 0, 'listed': 0}
+        self._scanned = None  # (directory, mtime_ns, extensions) to store once its files are recorded
+        if self.db.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            self._create()
+
+    def _create(self):
+        tables = [row[0] for row in self.db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        for table in tables:
+            self.db.execute(f'DROP TABLE {table}')
+        self.db.executescript(SCHEMA)
+        self.db.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self.db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def commit(self):
+        """Commit, and trust the last directory listed to be fully catalogued."""
+        if self._scanned:
+            self.db.execute('INSERT OR REPLACE INTO directories (path, mtime_ns, extensions) VALUES (?, ?, ?)',
+                            self._scanned)
+            self._scanned = None
+        self.db.commit()
+
+    def close(self):
+        self.commit()
+        self.db.close()
+
+    def listing(self, directory, extensions=IMAGE_EXTENSIONS):
+        """Sorted (name, path) of the files in `directory` with one of `extensions`.
+
+        While the directory's mtime is the one it had when it was last
+        listed and catalogued (see commit()), no file was added, removed or
+        renamed, so if that listing covered `extensions` the names come from
+        the directory's catalog rows without reading it. Otherwise it is
+        read, and its rows for files no longer there are dropped.
+        """
+        directory = os.path.abspath(directory)
+        extensions = tuple(ext.lower() for ext in extensions)
+        mtime = os.stat(directory).st_mtime_ns
+        row = self.db.execute('SELECT mtime_ns, extensions FROM directories WHERE path = ?',
+                              (directory,)).fetchone()
+        if row and row[0] == mtime and set(extensions) <= set(row[1].split()):
+            self.stats['listed'] += 1
+            return [(name, os.path.join(directory, name))
+                    for (name,) in self.db.execute('SELECT path FROM assets WHERE directory = ? ORDER BY path',
+                                                   (directory,))
+                    if os.path.splitext(name)[1].lower() in extensions]
+        if time.time_ns() - mtime > RACY_NS:
+            self._scanned = (directory, mtime, ' '.join(extensions))
+        items = []
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if not os.path.isfile(path):
+                continue
+            if os.path.splitext(name)[1].lower() not in extensions:
+                continue
+            items.append((name, path))
+        present = {name for name, _ in items}
+        gone = [name for (name,) in self.db.execute('SELECT path FROM assets WHERE directory = ?', (directory,))
+                if name not in present]
+        self.db.executemany('DELETE FROM assets WHERE path = ?', [(name,) for name in gone])
+        self.stats['removed'] += len(gone)
+        return items
+
+    def sha1(self, name, path):
+        """Catalogued SHA1 of `path` if its size and mtime are unchanged, else None."""
+        st = os.stat(path)
+        row = self.db.execute('SELECT sha1 FROM assets WHERE path = ? AND size = ? AND mtime_ns = ?',
+                              (name, st.st_size, st.st_mtime_ns)).fetchone()
+        return row[0] if row else None
+
+    def sha1s(self):
+        """{name: sha1} of every catalogued file."""
+        return dict(self.db.execute('SELECT path, sha1 FROM assets'))
+
+    def stale(self, items):
+        """The (name, path) items that are new or changed since they were catalogued."""
+        stale = [(name, path) for name, path in items if self.sha1(name, path) is None]
+        self.stats['unchanged'] += len(items) - len(stale)
+        return stale
+
+    def record(self, name, path, digests=None):
+        """Catalogue `path` as `name` with its `hash_file()` digests (computed if not given).
+
+        A file whose content changed loses its perceptual hashes and build version.
+        """
+        st = os.stat(path)
+        sha1, sha256 = digests or hash_file(path)
+        size = image_size(path) if os.path.splitext(name)[1].lower() != '.svg' else None
+        width, height = size or (None, None)
+        old = self.db.execute('SELECT sha1 FROM assets WHERE path = ?', (name,)).fetchone()
+        if old and old[0] != sha1:
+            self.db.execute('DELETE FROM phashes WHERE path = ?', (name,))
+        self.db.execute(
+            'INSERT INTO assets (path, directory, size, mtime_ns, sha1, sha256, mime, width, height) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT (path) DO UPDATE SET directory = excluded.directory, '
+            'size = excluded.size, mtime_ns = excluded.mtime_ns, '
+            'sha1 = excluded.sha1, sha256 = excluded.sha256, mime = excluded.mime, '
+            'width = excluded.width, height = excluded.height',
+            (name, os.path.dirname(os.path.abspath(path)), st.st_size, st.st_mtime_ns, sha1, sha256,
+             mimetypes.guess_type(name)[0], width, height))
+        self.stats['hashed'] += 1
+        return sha1
+
+    def refresh(self, directory, extensions=IMAGE_EXTENSIONS, force=False):
+        """Bring the catalog up to date with `directory`; returns {name: sha1}.
+
+        Only new or changed files are read, unless `force`.
+        """
+        items = self.listing(directory, extensions)
+        for name, path in (items if force else self.stale(items)):
+            self.record(name, path)
+        self.commit()
+        return {name: self.sha1(name, path) for name, path in items}
+
+    def get(self, name):
+        """The row for `name` as a dict, or None."""
+        cur = self.db.execute('SELECT * FROM assets WHERE path = ?', (name,))
+        row = cur.fetchone()
+        return dict(zip([c[0] for c in cur.description], row)) if row else None
+
+    def dimensions(self, name):
+        """Catalogued (width, height) in pixels, or None for SVG and unreadable files."""
+        row = self.db.execute('SELECT width, height FROM assets WHERE path = ?', (name,)).fetchone()
+        return tuple(row) if row and row[0] is not None else None
+
+    def phash(self, name, algo):
+        """Perceptual hash of `name` ('' = undecodable), or None if not computed yet."""
+        row = self.db.execute('SELECT value FROM phashes WHERE path = ? AND algo = ?', (name, algo)).fetchone()
+        return row[0] if row else None
+
+    def set_phash(self, name, algo, value):
+        self.db.execute('INSERT OR REPLACE INTO phashes (path, algo, value) VALUES (?, ?, ?)',
+                        (name, algo, value or ''))
+
+    def mark_processed(self, names, version):
+        """Record that `names` were processed by a build with settings `version`."""
+        self.db.executemany('UPDATE assets SET build_version = ?, processed_sha1 = sha1 WHERE path = ?',
+                            [(version, name) for name in names])
+        self.db.commit()
+
+    def unprocessed(self, version):
+        """Names not processed with `version`, or changed since they were."""
+        return [name for (name,) in self.db.execute(
+            'SELECT path FROM assets WHERE build_version IS NOT ? OR processed_sha1 IS NOT sha1 ORDER BY path',
+            (version,))]
+
+    def set_pages(self, rows):
+        """Replace the crawl record with (page_url, image_url, name or None) rows, in crawl order.
+
+        Catalogued files take their image URL from it.
+        """
+        self.db.execute('DELETE FROM pages')
+        self.db.executemany('INSERT INTO pages (page_url, image_url, path) VALUES (?, ?, ?)', rows)
+        self.db.executemany('UPDATE assets SET image_url = ? WHERE path = ?',
+                            [(image, name) for _, image, name in rows if name])
+        self.db.commit()
+
+    def pages(self):
+        return self.db.execute('SELECT page_url, image_url, path FROM pages ORDER BY position').fetchall()
+
+    def export_csv(self, csv_path, directory):
+        """Write the crawl record as `druplicons_metadata.csv`; saved paths are under `directory`."""
+        with open(csv_path, 'w', encoding='utf-8', newline='') as fh:
+            fh.write(','.join(CSV_FIELDS) + '\n')  # the header was never quoted
+            writer = csv.writer(fh, quoting=csv.QUOTE_ALL, lineterminator='\n')
+            for page, image, name in self.pages():
+                writer.writerow([page, image, os.path.join(directory, name) if name else ''])
+
+    def import_csv(self, csv_path):
+        """Load the crawl record from a CSV written by export_csv(); returns the row count.
+
+        Saved paths are reduced to their filename.
+        """
+        with open(csv_path, 'r', encoding='utf-8', newline='') as fh:
+            rows = [(r['page_url'], r['image_url'], os.path.basename(r['saved_path']) or None)
+                    for r in csv.DictReader(fh)]
+        self.set_pages(rows)
+        return len(rows)
+
+    def summary(self):
+        count, size = self.db.execute('SELECT count(*), coalesce(sum(size), 0) FROM assets').fetchone()
+        listed = 'listed from the catalog' if self.stats['listed'] else 'directory read'
+        return (f'Catalog: {count} files ({size} bytes, {listed}), {self.stats["hashed"]} hashed, '
+                f'{self.stats["unchanged"]} unchanged, {self.stats["removed"]} removed')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Refresh and query the druplicon asset catalog.')
+    parser.add_argument('--catalog', default=DEFAULT_CATALOG, help=f'catalog file (default {DEFAULT_CATALOG})')
+    parser.add_argument('--import-csv', metavar='FILE', help='load page and image URLs from a druplicons_metadata.csv')
+    parser.add_argument('--export-csv', metavar='FILE', help='write the crawl record as CSV')
+    parser.add_argument('--unprocessed', metavar='VERSION',
+                        help='list files not yet processed with this build version')
+    args = parser.parse_args(argv)
+    directory = os.path.join(os.path.dirname(args.catalog), 'originals')
+    with AssetCatalog(args.catalog) as catalog:
+        catalog.refresh(directory)
+        if args.import_csv:
+            print(f'Imported {catalog.import_csv(args.import_csv)} rows from {args.import_csv}')
+        if args.export_csv:
+            catalog.export_csv(args.export_csv, directory)
+            print(f'Wrote {len(catalog.pages())} rows to {args.export_csv}')
+        if args.unprocessed:
+            for name in catalog.unprocessed(args.unprocessed):
+                print(name)
+        print(catalog.summary())
+
+
+if __name__ == '__main__':
+    main()
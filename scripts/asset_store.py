@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Content-addressed download store with a URL -> SHA256 lockfile.
+
+The downloaders used to save each file under a name derived from its logo
+name or page slug. A changed URL then silently kept the old file, and two
+sources with the same name overwrote each other. Here every download is
+stored once as `<sha256><ext>` in the store directory, and a JSON lockfile
+(meant to be committed) records, per URL:
+
+    {"sha256": ..., "size": ..., "ext": ".svg", "etag": ..., "last_modified": ...}
+
+- `fetch(url, ext)` revalidates with `If-None-Match` / `If-Modified-Since`
+  when the locked blob is present, and only writes a blob that is not
+  already stored, so identical content is never written twice.
+- `resolve(url)` is the offline path: it returns the locked blob after
+  checking its SHA256 and never touches the network. A URL missing from the
+  lockfile, or a missing or modified blob, raises `OfflineError`.
+- `save(urls)` writes the lockfile (sorted, so diffs stay small), dropping
+  URLs that are no longer used and the blobs only they referenced.
+  Callers may keep extra per-URL fields (e.g. a saved filename) with
+  `annotate()`.
+
+Used by `presentations/ca-slides/assets/build-logo-sprite.py` and
+`scripts/download_druplicons.py`.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+
+from http_client import HttpClient
+
+LOCK_VERSION = 1
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            b = f.read(65536)
+            if not b:
+                break
+            h.update(b)
+    return h.hexdigest()
+
+
+def retryable(error):
+    """True for errors worth retrying: network failures and 429/5xx responses."""
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code in RETRY_STATUSES
+    return isinstance(error, urllib.error.URLError)
+
+
+class OfflineError(LookupError):
+    """An asset cannot be served from the lockfile and store alone."""
+
+
+class AssetStore:
+    """SHA256-named blobs plus a URL -> blob lockfile."""
+
+    def __init__(self, store_dir, lock_path, client=None):
+        self.dir = store_dir
+        self.lock_path = lock_path
+        self.client = client or HttpClient()
+        self._lock = threading.Lock()
+        self.entries = {}
+        self.stats = {'downloaded': 0, 'not_modified': 0, 'unchanged': 0, 'changed': 0,
+                      'offline': 0, 'failed': 0, 'retried': 0, 'bytes': 0}
+        if os.path.exists(lock_path):
+            with open(lock_path, 'r', encoding='utf-8') as fh:
+                data = json.load(fh)
+            if data.get('version') != LOCK_VERSION:
+                raise ValueError(f'{lock_path}: unsupported lockfile version {data.get("version")}')
+            self.entries = data['assets']
+
+    def blob_path(self, sha256, ext):
+        return os.path.join(self.dir, sha256 + ext)
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self.stats[key] += n
+
+    def _verified(self, entry):
+        """Path of the entry's blob if it exists with the locked size and hash, else None."""
+        path = self.blob_path(entry['sha256'], entry['ext'])
+        if os.path.exists(path) and os.path.getsize(path) == entry['size'] and sha256_file(path) == entry['sha256']:
+            return path
+        return None
+
+    def resolve(self, url):
+        """Locked blob for `url`, without network access. Raises OfflineError."""
+        entry = self.entries.get(url)
+        if not entry:
+            raise OfflineError(f'not in {os.path.basename(self.lock_path)}: {url}')
+        path = self._verified(entry)
+        if not path:
+            raise OfflineError(f'missing or modified blob {entry["sha256"]}{entry["ext"]} for {url}')
+        self._count('offline')
+        return path
+
+    def fetch(self, url, ext, headers=None, timeout=None, retries=0, backoff=0.5):
+        """Download `url` into the store. Returns (blob path, status).
+
+        Status is 'not-modified' (304), 'unchanged' (200 with the locked
+        content), 'changed' or 'downloaded' (URL not locked before).
+        Retryable errors are retried up to `retries` times with exponential
+        backoff (`backoff`, 2x`backoff`, ... seconds); then it raises, so
+        callers keep their own error reporting.
+        """
+        entry = self.entries.get(url)
+        conditional = {}
+        if entry and entry['ext'] == ext and self._verified(entry):
+            if entry.get('etag'):
+                conditional['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                conditional['If-Modified-Since'] = entry['last_modified']
+        for attempt in range(retries + 1):
+            try:
+                resp = self.client.get(url, headers={**(headers or {}), **conditional}, timeout=timeout)
+                break
+            except Exception as e:
+                if attempt < retries and retryable(e):
+                    self._count('retried')
+                    time.sleep(backoff * 2 ** attempt)
+                    continue
+                self._count('failed')
+                raise
+        if resp.status == 304:
+            if conditional:
+                self._count('not_modified')
+                return self.blob_path(entry['sha256'], ext), 'not-modified'
+            self._count('failed')
+            raise urllib.error.URLError(f'unexpected 304 for unconditional request: {url}')
+
+        data = resp.body
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest, ext)
+        if not os.path.exists(path):
+            os.makedirs(self.dir, exist_ok=True)
+            tmp = f'{path}.{threading.get_ident()}.part'
+            with open(tmp, 'wb') as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        if not entry:
+            status = 'downloaded'
+        elif entry['sha256'] == digest and entry['ext'] == ext:
+            status = 'unchanged'
+        else:
+            status = 'changed'
+        with self._lock:
+            self.entries[url] = {
+                **(entry or {}),
+                'sha256': digest,
+                'size': len(data),
+                'ext': ext,
+                'etag': resp.headers.get('ETag'),
+                'last_modified': resp.headers.get('Last-Modified'),
+            }
+            self.stats[status.replace('-', '_')] += 1
+            self.stats['bytes'] += len(data)
+        return path, status
+
+    def annotate(self, url, **fields):
+        """Store extra fields with a locked URL (kept until the URL is dropped)."""
+        with self._lock:
+            self.entries[url].update(fields)
+
+    def save(self, urls=None):
+        """Write the lockfile. If `urls` is given, drop every other URL and unreferenced blobs."""
+        with self._lock:
+            if urls is not None:
+                keep = set(urls)
+                self.entries = {u: e for u, e in self.entries.items() if u in keep}
+                blobs = {e['sha256'] + e['ext'] for e in self.entries.values()}
+                if os.path.isdir(self.dir):
+                    for name in os.listdir(self.dir):
+                        if name not in blobs:
+                            os.remove(os.path.join(self.dir, name))
+            tmp = self.lock_path + '.part'
+            with open(tmp, 'w', encoding='utf-8') as fh:
+                json.dump({'version': LOCK_VERSION, 'assets': self.entries}, fh, indent=2, sort_keys=True)
+                fh.write('\n')
+            os.replace(tmp, self.lock_path)
+
+    def summary(self):
+        s = self.stats
+        return (f"Asset store: {s['downloaded']} new, {s['changed']} changed upstream, "
+                f"{s['not_modified']} not modified (304), {s['unchanged']} unchanged, "
+                f"{s['offline']} from lockfile, {s['failed']} failed, {s['retried']} retried, "
+                f"{s['bytes']} bytes transferred")
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Compare the CMS logo grid with the `--symbols` sprite: parse and layout time.
+
+Usage: python3 scripts/bench_logo_sheet.py [--repeat N] [--browser PATH]
+
+Reads `presentations/ca-slides/assets/cms-logos.svg` (the grid) and
+`cms-logo-symbols.svg` (build it with `build-logo-sprite.py --symbols`).
+For each form it prints the file size, element count and the best-of-N time
+Python's ElementTree takes to parse it, then runs both through headless
+Chrome/Chromium (found on PATH, or `--browser`) and prints the median time
+the browser takes to:
+
+- parse: `DOMParser.parseFromString()` on the file text
+- all logos: insert the grid, or the sprite plus one `<svg><use/></svg>`
+  per symbol, and force style and layout
+- one logo: the grid has to be inserted whole to show a single logo; the
+  sprite needs itself plus one `<use>`
+
+The page measures synchronously while it loads, so `--dump-dom` returns the
+results without virtual time distorting `performance.now()`. Paint is not
+included. Without a browser only the Python numbers are printed.
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from xml.etree import ElementTree as ET
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS = os.path.join(ROOT, 'presentations', 'ca-slides', 'assets')
+GRID = os.path.join(ASSETS, 'cms-logos.svg')
+SYMBOLS = os.path.join(ASSETS, 'cms-logo-symbols.svg')
+BROWSERS = ('chromium', 'chromium-browser', 'google-chrome', 'google-chrome-stable', 'chrome')
+SYMBOL_ID_RE = re.compile(r'<symbol id="([^"]+)"')
+RESULT_RE = re.compile(r'<pre id="result">(.*?)</pre>', re.S)
+
+PAGE = '''<!DOCTYPE html>
+<html><body><div id="host"></div><pre id="result"></pre>
+<script>
+const FORMS = %(forms)s;
+const IDS = %(ids)s;
+const REPEAT = %(repeat)d;
+const SVG_NS = 'http://www.w3.org/2000/svg';
+const host = document.getElementById('host');
+function median(xs) { xs.sort((a, b) => a - b); return xs[xs.length >> 1]; }
+function useOf(id) {
+  const svg = document.createElementNS(SVG_NS, 'svg');
+  svg.setAttribute('width', '100'); svg.setAttribute('height', '100');
+  const use = document.createElementNS(SVG_NS, 'use');
+  use.setAttribute('href', '#' + id);
+  svg.appendChild(use);
+  return svg;
+}
+function insert(form, doc, ids) {
+  host.textContent = '';
+  const root = document.importNode(doc.documentElement, true);
+  if (form === 'symbols') {
+    root.setAttribute('style', 'display:none');
+    host.appendChild(root);
+    for (const id of ids) host.appendChild(useOf(id));
+  } else {
+    host.appendChild(root);
+  }
+  return host.getBoundingClientRect().height;  // forces style + layout
+}
+const results = {};
+for (const [form, text] of Object.entries(FORMS)) {
+  const parse = [], all = [], one = [];
+  for (let i = 0; i < REPEAT; i++) {
+    let t0 = performance.now();
+    const doc = new DOMParser().parseFromString(text, 'image/svg+xml');
+    parse.push(performance.now() - t0);
+    t0 = performance.now();
+    insert(form, doc, IDS);
+    all.push(performance.now() - t0);
+    t0 = performance.now();
+    insert(form, doc, IDS.slice(0, 1));
+    one.push(performance.now() - t0);
+  }
+  results[form] = {parse: median(parse), all: median(all), one: median(one)};
+}
+host.textContent = '';
+document.getElementById('result').textContent = JSON.stringify(results);
+</script></body></html>
+'''
+
+
+def find_browser(path=None):
+    if path:
+        return path
+    for name in BROWSERS:
+        found = shutil.which(name)
+        if found:
+            return found
+    return None
+
+
+def python_parse(text, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ET.fromstring(text.encode('utf-8'))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def browser_times(browser, forms, ids, repeat):
+    """{form: {'parse', 'all', 'one'}} in ms from headless Chrome, or None."""
+    with tempfile.TemporaryDirectory() as tmp:
+        page = os.path.join(tmp, 'bench.html')
+        with open(page, 'w', encoding='utf-8') as fh:
+            # '<\/' keeps a '</script>' inside the SVG text from ending the script
+            forms_js = json.dumps(forms).replace('</', '<\\/')
+            fh.write(PAGE % {'forms': forms_js, 'ids': json.dumps(ids), 'repeat': repeat})
+        cmd = [browser, '--headless', '--disable-gpu', '--dump-dom', f'--user-data-dir={tmp}/profile']
+        if hasattr(os, 'geteuid') and os.geteuid() == 0:
+            cmd.append('--no-sandbox')  # Chrome refuses to run sandboxed as root
+        try:
+            out = subprocess.run(cmd + ['file://' + page], capture_output=True, text=True, timeout=300).stdout
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print('Browser run failed:', e)
+            return None
+    m = RESULT_RE.search(out)
+    if not m or not m.group(1).strip():
+        print('Browser returned no results')
+        return None
+    return json.loads(m.group(1))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20, help='repetitions per measurement')
+    parser.add_argument('--browser', help='Chrome/Chromium binary (default: first found on PATH)')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(SYMBOLS):
+        print(f'{SYMBOLS} not found; run build-logo-sprite.py --symbols first')
+        return
+    forms = {}
+    for form, path in (('grid', GRID), ('symbols', SYMBOLS)):
+        with open(path, 'r', encoding='utf-8') as fh:
+            forms[form] = re.sub(r'^<\?xml[^>]*\?>\s*', '', fh.read())
+    ids = SYMBOL_ID_RE.findall(forms['symbols'])
+
+    print(f'{len(ids)} logos, Python ElementTree parse best of {args.repeat}')
+    for form, text in forms.items():
+        elements = sum(1 for _ in ET.fromstring(text.encode('utf-8')).iter())
+        print(f'  {form:8} {len(text.encode("utf-8")):8} bytes  {elements:5} elements  '
+              f'{python_parse(text, args.repeat) * 1000:7.2f} ms')
+
+    browser = find_browser(args.browser)
+    if not browser:
+        print('No headless Chrome/Chromium found (pass --browser PATH); browser timings skipped')
+        return
+    times = browser_times(browser, forms, ids, args.repeat)
+    if not times:
+        return
+    print(f'{os.path.basename(browser)}, median of {args.repeat} (ms): parse / all logos / one logo')
+    for form, t in times.items():
+        print(f'  {form:8} {t["parse"]:7.2f} / {t["all"]:7.2f} / {t["one"]:7.2f}')
+    if times['symbols']['one']:
+        print(f'  one logo: symbols {times["grid"]["one"] / times["symbols"]["one"]:.1f}x faster than the grid')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Benchmark the single-pass SVG normalizer against the old regex version.
+
+Usage: python3 scripts/bench_normalize_svg.py [--repeat N] [DIR ...]
+
+Times `build_druplicon_sprite.normalize_svg` (tokenizer, one pass) against
+the previous four-pass `re.sub` implementation, kept below as
+`regex_normalize_svg`, on real SVG inputs. By default it reads the SVGs in
+the druplicon originals folder and the downloaded CMS logos in
+`presentations/ca-slides/assets/temp_logos/store/`.
+"""
+import argparse
+import os
+import re
+import time
+import tracemalloc
+
+import build_druplicon_sprite as sprite
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DIRS = [
+    sprite.IN_DIR,
+    os.path.join(ROOT, 'presentations', 'ca-slides', 'assets', 'temp_logos', 'store'),
+]
+
+
+def regex_normalize_svg(svg_text):
+    """Previous normalize_svg(): one greedy root match plus four re.sub passes."""
+    # Remove XML declaration
+    svg_text = re.sub(r'<\?xml[^>]+\?>', '', svg_text)
+    
+    # Find svg tag
+    m = re.search(r'<svg([^>]*)>(.*)</svg>', svg_text, flags=re.S)
+    if not m:
+        return None, None
+    
+    attrs = m.group(1)
+    inner = m.group(2).strip()
+    
+    # Extract viewBox if present
+    vb = None
+    mv = re.search(r'viewBox="([^"]+)"', attrs)
+    if mv:
+        vb = mv.group(1)
+    else:
+        # Try width/height
+        mw = re.search(r'width="([^"]+)"', attrs)
+        mh = re.search(r'height="([^"]+)"', attrs)
+        if mw and mh:
+            try:
+                w = float(re.sub(r'[^0-9.]', '', mw.group(1)))
+                h = float(re.sub(r'[^0-9.]', '', mh.group(1)))
+                vb = f'0 0 {int(w)} {int(h)}'
+            except Exception:
+                vb = None
+    
+    # Normalize fills with greyscale preservation
+    def replace_fill_attr(m):
+        color = m.group(1).strip()
+        lum = sprite.parse_color_to_luminance(color)
+        if lum is None:
+            return 'fill="none"'
+        return f'fill="currentColor" opacity="{lum:.3f}"'
+    
+    def replace_fill_style(m):
+        color = m.group(1).strip()
+        lum = sprite.parse_color_to_luminance(color)
+        if lum is None:
+            return 'fill:none;'
+        return f'fill:currentColor;opacity:{lum:.3f};'
+    
+    def replace_stroke_attr(m):
+        color = m.group(1).strip()
+        lum = sprite.parse_color_to_luminance(color)
+        if lum is None:
+            return 'stroke="none"'
+        return f'stroke="currentColor" opacity="{lum:.3f}"'
+    
+    def replace_stroke_style(m):
+        color = m.group(1).strip()
+        lum = sprite.parse_color_to_luminance(color)
+        if lum is None:
+            return 'stroke:none;'
+        return f'stroke:currentColor;opacity:{lum:.3f};'
+    
+    # Apply replacements
+    inner = re.sub(r'fill="([^"]+)"', replace_fill_attr, inner)
+    inner = re.sub(r'fill\s*:\s*([^;"\']+);?', replace_fill_style, inner)
+    inner = re.sub(r'stroke="([^"]+)"', replace_stroke_attr, inner)
+    inner = re.sub(r'stroke\s*:\s*([^;"\']+);?', replace_stroke_style, inner)
+    
+    return vb or '0 0 100 100', inner
+
+
+def load_svgs(dirs):
+    files = []
+    for d in dirs:
+        if not os.path.isdir(d):
+            continue
+        for fn in sorted(os.listdir(d)):
+            if fn.lower().endswith('.svg'):
+                with open(os.path.join(d, fn), 'r', encoding='utf-8', errors='ignore') as fh:
+                    files.append((fn, fh.read()))
+    return files
+
+
+def bench(fn, texts, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def peak_memory(fn, text):
+    """Peak bytes allocated while normalizing one document."""
+    tracemalloc.start()
+    fn(text)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('dirs', nargs='*', default=DEFAULT_DIRS, help='folders of SVG files')
+    parser.add_argument('--repeat', type=int, default=20, help='timing repetitions; best is reported')
+    args = parser.parse_args(argv)
+
+    files = load_svgs(args.dirs)
+    if not files:
+        print('No SVG files found in', ', '.join(args.dirs))
+        return
+    texts = [t for _, t in files]
+    total = sum(len(t) for t in texts)
+    print(f'{len(files)} SVG files, {total} bytes, best of {args.repeat}')
+
+    old = bench(regex_normalize_svg, texts, args.repeat)
+    new = bench(sprite.normalize_svg, texts, args.repeat)
+    print(f'  regex (4 passes):   {old * 1000:8.2f} ms  ({total / old / 1e6:.1f} MB/s)')
+    print(f'  tokenizer (1 pass): {new * 1000:8.2f} ms  ({total / new / 1e6:.1f} MB/s)')
+    print(f'  ratio: {old / new:.2f}x')
+
+    name, largest = max(files, key=lambda f: len(f[1]))
+    print(f'  peak memory on largest file ({name}, {len(largest)} bytes): '
+          f'regex {peak_memory(regex_normalize_svg, largest)} B, '
+          f'tokenizer {peak_memory(sprite.normalize_svg, largest)} B')
+
+    differ = [fn for fn, t in files if regex_normalize_svg(t) != sprite.normalize_svg(t)]
+    print(f'  outputs differ for {len(differ)} of {len(files)} files'
+          ' (expected where <style>, url() paints or fill+stroke pairs occur)')
+    for fn in differ:
+        print('   ', fn)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""Benchmark the sprite builders on a synthetic icon corpus.
+
+Usage: python3 scripts/bench_sprites.py [--sizes 100 1000 10000] [--out FILE]
+                                        [--compare OLD.json] [--keep-corpus DIR]
+
+The real inputs are ~150 druplicon originals and ~20 logo sources, too few
+to show how the builders scale. This generates a deterministic corpus
+(`--seed`) of N icons for each size:
+
+- SVG_SHARE of them SVGs, each with `--colours` fill/stroke colours split
+  across attributes, `style=""` and a `<style>` block (hex, short hex,
+  rgb() and named), and `--segments` cubic path segments
+- the rest PNGs and JPEGs of about `--raster-kb` KB. PNGs are random noise,
+  so they do not compress. JPEGs are placeholder blobs with a valid header
+  (dimensions) and no image data: enough for the default build, which only
+  reads their size, but not decodable.
+
+For each size it times (best of `--repeat`) and measures the peak traced
+heap (tracemalloc, in a separate run) of:
+
+- `normalize_svg` (druplicon builder) over every SVG text
+- `convert_to_grayscale` (logo builder) over every SVG file
+- `embed_raster_as_svg` over every raster
+- `find_best_image` (druplicon crawler) over one synthetic detail page per icon
+- a full `--no-cache` druplicon build and a full logo sheet build, run once
+  each into a temporary directory (the builders' output paths are pointed
+  there for the run)
+
+Results are printed and written as JSON (`--out`, default
+`bench-results/<commit>.json`) with the commit, Python version and
+parameters. The default sizes take several minutes; pass smaller
+`--sizes` for a quick check. `--compare OLD.json` prints the time and peak ratios against an
+earlier run, flagging anything more than `--tolerance` slower.
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import struct
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+import build_druplicon_sprite as sprite
+import download_druplicons as crawler
+import sprite_stream
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOGO_BUILDER = os.path.join(ROOT, 'presentations', 'ca-slides', 'assets', 'build-logo-sprite.py')
+RESULTS_DIR = os.path.join(ROOT, 'bench-results')
+RESULTS_VERSION = 1
+DEFAULT_SIZES = (100, 1000, 10000)
+SVG_SHARE = 0.7  # the rest is split 2:1 between PNG and JPEG
+NAMED_COLOURS = ('red', 'navy', 'teal', 'gold', 'purple', 'silver', 'orange', 'olive', 'black', 'white')
+# Druplicon builder paths derived from BASE, redirected for full builds
+SPRITE_PATHS = {
+    'BASE': '', 'IN_DIR': 'originals', 'OUT_SVG': 'druplicon-sprite.svg', 'CACHE_DIR': '.build-cache',
+    'RASTER_DIR': 'rasters', 'SHARD_DIR': 'shards', 'INDEX_JSON': 'druplicon-index.json',
+    'INDEX_JS': 'druplicon-index.js', 'CATALOG_FILE': '.asset-catalog.sqlite', 'OPTIMIZED_DIR': '.build-cache/rasters',
+    'TRACED_DIR': '.build-cache/traced',
+}
+
+
+def load_logo_builder():
+    spec = importlib.util.spec_from_file_location('build_logo_sprite', LOGO_BUILDER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Corpus
+
+def colour(rng):
+    kind = rng.randrange(4)
+    if kind == 0:
+        return f'#{rng.randrange(0x1000000):06x}'
+    if kind == 1:
+        return f'#{rng.randrange(0x1000):03x}'
+    if kind == 2:
+        return f'rgb({rng.randrange(256)},{rng.randrange(256)},{rng.randrange(256)})'
+    return rng.choice(NAMED_COLOURS)
+
+
+def path_data(rng, segments):
+    point = lambda: f'{rng.uniform(0, 100):.3f},{rng.uniform(0, 100):.3f}'  # noqa: E731
+    return f'M{point()}' + ''.join(f'C{point()} {point()} {point()}' for _ in range(segments)) + 'Z'
+
+
+def make_svg(rng, colours, segments):
+    palette = [colour(rng) for _ in range(colours)]
+    per_path = max(1, segments // colours)
+    rules = ''.join(f'.c{i}{{fill:{c};stroke:{palette[-i - 1]}}}' for i, c in enumerate(palette))
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n',
+             '<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100" viewBox="0 0 100 100">',
+             f'<style>{rules}</style>']
+    for i, c in enumerate(palette):
+        d = path_data(rng, per_path)
+        if i % 3 == 0:
+            parts.append(f'<path fill="{c}" stroke="{palette[i - 1]}" d="{d}"/>')
+        elif i % 3 == 1:
+            parts.append(f'<path style="fill:{c};stroke:{palette[i - 1]};stroke-width:0.5" d="{d}"/>')
+        else:
+            parts.append(f'<path class="c{i}" d="{d}"/>')
+    parts.append('</svg>\n')
+    return ''.join(parts)
+
+
+def _png_chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def make_png(rng, size):
+    """RGB noise PNG of about `size` bytes."""
+    side = max(1, int((size / 3) ** 0.5))
+    raw = b''.join(b'\x00' + rng.randbytes(side * 3) for _ in range(side))
+    return (b'\x89PNG\r\n\x1a\n'
+            + _png_chunk(b'IHDR', struct.pack('>IIBBBBB', side, side, 8, 2, 0, 0, 0))
+            + _png_chunk(b'IDAT', zlib.compress(raw, 1))
+            + _png_chunk(b'IEND', b''))
+
+
+def make_jpeg(rng, size, width=256, height=256):
+    """JPEG-shaped blob of `size` bytes: SOI, JFIF, SOF0 (dimensions), comment padding, EOI."""
+    head = (b'\xff\xd8'
+            + b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00'
+            + b'\xff\xc0' + struct.pack('>HBHHB', 17, 8, height, width, 3) + bytes.fromhex('011100021100031100'))
+    body = b''
+    remaining = max(0, size - len(head) - 2)
+    while remaining > 4:
+        n = min(remaining - 4, 65533)
+        body += b'\xff\xfe' + struct.pack('>H', n + 2) + rng.randbytes(n)
+        remaining -= n + 4
+    return head + body + b'\xff\xd9'
+
+
+def make_corpus(directory, count, args):
+    """Write `count` icons to `directory`; returns their file names in order."""
+    rng = random.Random(f'{args.seed}-{count}')
+    os.makedirs(directory, exist_ok=True)
+    names = []
+    for i in range(count):
+        pick = rng.random()
+        if pick < SVG_SHARE:
+            name, data = f'icon-{i:05d}.svg', make_svg(rng, args.colours, args.segments).encode('utf-8')
+        elif pick < SVG_SHARE + (1 - SVG_SHARE) * 2 / 3:
+            name, data = f'icon-{i:05d}.png', make_png(rng, args.raster_kb * 1024)
+        else:
+            name, data = f'icon-{i:05d}.jpg', make_jpeg(rng, args.raster_kb * 1024)
+        with open(os.path.join(directory, name), 'wb') as fh:
+            fh.write(data)
+        names.append(name)
+    return names
+
+
+def detail_page(rng, name):
+    """Druplicon detail page: navigation, thumbnails and the artwork in a few formats."""
+    links = ''.join(f'<a href="/druplicon/other-{rng.randrange(10 ** 6)}">x</a>' for _ in range(40))
+    thumbs = ''.join(f'<img src="/sites/default/files/styles/thumb/{rng.randrange(10 ** 6)}.png">'
+                     for _ in range(20))
+    stem = os.path.splitext(name)[0]
+    art = ''.join(f'<img src="/sites/default/files/druplicons/{stem}{ext}">' for ext in ('.jpg', '.png', '.svg'))
+    return f'<html><body><nav>{links}</nav><main>{thumbs}{art}</main></body></html>'
+
+
+# Measurement
+
+def each(fn, items):
+    """Call `fn` on every item, dropping the results so the peak is per call."""
+    for item in items:
+        fn(item)
+
+
+def measure(fn, repeat):
+    """(best seconds of `repeat` runs, peak traced bytes of one more run)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+@contextlib.contextmanager
+def patched(module, values):
+    old = {name: getattr(module, name) for name in values}
+    for name, value in values.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in old.items():
+            setattr(module, name, value)
+
+
+def untraced_builds():
+    """Keep the builders' own --profile-memory report from stopping our tracemalloc."""
+    return patched(sprite_stream, {'print_peak': lambda inputs: None})
+
+
+def sprite_build(originals, workdir):
+    """One full --no-cache druplicon build of `originals` into `workdir`."""
+    base = os.path.join(workdir, 'drupal')
+    shutil.rmtree(base, ignore_errors=True)
+    os.makedirs(base)
+    os.symlink(originals, os.path.join(base, 'originals'))
+    paths = {name: os.path.join(base, rel) if rel else base for name, rel in SPRITE_PATHS.items()}
+    with patched(sprite, paths), untraced_builds(), contextlib.redirect_stdout(io.StringIO()):
+        sprite.main(['--no-cache'])
+
+
+def logo_build(logos, sources, downloaded, workdir):
+    """One logo sheet build of the SVG/PNG icons into `workdir`."""
+    temp = Path(workdir) / 'temp_logos'
+    temp.mkdir(parents=True, exist_ok=True)
+    values = {'OUTPUT_FILE': Path(workdir) / 'cms-logos.svg', 'TEMP_DIR': temp,
+              'BODY_FILE': temp / '.sheet-body.part', 'OPTIMIZED_DIR': temp / '.optimized'}
+    with patched(logos, values), untraced_builds(), contextlib.redirect_stdout(io.StringIO()):
+        logos.build_sprite_sheet(sources, downloaded)
+
+
+def run_size(count, args, logos, workdir):
+    """Every benchmark at one corpus size; returns result dicts."""
+    corpus = os.path.join(args.keep_corpus or workdir, f'corpus-{count}')
+    names = make_corpus(corpus, count, args)
+    paths = [os.path.join(corpus, n) for n in names]
+    svgs = [p for p in paths if p.endswith('.svg')]
+    rasters = [p for p in paths if not p.endswith('.svg')]
+    svg_texts = []
+    for p in svgs:
+        with open(p, 'r', encoding='utf-8') as fh:
+            svg_texts.append(fh.read())
+    rng = random.Random(f'{args.seed}-pages-{count}')
+    pages = [(detail_page(rng, n), f'https://www.druplicon.org/druplicon/{n}') for n in names]
+    sources = {'bench': [{'name': os.path.splitext(n)[0], 'description': 'synthetic', 'url': n}
+                         for n in names if not n.endswith('.jpg')]}
+    downloaded = {(item['name'], item['url']): Path(corpus) / item['url'] for item in sources['bench']}
+
+    benches = [
+        ('normalize_svg', len(svgs), sum(os.path.getsize(p) for p in svgs),
+         lambda: each(sprite.normalize_svg, svg_texts), args.repeat),
+        ('convert_to_grayscale', len(svgs), sum(os.path.getsize(p) for p in svgs),
+         lambda: each(logos.convert_to_grayscale, svgs), args.repeat),
+        ('embed_raster_as_svg', len(rasters), sum(os.path.getsize(p) for p in rasters),
+         lambda: each(lambda p: sprite.embed_raster_as_svg(p, 'bench'), rasters), args.repeat),
+        ('find_best_image', len(pages), sum(len(h) for h, _ in pages),
+         lambda: each(lambda page: crawler.find_best_image(*page), pages), args.repeat),
+        ('druplicon_build', len(paths), sum(os.path.getsize(p) for p in paths),
+         lambda: sprite_build(corpus, workdir), 1),
+        ('logo_build', len(downloaded), sum(p.stat().st_size for p in downloaded.values()),
+         lambda: logo_build(logos, sources, downloaded, workdir), 1),
+    ]
+    results = []
+    for name, items, size, fn, repeat in benches:
+        seconds, peak = measure(fn, repeat)
+        results.append({'bench': name, 'icons': count, 'items': items, 'bytes': size,
+                        'seconds': seconds, 'peak_bytes': peak})
+        print(f'  {name:22} {items:6} items {size / 1e6:9.2f} MB  {seconds * 1000:10.1f} ms  '
+              f'{size / seconds / 1e6 if seconds else 0:7.1f} MB/s  peak {peak / 1e6:8.2f} MB')
+    if not args.keep_corpus:
+        shutil.rmtree(corpus)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(old_path, results, tolerance):
+    with open(old_path, 'r', encoding='utf-8') as fh:
+        old = json.load(fh)
+    before = {(r['bench'], r['icons']): r for r in old['results']}
+    print(f'Compared with {old_path} (commit {old.get("commit")}): new/old time, new/old peak')
+    slower = 0
+    for r in results:
+        o = before.get((r['bench'], r['icons']))
+        if not o or not o['seconds']:
+            continue
+        ratio = r['seconds'] / o['seconds']
+        peak = r['peak_bytes'] / o['peak_bytes'] if o['peak_bytes'] else float('nan')
+        flag = '  SLOWER' if ratio > tolerance else ''
+        slower += bool(flag)
+        print(f'  {r["bench"]:22} {r["icons"]:6}  {ratio:6.2f}x  {peak:6.2f}x{flag}')
+    print(f'{slower} benchmark(s) more than {tolerance:.2f}x slower')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help=f'corpus sizes in icons (default {" ".join(map(str, DEFAULT_SIZES))})')
+    parser.add_argument('--seed', type=int, default=1, help='corpus seed (default 1)')
+    parser.add_argument('--colours', type=int, default=24, help='colours per SVG (default 24)')
+    parser.add_argument('--segments', type=int, default=400, help='path segments per SVG (default 400)')
+    parser.add_argument('--raster-kb', type=int, default=16, help='PNG/JPEG size in KB (default 16)')
+    parser.add_argument('--repeat', type=int, default=3, help='timing runs per function benchmark; best is kept')
+    parser.add_argument('--out', help='results JSON (default bench-results/<commit>.json)')
+    parser.add_argument('--compare', metavar='OLD.json', help='print ratios against an earlier results file')
+    parser.add_argument('--tolerance', type=float, default=1.10, help='slowdown ratio to flag (default 1.10)')
+    parser.add_argument('--keep-corpus', metavar='DIR', help='write the corpus here and keep it')
+    args = parser.parse_args(argv)
+
+    logos = load_logo_builder()
+    commit = git_commit()
+    results = []
+    with tempfile.TemporaryDirectory(prefix='bench-sprites-') as workdir:
+        for count in args.sizes:
+            print(f'{count} icons (seed {args.seed}):')
+            results.extend(run_size(count, args, logos, workdir))
+
+    out = args.out or os.path.join(RESULTS_DIR, f'{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    data = {
+        'version': RESULTS_VERSION,
+        'commit': commit,
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {k: getattr(args, k) for k in ('sizes', 'seed', 'colours', 'segments', 'raster_kb', 'repeat')},
+        'results': results,
+    }
+    with open(out, 'w', encoding='utf-8') as fh:
+        json.dump(data, fh, indent=1)
+        fh.write('\n')
+    print(f'Results written to {out}')
+    if args.compare:
+        compare(args.compare, results, args.tolerance)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,15 +5,72 @@ Writes `presentations/ca-slides/assets/drupal/druplicon-sprite.svg`.
 Normalizes fills/strokes to `currentColor` with opacity preserving greyscale luminance.
 Works in light/dark modes. Deduplicates files by SHA1.
 Embeds raster images (PNG/JPG/GIF) as data URIs.
+
+Originals are listed and hashed through the asset catalog shared with the
+crawler (`asset_catalog.py`) and rendered symbols are cached in
+`drupal/.build-cache/`, so a rerun only renders what changed. The options
+(`--help`) for sharding, external, optimized or traced rasters, minifying,
+near-duplicates, the shared symbol library, `--jobs` and build statistics
+are described in `presentations/ca-slides/assets/drupal/SPRITE-USAGE.md`.
 """
+import argparse
+import base64
+import functools
+import hashlib
+import json
 import os
 import re
-import hashlib
-import base64
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import asset_catalog
+import build_stats
+import image_hash
+import raster_optimize
+import raster_trace
+import sprite_stream
+import svg_minify
+import symbol_library
+from asset_catalog import image_size
+from css_colors import color_luminance, parse_rgba
 
 BASE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'presentations', 'ca-slides', 'assets', 'drupal')
 IN_DIR = os.path.join(BASE, 'originals')
 OUT_SVG = os.path.join(BASE, 'druplicon-sprite.svg')
+CACHE_DIR = os.path.join(BASE, '.build-cache')
+CATALOG_FILE = os.path.join(BASE, asset_catalog.CATALOG_NAME)
+RASTER_DIRNAME = 'rasters'
+RASTER_DIR = os.path.join(BASE, RASTER_DIRNAME)
+
+SHARD_DIRNAME = 'shards'
+SHARD_DIR = os.path.join(BASE, SHARD_DIRNAME)
+INDEX_JSON = os.path.join(BASE, 'druplicon-index.json')
+INDEX_JS = os.path.join(BASE, 'druplicon-index.js')
+INDEX_VERSION = 2
+SPRITE_HEADER = '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" style="display:none">\n'
+SPRITE_FOOTER = '</svg>\n'
+SYMBOL_VIEWBOX_RE = re.compile(r'<symbol\b[^>]*\bviewBox="([^"]*)"')
+
+OPTIMIZED_DIR = os.path.join(CACHE_DIR, 'rasters')
+TRACED_DIR = os.path.join(CACHE_DIR, 'traced')
+RASTER_DISPLAY_SIZE = 100  # rasters are drawn in a 100x100 viewBox
+
+RASTER_MIME_TYPES = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.avif': 'image/avif',
+}
+
+# Bump whenever normalize_svg/embed_raster_as_svg output changes, so cached
+# symbols rendered by older code are not reused.
+NORMALIZER_VERSION = 5
+# Greyscale weights for colour -> opacity (see css_colors.LUMINANCE_MODELS)
+LUMINANCE_MODEL = 'rec709'
 
 def sha1_file(path):
     """Compute SHA1 hash of file for deduplication."""
@@ -26,198 +83,979 @@ def sha1_file(path):
             h.update(b)
     return h.hexdigest()
 
-def rgb_to_luminance(r, g, b):
-    """Convert RGB (0-255) to relative luminance (0-1) using standard weights."""
-    return (0.2126 * r + 0.7152 * g + 0.0722 * b) / 255.0
-
 def parse_color_to_luminance(color_str):
     """Parse CSS color and return luminance (0-1), or None if transparent/none."""
     if not color_str or color_str.strip().lower() in ('none', 'transparent'):
         return None
-    
-    color_str = color_str.strip().lower()
-    
-    # Hex: #RRGGBB or #RGB
-    if color_str.startswith('#'):
-        hex_val = color_str[1:]
-        if len(hex_val) == 3:
-            r, g, b = [int(c*2, 16) for c in hex_val]
-        elif len(hex_val) == 6:
-            r = int(hex_val[0:2], 16)
-            g = int(hex_val[2:4], 16)
-            b = int(hex_val[4:6], 16)
+    color_str = color_str.strip()
+    lum = color_luminance(color_str, LUMINANCE_MODEL)
+    if lum is None:
+        # Fully transparent colours have no luminance; unknown ones go mid-grey
+        return None if parse_rgba(color_str) is not None else 0.5
+    return lum
+
+# Single-pass tokenizer for normalize_svg(): one scan over the document that
+# rewrites paint attributes, style attributes and <style> blocks as it goes.
+TOKEN_RE = re.compile(r'''
+    (?P<comment><!--.*?-->)
+  | (?P<cdata><!\[CDATA\[.*?\]\]>)
+  | (?P<pi><\?.*?\?>)
+  | (?P<decl><![^>]*>)
+  | (?P<end></\s*(?P<end_name>[^\s>]+)\s*>)
+  | (?P<start><(?P<name>[A-Za-z_][-\w:.]*)(?P<attrs>[^>]*)>)
+''', re.S | re.X)
+ATTR_RE = re.compile(r'''([^\s=/>]+)\s*=\s*(?:"([^"]*)"|'([^']*)')''')
+CSS_BLOCK_RE = re.compile(r'\{([^{}]*)\}')
+PAINT_PROPS = ('fill', 'stroke')
+
+
+@functools.lru_cache(maxsize=1024)
+def paint_value(value):
+    """Return (new paint value, opacity or None, translucent) for a fill/stroke value.
+
+    Opaque colours become `currentColor` with their luminance as opacity.
+    Translucent ones become `currentColor` with luminance x alpha as opacity,
+    which is then always written as the paint's own `fill-opacity`/`stroke-opacity`.
+    `none`, `transparent` and colours with zero alpha become `none`;
+    `currentColor`, `inherit` and `url(...)` references are left alone.
+    """
+    v = value.strip()
+    low = v.lower()
+    if low in ('none', 'transparent'):
+        return 'none', None, False
+    if low in ('currentcolor', 'inherit') or low.startswith('url('):
+        return v, None, False
+    rgba = parse_rgba(v)
+    if rgba is not None and rgba[3] < 1:
+        if rgba[3] == 0:
+            return 'none', None, False
+        return 'currentColor', parse_color_to_luminance(v) * rgba[3], True
+    return 'currentColor', parse_color_to_luminance(v), False
+
+
+def opacity_name(prop, split):
+    """A lone opaque paint keeps the historical `opacity`; fill+stroke get their own."""
+    return f'{prop}-opacity' if split else 'opacity'
+
+
+def parse_declarations(text):
+    """Split a CSS declaration list into (lead, prop, value) triples."""
+    decls = []
+    for part in text.split(';'):
+        if ':' in part:
+            prop, value = part.split(':', 1)
+            lead = prop[:len(prop) - len(prop.lstrip())]
+            decls.append((lead, prop.strip(), value))
         else:
-            return 0.5  # fallback
-        return rgb_to_luminance(r, g, b)
-    
-    # rgb(r, g, b)
-    m = re.match(r'rgb\s*\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)', color_str)
-    if m:
-        r, g, b = map(int, m.groups())
-        return rgb_to_luminance(r, g, b)
-    
-    # Named colors (partial list)
-    named = {
-        'black': 0.0, 'white': 1.0, 'gray': 0.5, 'grey': 0.5,
-        'red': 0.2126, 'green': 0.7152, 'blue': 0.0722,
-    }
-    return named.get(color_str, 0.5)  # default to mid-grey
+            decls.append((part, None, None))
+    return decls
+
+
+def colour_props(decls):
+    return {p.lower() for _, p, v in decls
+            if p and p.lower() in PAINT_PROPS and paint_value(v)[1] is not None}
+
+
+def rewrite_declarations(text, split=None):
+    """Rewrite fill/stroke declarations in a style attribute or CSS block."""
+    decls = parse_declarations(text)
+    if split is None:
+        split = len(colour_props(decls)) > 1
+    out = []
+    for lead, prop, value in decls:
+        if prop and prop.lower() in PAINT_PROPS:
+            new, lum, translucent = paint_value(value)
+            out.append(f'{lead}{prop}:{new}')
+            if lum is not None:
+                out.append(f'{opacity_name(prop.lower(), split or translucent)}:{lum:.3f}')
+        elif prop:
+            out.append(f'{lead}{prop}:{value}')
+        else:
+            out.append(lead)
+    return ';'.join(out)
+
+
+def rewrite_css(css):
+    """Rewrite fill/stroke declarations inside every `{...}` rule block."""
+    return CSS_BLOCK_RE.sub(lambda m: '{' + rewrite_declarations(m.group(1)) + '}', css)
+
+
+def parse_attrs(attr_text):
+    """[(name, value, quote)] for every attribute in a start tag."""
+    return [(name, dq or sq, "'" if sq else '"') for name, dq, sq in ATTR_RE.findall(attr_text)]
+
+
+def rewrite_start_tag(name, attr_text, close):
+    """Rewrite paint attributes (and the style attribute) of one start tag.
+
+    Returns None when the tag has nothing to rewrite, so it is emitted as is.
+    """
+    attrs = parse_attrs(attr_text)
+    paints = {}
+    style = None
+    for attr, value, _ in attrs:
+        if attr in PAINT_PROPS:
+            paints[attr] = paint_value(value)
+        elif attr == 'style':
+            style = value
+    if not paints and style is None:
+        return None
+    names = {a[0] for a in attrs}
+    coloured = {p for p, (_, lum, _) in paints.items() if lum is not None}
+    if style:
+        coloured |= colour_props(parse_declarations(style))
+    split = len(coloured) > 1 or 'opacity' in names
+    out = []
+    for attr, value, quote in attrs:
+        if attr in paints:
+            new, lum, translucent = paints[attr]
+            out.append(f'{attr}={quote}{new}{quote}')
+            oname = opacity_name(attr, split or translucent)
+            # keep an author's explicit fill-/stroke-opacity
+            if lum is not None and oname not in names:
+                out.append(f'{oname}="{lum:.3f}"')
+        elif attr == 'style':
+            out.append(f'{attr}={quote}{rewrite_declarations(value, split)}{quote}')
+        else:
+            out.append(f'{attr}={quote}{value}{quote}')
+    return f'<{name} {" ".join(out)}{"/" if close else ""}>'
+
+
+def local_name(name):
+    return name.rsplit(':', 1)[-1].lower()
+
+
+def viewbox_from_attrs(attrs):
+    """viewBox of the root <svg>, falling back to width/height."""
+    values = {name: value for name, value, _ in parse_attrs(attrs)}
+    if values.get('viewBox'):
+        return values['viewBox']
+    if values.get('width') and values.get('height'):
+        try:
+            w = float(re.sub(r'[^0-9.]', '', values['width']))
+            h = float(re.sub(r'[^0-9.]', '', values['height']))
+            return f'0 0 {int(w)} {int(h)}'
+        except Exception:
+            return None
+    return None
+
 
 def normalize_svg(svg_text):
-    """Parse SVG and normalize colors to currentColor with luminance-based opacity."""
-    # Remove XML declaration
-    svg_text = re.sub(r'<\?xml[^>]+\?>', '', svg_text)
-    
-    # Find svg tag
-    m = re.search(r'<svg([^>]*)>(.*)</svg>', svg_text, flags=re.S)
-    if not m:
+    """Parse SVG and normalize colors to currentColor with luminance-based opacity.
+
+    Makes a single pass over the markup: fill/stroke attributes, `style`
+    attributes and rules inside `<style>` blocks are rewritten as they are
+    found; comments, CDATA and text outside `<style>` pass through
+    untouched. Returns (viewBox, inner markup), or (None, None) when there
+    is no complete root `<svg>` element.
+    """
+    out = []
+    root_attrs = None
+    depth = 0
+    style_start = None  # offset just past an open <style> tag
+    end = 0
+    last = 0  # svg_text[last:] has not been copied to `out` yet
+    # Text between tags is never matched, so finditer skips over it in C.
+    for m in TOKEN_RE.finditer(svg_text):
+        kind = m.lastgroup
+        if root_attrs is None:
+            # Prolog: skip everything up to the root <svg>
+            if kind == 'start' and local_name(m.group('name')) == 'svg':
+                root_attrs = m.group('attrs')
+                if root_attrs.endswith('/'):
+                    return viewbox_from_attrs(root_attrs) or '0 0 100 100', ''
+                depth = 1
+                last = m.end()
+            continue
+        if kind == 'start':
+            tag = local_name(m.group('name'))
+            attrs = m.group('attrs')
+            close = attrs.endswith('/')
+            if tag == 'svg' and not close:
+                depth += 1
+            if 'fill' in attrs or 'stroke' in attrs or 'style' in attrs:
+                replacement = rewrite_start_tag(m.group('name'), attrs.rstrip('/'), close)
+                if replacement is not None:
+                    out.append(svg_text[last:m.start()])
+                    out.append(replacement)
+                    last = m.end()
+            if tag == 'style' and not close:
+                style_start = m.end()
+        elif kind == 'end':
+            tag = local_name(m.group('end_name'))
+            if tag == 'svg':
+                depth -= 1
+                if depth == 0:
+                    end = m.start()
+                    break
+            elif tag == 'style' and style_start is not None:
+                # Rewrite rules inside the stylesheet (including any CDATA)
+                out.append(svg_text[last:style_start])
+                out.append(rewrite_css(svg_text[style_start:m.start()]))
+                last = m.start()
+                style_start = None
+    if root_attrs is None or depth != 0:
         return None, None
-    
-    attrs = m.group(1)
-    inner = m.group(2).strip()
-    
-    # Extract viewBox if present
-    vb = None
-    mv = re.search(r'viewBox="([^"]+)"', attrs)
-    if mv:
-        vb = mv.group(1)
-    else:
-        # Try width/height
-        mw = re.search(r'width="([^"]+)"', attrs)
-        mh = re.search(r'height="([^"]+)"', attrs)
-        if mw and mh:
-            try:
-                w = float(re.sub(r'[^0-9.]', '', mw.group(1)))
-                h = float(re.sub(r'[^0-9.]', '', mh.group(1)))
-                vb = f'0 0 {int(w)} {int(h)}'
-            except Exception:
-                vb = None
-    
-    # Normalize fills with greyscale preservation
-    def replace_fill_attr(m):
-        color = m.group(1).strip()
-        lum = parse_color_to_luminance(color)
-        if lum is None:
-            return 'fill="none"'
-        return f'fill="currentColor" opacity="{lum:.3f}"'
-    
-    def replace_fill_style(m):
-        color = m.group(1).strip()
-        lum = parse_color_to_luminance(color)
-        if lum is None:
-            return 'fill:none;'
-        return f'fill:currentColor;opacity:{lum:.3f};'
-    
-    def replace_stroke_attr(m):
-        color = m.group(1).strip()
-        lum = parse_color_to_luminance(color)
-        if lum is None:
-            return 'stroke="none"'
-        return f'stroke="currentColor" opacity="{lum:.3f}"'
-    
-    def replace_stroke_style(m):
-        color = m.group(1).strip()
-        lum = parse_color_to_luminance(color)
-        if lum is None:
-            return 'stroke:none;'
-        return f'stroke:currentColor;opacity:{lum:.3f};'
-    
-    # Apply replacements
-    inner = re.sub(r'fill="([^"]+)"', replace_fill_attr, inner)
-    inner = re.sub(r'fill\s*:\s*([^;"\']+);?', replace_fill_style, inner)
-    inner = re.sub(r'stroke="([^"]+)"', replace_stroke_attr, inner)
-    inner = re.sub(r'stroke\s*:\s*([^;"\']+);?', replace_stroke_style, inner)
-    
-    return vb or '0 0 100 100', inner
+    out.append(svg_text[last:end])
+    return viewbox_from_attrs(root_attrs) or '0 0 100 100', ''.join(out).strip()
 
 def slugify(name):
     """Convert filename to valid CSS ID."""
     return re.sub(r'[^a-z0-9_-]', '-', name.lower())
 
+def raster_symbol_parts(path, symbol_id):
+    """Markup before and after the base64 data of an inline raster symbol, or None."""
+    mime = RASTER_MIME_TYPES.get(os.path.splitext(path)[1].lower())
+    if not mime:
+        return None
+    # Use standard viewBox; actual image will scale
+    return (f'<symbol id="{symbol_id}" viewBox="0 0 100 100"><image href="data:{mime};base64,',
+            '" width="100" height="100"/></symbol>')
+
 def embed_raster_as_svg(path, symbol_id):
     """Convert raster image to SVG symbol with data URI."""
-    ext = os.path.splitext(path)[1].lower()
-    mime_types = {
-        '.png': 'image/png',
-        '.jpg': 'image/jpeg',
-        '.jpeg': 'image/jpeg',
-        '.gif': 'image/gif'
-    }
-    mime = mime_types.get(ext)
-    if not mime:
+    parts = raster_symbol_parts(path, symbol_id)
+    if not parts:
         return None
     
     try:
         with open(path, 'rb') as f:
             data = base64.b64encode(f.read()).decode('ascii')
-        # Use standard viewBox; actual image will scale
-        return f'<symbol id="{symbol_id}" viewBox="0 0 100 100"><image href="data:{mime};base64,{data}" width="100" height="100"/></symbol>'
+        return parts[0] + data + parts[1]
     except Exception as e:
         print(f'  Error embedding {path}: {e}')
         return None
 
-def main():
+def stream_raster_symbol(path, symbol_id, target):
+    """Write the embed_raster_as_svg() symbol to the file `target`, encoding in chunks.
+
+    Only one chunk of the raster is held in memory. Returns False (and
+    leaves no file) if the raster cannot be read.
+    """
+    parts = raster_symbol_parts(path, symbol_id)
+    if not parts:
+        return False
+    
+    def write(out):
+        out.write(parts[0].encode('utf-8'))
+        sprite_stream.write_base64(out, path)
+        out.write(parts[1].encode('utf-8'))
+    try:
+        sprite_stream.write_atomic(target, write)
+        return True
+    except OSError as e:
+        print(f'  Error embedding {path}: {e}')
+        return False
+
+def inline_raster_size(path, symbol_id):
+    """Byte length embed_raster_as_svg() would produce, without encoding."""
+    before, after = raster_symbol_parts(path, symbol_id)
+    return len(before) + len(after) + sprite_stream.base64_size(os.path.getsize(path))
+
+def raster_filename(symbol_id, sha1, ext):
+    """Long-lived, content-hashed filename for an external raster."""
+    return f'{symbol_id}.{sha1[:12]}{ext.lower()}'
+
+def link_raster_as_svg(href, symbol_id):
+    """SVG symbol that references a raster file by URL."""
+    return f'<symbol id="{symbol_id}" viewBox="0 0 100 100"><image href="{href}" width="100" height="100"/></symbol>'
+
+def render_symbol(path, fn, symbol_id, raster_href=None):
+    """Render one original to (kind, symbol). `symbol` is None if unusable.
+
+    Rasters are inlined as data URIs unless `raster_href` is given.
+    """
+    ext = os.path.splitext(fn)[1].lower()
+    if ext == '.svg':
+        # Process SVG with color normalization
+        with open(path, 'r', encoding='utf-8', errors='ignore') as fh:
+            txt = fh.read()
+        vb, inner = normalize_svg(txt)
+        if inner is None:
+            return 'svg', None
+        return 'svg', f'<symbol id="{symbol_id}" viewBox="{vb}">{inner}</symbol>'
+    if raster_href:
+        return 'raster', link_raster_as_svg(raster_href, symbol_id) if ext in RASTER_MIME_TYPES else None
+    # Embed raster image
+    return 'raster', embed_raster_as_svg(path, symbol_id)
+
+def render_minified_symbol(path, fn, symbol_id, raster_href=None, precision=svg_minify.DEFAULT_PRECISION):
+    """Like render_symbol, but SVGs are minified first. Returns (kind, symbol, report).
+
+    `report` holds the symbol size before/after and the svg_minify stats,
+    or None for rasters and unparseable SVGs.
+    """
+    if os.path.splitext(fn)[1].lower() != '.svg':
+        return render_symbol(path, fn, symbol_id, raster_href) + (None,)
+    with open(path, 'r', encoding='utf-8', errors='ignore') as fh:
+        txt = fh.read()
+    minified, stats = svg_minify.minify_svg_text(txt, precision)
+    vb, inner = normalize_svg(minified)
+    if inner is None or stats is None:
+        return render_symbol(path, fn, symbol_id) + (None,)
+    symbol = f'<symbol id="{symbol_id}" viewBox="{vb}">{inner}</symbol>'
+    _, original = render_symbol(path, fn, symbol_id)
+    report = dict(stats, before=len(original.encode('utf-8')), after=len(symbol.encode('utf-8')))
+    return 'svg', symbol, report
+
+def traced_symbol(result, symbol_id):
+    """Symbol for a raster_trace.trace() result."""
+    return f'<symbol id="{symbol_id}" viewBox="{result["viewBox"]}">{raster_trace.layer_markup(result)}</symbol>'
+
+def render_symbol_file(target, path, fn, symbol_id, raster_href=None, precision=None, traced=None):
+    """Render one original straight into the file `target`. Returns (kind, written, report).
+
+    Inline rasters are streamed with stream_raster_symbol(); SVGs go through
+    render_symbol(), or render_minified_symbol() when `precision` is set.
+    `traced` is a trace result to use instead of the raster. Nothing is
+    written when the symbol is unusable.
+    """
+    ext = os.path.splitext(fn)[1].lower()
+    if traced:
+        symbol = traced_symbol(traced, symbol_id)
+        sprite_stream.write_atomic(target, lambda out: out.write(symbol.encode('utf-8')))
+        return 'traced', True, None
+    if ext != '.svg' and not raster_href:
+        return 'raster', stream_raster_symbol(path, symbol_id, target), None
+    if precision is None:
+        kind, symbol = render_symbol(path, fn, symbol_id, raster_href)
+        report = None
+    else:
+        kind, symbol, report = render_minified_symbol(path, fn, symbol_id, raster_href, precision)
+    if symbol is None:
+        return kind, False, report
+    sprite_stream.write_atomic(target, lambda out: out.write(symbol.encode('utf-8')))
+    return kind, True, report
+
+
+class BuildCache:
+    """Rendered `<symbol>` markup of each original.
+
+    Which originals need rendering is decided by the asset catalog (new or
+    changed since they were last processed with these settings); the cache
+    only holds the results. `index.json` maps each filename to its symbol
+    kind, symbol file and minify report; the symbol text lives in
+    `symbols/<sha1>-<symbol id>.<variant>.svg`. Symbols are rendered
+    straight into those files and the sprite is assembled from them, so when
+    the cache is disabled they go to a temporary directory that save()
+    removes.
+    """
+
+    def __init__(self, cache_dir, enabled=True, variant='inline'):
+        self.variant = variant  # raster output mode the symbols were rendered for
+        self.dir = cache_dir if enabled else tempfile.mkdtemp(prefix='druplicon-build-')
+        self.symbols_dir = os.path.join(self.dir, 'symbols')
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.enabled = enabled
+        self.index = {}
+        self.hits = 0
+        self.misses = 0
+        if enabled and os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as fh:
+                    self.index = json.load(fh)
+            except (OSError, ValueError):
+                self.index = {}
+
+    def get(self, fn):
+        """Cached (kind, symbol file path) for `fn`, or None on a miss.
+
+        The path is None for originals that produced no symbol.
+        """
+        entry = self.index.get(fn)
+        if not self.enabled or not entry or 'file' not in entry:
+            return None
+        if entry['file'] is None:
+            return entry['kind'], None
+        path = os.path.join(self.symbols_dir, entry['file'])
+        return (entry['kind'], path) if os.path.exists(path) else None
+
+    def symbol_path(self, sha1, symbol_id):
+        """File the symbol for the original with `sha1` is rendered into."""
+        os.makedirs(self.symbols_dir, exist_ok=True)
+        return os.path.join(self.symbols_dir, f"{sha1}-{symbol_id}.{self.variant}.svg")
+
+    def put(self, fn, path, kind, written, minify=None):
+        """Record a render into `path`; returns it, or None if nothing was written."""
+        path = path if written else None
+        self.index[fn] = {'kind': kind, 'file': path and os.path.basename(path), 'minify': minify}
+        return path
+
+    def save(self, present):
+        """Write the index, dropping originals that no longer exist."""
+        if not self.enabled:
+            shutil.rmtree(self.dir, ignore_errors=True)
+            return
+        self.index = {fn: e for fn, e in self.index.items() if fn in present}
+        keep = {e.get('file') for e in self.index.values() if e.get('file')}
+        if os.path.isdir(self.symbols_dir):
+            for name in os.listdir(self.symbols_dir):
+                if name not in keep:
+                    os.remove(os.path.join(self.symbols_dir, name))
+        os.makedirs(self.dir, exist_ok=True)
+        with open(self.index_path, 'w', encoding='utf-8') as fh:
+            json.dump(self.index, fh, indent=1, sort_keys=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--no-cache', action='store_true',
+                        help='ignore and do not update the incremental build cache')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='worker processes for hashing/rendering (default 1; 0 = one per CPU)')
+    parser.add_argument('--external-rasters', action='store_true',
+                        help=f'write rasters to {RASTER_DIRNAME}/ with content-hashed names instead of inlining them')
+    shards = parser.add_mutually_exclusive_group()
+    shards.add_argument('--shard-size', type=int, metavar='BYTES',
+                        help=f'split the sprite into {SHARD_DIRNAME}/druplicon-sprite-NNN.svg chunks of at most BYTES')
+    shards.add_argument('--shard-per-symbol', action='store_true',
+                        help=f'write one {SHARD_DIRNAME}/<symbol id>.svg per symbol')
+    parser.add_argument('--near-duplicates', action='store_true',
+                        help='drop rasters that look the same as a higher-resolution one (requires Pillow)')
+    parser.add_argument('--hash-algo', choices=image_hash.ALGORITHMS, default=image_hash.DEFAULT_ALGORITHM,
+                        help=f'perceptual hash for --near-duplicates (default {image_hash.DEFAULT_ALGORITHM})')
+    parser.add_argument('--hash-threshold', type=int, default=image_hash.DEFAULT_THRESHOLD,
+                        help=f'max Hamming distance (of 64 bits) for --near-duplicates '
+                             f'(default {image_hash.DEFAULT_THRESHOLD})')
+    parser.add_argument('--trace-rasters', action='store_true',
+                        help='trace rasters into currentColor paths (requires Pillow, see raster_trace.py)')
+    parser.add_argument('--trace-levels', type=int, choices=sorted(raster_trace.OPACITIES),
+                        default=raster_trace.DEFAULT_LEVELS,
+                        help=f'max opacity layers per traced raster (default {raster_trace.DEFAULT_LEVELS})')
+    parser.add_argument('--trace-size', type=int, default=raster_trace.DEFAULT_SIZE,
+                        help=f'trace grid, longest side in pixels (default {raster_trace.DEFAULT_SIZE})')
+    parser.add_argument('--trace-tolerance', type=float, default=raster_trace.DEFAULT_TOLERANCE,
+                        help=f'path simplification in grid pixels (default {raster_trace.DEFAULT_TOLERANCE})')
+    parser.add_argument('--trace-min-fidelity', type=float, default=raster_trace.DEFAULT_MIN_FIDELITY,
+                        help=f'keep the raster when fewer than this %% of pixels match '
+                             f'(default {raster_trace.DEFAULT_MIN_FIDELITY:g})')
+    parser.add_argument('--optimize-rasters', action='store_true',
+                        help='downscale, strip and re-encode rasters first (requires Pillow)')
+    parser.add_argument('--raster-format', choices=raster_optimize.FORMATS, default='auto',
+                        help='encoding for --optimize-rasters (default auto: keep PNG/JPEG family)')
+    parser.add_argument('--raster-scale', type=int, default=2,
+                        help=f'pixel density for --optimize-rasters: longest side = {RASTER_DISPLAY_SIZE} x scale (default 2)')
+    parser.add_argument('--minify', action='store_true',
+                        help='round coordinates and strip editor cruft from SVG originals (see svg_minify.py)')
+    parser.add_argument('--precision', type=int, default=svg_minify.DEFAULT_PRECISION,
+                        help=f'decimal places kept by --minify (default {svg_minify.DEFAULT_PRECISION})')
+    parser.add_argument('--shared-library', action='store_true',
+                        help='store vector artwork once in the library shared with the CMS logo sheet and <use> it')
+    parser.add_argument('--time-jobs', action='store_true',
+                        help='time uncached hashing/rendering with 1 and --jobs workers before building')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='report the peak Python heap of this process against the largest original')
+    build_stats.add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def pool_map(jobs, fn, *iterables):
+    """map() over a process pool when jobs > 1; results keep input order."""
+    if jobs <= 1:
+        return list(map(fn, *iterables))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(fn, *iterables, chunksize=4))
+
+
+def symbol_id_for(fn):
+    name = os.path.splitext(fn)[0]
+    return 'druplicon-' + slugify(name)
+
+
+def publish_rasters(rasters):
+    """Copy external rasters into RASTER_DIR and drop ones no longer used.
+
+    `rasters` maps target filename -> source path. Returns total bytes.
+    """
+    os.makedirs(RASTER_DIR, exist_ok=True)
+    total = 0
+    for name, src in rasters.items():
+        target = os.path.join(RASTER_DIR, name)
+        if not os.path.exists(target):
+            shutil.copyfile(src, target)
+        total += os.path.getsize(target)
+    for name in os.listdir(RASTER_DIR):
+        if name not in rasters:
+            os.remove(os.path.join(RASTER_DIR, name))
+    return total
+
+
+def drop_near_duplicates(winners, catalog, jobs, algo, threshold, stats):
+    """Keep one original per near-duplicate cluster, preferring vector artwork.
+
+    Rasters, and SVGs when they can be rendered (image_hash.svg_available()),
+    are clustered by perceptual hash. SVGs that cannot be rendered are
+    paired with rasters of the same name (`a.svg` and `a.png`) instead. A
+    cluster keeps its first SVG, which scales and themes better than any
+    raster; without one, the raster with the most pixels.
+    Prints each cluster and the bytes saved; returns the surviving winners.
+    """
+    if not image_hash.available():
+        print('Pillow is not installed; --near-duplicates ignored (pip install Pillow)')
+        return winners
+    all_paths = {fn: path for fn, path, _ in winners}
+    ids = {fn: symbol_id for fn, _, symbol_id in winners}
+    ext = {fn: os.path.splitext(fn)[1].lower() for fn in all_paths}
+    hashable = ('.svg',) + tuple(RASTER_MIME_TYPES) if image_hash.svg_available() else tuple(RASTER_MIME_TYPES)
+    paths = {fn: path for fn, path in all_paths.items() if ext[fn] in hashable}
+    todo = [fn for fn in paths if catalog.phash(fn, algo) is None]
+    for fn in paths:
+        if fn not in todo:
+            stats.add('near-duplicates', fn, cached=True)
+    timed_hash = functools.partial(build_stats.timed_call, image_hash.image_hash)
+    for fn, (seconds, h) in zip(todo, pool_map(jobs, timed_hash, [paths[fn] for fn in todo], [algo] * len(todo))):
+        catalog.set_phash(fn, algo, h)
+        stats.add('near-duplicates', fn, seconds, read=os.path.getsize(paths[fn]), cached=False)
+    phashes = {fn: catalog.phash(fn, algo) for fn in paths}
+    groups = image_hash.clusters({fn: h for fn, h in phashes.items() if h}, threshold)
+    
+    # SVGs that could not be hashed: pair them with rasters of the same name
+    clustered = {fn for group in groups for fn in group}
+    stems = {}
+    for fn in all_paths:
+        if ext[fn] in RASTER_MIME_TYPES and fn not in clustered:
+            stems.setdefault(os.path.splitext(fn)[0].lower(), []).append(fn)
+    for fn in all_paths:
+        if ext[fn] == '.svg' and not phashes.get(fn):
+            twins = stems.pop(os.path.splitext(fn)[0].lower(), [])
+            if twins:
+                groups.append([fn] + twins)
+    
+    def resolution(fn):
+        size = catalog.dimensions(fn) or (0, 0)
+        return size[0] * size[1], os.path.getsize(all_paths[fn])
+    
+    def sprite_size(fn):
+        if ext[fn] in RASTER_MIME_TYPES:
+            return inline_raster_size(all_paths[fn], ids[fn])
+        return os.path.getsize(all_paths[fn])
+    
+    dropped = set()
+    source_bytes = sprite_bytes = 0
+    for group in groups:
+        vectors = [fn for fn in group if ext[fn] == '.svg']
+        # ties keep the first in sorted order
+        keep = vectors[0] if vectors else max(group, key=resolution)
+        print(f'Near-duplicate cluster ({algo}, threshold {threshold}): keeping {keep}')
+        for fn in group:
+            if fn == keep:
+                continue
+            dropped.add(fn)
+            source_bytes += os.path.getsize(all_paths[fn])
+            sprite_bytes += sprite_size(fn)
+            if phashes.get(fn) and phashes.get(keep):
+                match = f'distance {image_hash.hamming(phashes[fn], phashes[keep])}'
+            else:
+                match = 'same name'
+            print(f'  dropping {fn} ({match}, {os.path.getsize(all_paths[fn])} bytes)')
+    print(f'Near-duplicates: {len(groups)} clusters, {len(dropped)} files dropped, '
+          f'{source_bytes} bytes of originals, {sprite_bytes} bytes of inline sprite saved')
+    return [w for w in winners if w[0] not in dropped]
+
+
+def trace_rasters(winners, hashes, jobs, args, stats):
+    """Trace raster winners; returns {fn: trace result} for those good enough to use."""
+    rasters = [w for w in winners if os.path.splitext(w[0])[1].lower() in RASTER_MIME_TYPES]
+    n = len(rasters)
+    results = pool_map(jobs, functools.partial(build_stats.timed_call, raster_trace.trace_raster),
+                       [path for _, path, _ in rasters],
+                       [hashes[fn] for fn, _, _ in rasters], [TRACED_DIR] * n, [args.trace_levels] * n,
+                       [args.trace_size] * n, [args.trace_tolerance] * n)
+    traced = {}
+    reports = []
+    for (fn, path, symbol_id), (seconds, (result, cached)) in zip(rasters, results):
+        stats.add('trace', fn, seconds, read=os.path.getsize(path), cached=cached)
+        report = {'file': fn, 'before': inline_raster_size(path, symbol_id), 'after': None, 'cached': cached}
+        if result and result['layers']:
+            report.update(after=len(traced_symbol(result, symbol_id).encode('utf-8')),
+                          layers=len(result['layers']), fidelity=result['fidelity'])
+            if result['fidelity'] >= args.trace_min_fidelity:
+                traced[fn] = result
+        reports.append(report)
+    print('Traced rasters:')
+    raster_trace.print_report(reports, args.trace_min_fidelity)
+    return traced
+
+
+def write_sprite(path, files):
+    """Concatenate rendered symbol files into a sprite, one chunk at a time."""
+    with open(path, 'wb') as out:
+        out.write(SPRITE_HEADER.encode('utf-8'))
+        for name in files:
+            sprite_stream.copy_file(out, name)
+            out.write(b'\n')
+        out.write(SPRITE_FOOTER.encode('utf-8'))
+
+
+def share_symbols(symbols, library, from_dir, stub_dir, skip=()):
+    """Move vector symbol artwork into `library`; returns (symbol_id, stub file) pairs.
+
+    Each stub keeps the symbol's id and viewBox and `<use>`s the library
+    copy. Ids in `skip` (rasters), symbols embedding a data URI and symbols
+    not in the usual one-tag form are kept.
+    """
+    shared = []
+    for symbol_id, file in symbols:
+        with open(file, 'r', encoding='utf-8') as fh:
+            parts = None if symbol_id in skip else symbol_library.parse_symbol(fh.read())
+        if not parts or 'href="data:' in parts[2]:
+            shared.append((symbol_id, file))
+            continue
+        _, viewbox, inner = parts
+        lib_id = library.add(viewbox, inner, symbol_id)
+        stub = os.path.join(stub_dir, symbol_id + '.svg')
+        with open(stub, 'w', encoding='utf-8') as fh:
+            fh.write(f'<symbol id="{symbol_id}" viewBox="{viewbox}">{library.use(lib_id, from_dir)}</symbol>')
+        shared.append((symbol_id, stub))
+    return shared
+
+
+def plan_shards(symbols, max_bytes):
+    """Group (symbol_id, symbol file) pairs into runs whose sprite file fits `max_bytes`.
+
+    Order is kept. A symbol bigger than the bound gets a shard of its own.
+    """
+    overhead = len(SPRITE_HEADER) + len(SPRITE_FOOTER)
+    shards = []
+    current = []
+    size = overhead
+    for symbol_id, file in symbols:
+        n = os.path.getsize(file) + 1
+        if current and size + n > max_bytes:
+            shards.append(current)
+            current = []
+            size = overhead
+        current.append((symbol_id, file))
+        size += n
+    if current:
+        shards.append(current)
+    return shards
+
+
+def write_shards(symbols, per_symbol=False, max_bytes=None):
+    """Write SHARD_DIR afresh; returns {symbol_id: shard path relative to BASE}."""
+    if os.path.isdir(SHARD_DIR):
+        shutil.rmtree(SHARD_DIR)
+    os.makedirs(SHARD_DIR)
+    if per_symbol:
+        groups = [([pair], f'{pair[0]}.svg') for pair in symbols]
+    else:
+        groups = [(group, f'druplicon-sprite-{i:03d}.svg')
+                  for i, group in enumerate(plan_shards(symbols, max_bytes), 1)]
+    locations = {}
+    for group, name in groups:
+        write_sprite(os.path.join(SHARD_DIR, name), [file for _, file in group])
+        for symbol_id, _ in group:
+            locations[symbol_id] = f'{SHARD_DIRNAME}/{name}'
+    return locations
+
+
+def symbol_details(fn, path, kind, sha1):
+    """Index fields describing one symbol's source."""
+    details = {'file': fn, 'type': kind, 'sha1': sha1}
+    if kind == 'raster':
+        size = image_size(path)
+        details['width'], details['height'] = size if size else (None, None)
+    return details
+
+
+def symbol_viewbox(file):
+    """viewBox of the `<symbol>` start tag at the head of a rendered symbol file."""
+    with open(file, 'rb') as fh:
+        m = SYMBOL_VIEWBOX_RE.match(fh.read(4096).decode('utf-8', 'ignore'))
+    return m.group(1) if m else None
+
+
+def write_index(symbols, locations, details):
+    """druplicon-index.json/.js: symbol id -> shard, byte size, viewBox and source details."""
+    index = {'version': INDEX_VERSION, 'shards': sorted(set(locations.values())), 'symbols': {}}
+    for symbol_id, file in symbols:
+        viewbox = symbol_viewbox(file)
+        entry = {
+            'shard': locations[symbol_id],
+            'bytes': os.path.getsize(file),
+            'viewBox': viewbox,
+        }
+        entry.update(details[symbol_id])
+        if entry['type'] in ('svg', 'traced'):
+            # Vector symbols are sized by their viewBox
+            parts = (viewbox or '').replace(',', ' ').split()
+            size = [float(v) for v in parts[2:4]] if len(parts) == 4 else [None, None]
+            entry['width'], entry['height'] = [int(v) if v is not None and v.is_integer() else v for v in size]
+        index['symbols'][symbol_id] = entry
+    with open(INDEX_JSON, 'w', encoding='utf-8') as fh:
+        json.dump(index, fh, indent=1)
+        fh.write('\n')
+    with open(INDEX_JS, 'w', encoding='utf-8') as fh:
+        fh.write('// Generated by scripts/build_druplicon_sprite.py -- do not edit.\n')
+        fh.write('window.DrupliconIndex = ')
+        json.dump(index, fh, separators=(',', ':'))
+        fh.write(';\n')
+    return index
+
+
+def time_jobs(items, jobs):
+    """Print serial vs parallel wall time for the uncached per-file work."""
+    paths = [path for _, path in items]
+    fns = [fn for fn, _ in items]
+    ids = [symbol_id_for(fn) for fn in fns]
+    timings = {}
+    for n in sorted({1, jobs}):
+        start = time.perf_counter()
+        pool_map(n, asset_catalog.hash_file, paths)
+        pool_map(n, render_symbol, paths, fns, ids)
+        timings[n] = time.perf_counter() - start
+        print(f'  jobs={n}: {timings[n]:.3f}s for {len(items)} files')
+    if jobs > 1 and timings[jobs]:
+        print(f'  speedup: {timings[1] / timings[jobs]:.2f}x with {jobs} jobs')
+
+
+def print_minify_report(cache, winners):
+    """Bytes saved per minified symbol (from the cache index, so reused symbols count too)."""
+    before = after = 0
+    print('Minified SVG symbols:')
+    for fn, _, symbol_id in winners:
+        report = cache.index.get(fn, {}).get('minify')
+        if report:
+            before += report['before']
+            after += report['after']
+            print(svg_minify.format_stats(symbol_id, report['before'], report['after'], report))
+    print(f'Minify total: {before} -> {after} bytes ({after - before:+d})')
+
+
+def main(argv=None):
+    args = parse_args(argv)
     if not os.path.isdir(IN_DIR):
         print('No originals directory:', IN_DIR)
         return
+    if args.trace_memory:
+        sprite_stream.start_trace()
+    stats = build_stats.BuildStats('build_druplicon_sprite', keep_files=build_stats.wanted(args))
+    catalog = asset_catalog.AssetCatalog(CATALOG_FILE)
     
-    # Deduplicate by sha1
-    seen = {}
-    symbols = []
-    manifest = []
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    with stats.stage('list'):
+        items = catalog.listing(IN_DIR)
+    if args.time_jobs:
+        print(f'Timing per-file work (cpu count {os.cpu_count()}):')
+        time_jobs(items, jobs)
     
-    for fn in sorted(os.listdir(IN_DIR)):
-        path = os.path.join(IN_DIR, fn)
-        if not os.path.isfile(path):
-            continue
-        
-        ext = os.path.splitext(fn)[1].lower()
-        if ext not in ('.svg', '.png', '.jpg', '.jpeg', '.gif'):
-            continue
-        
-        h = sha1_file(path)
+    sharded = args.shard_per_symbol or args.shard_size is not None
+    if args.shard_size is not None and args.shard_size <= 0:
+        print('--shard-size must be a positive number of bytes')
+        return
+    # Raster hrefs are relative to the file holding the symbol
+    raster_prefix = '../' if sharded else ''
+    variant = 'external' if args.external_rasters else 'inline'
+    if args.external_rasters and sharded:
+        variant = 'external-sharded'
+    optimize = args.optimize_rasters and raster_optimize.available()
+    if args.optimize_rasters and not optimize:
+        print('Pillow is not installed; --optimize-rasters ignored (pip install Pillow)')
+    if optimize:
+        variant += '+' + raster_optimize.settings_key(RASTER_DISPLAY_SIZE, args.raster_scale, args.raster_format, 85)
+    trace = args.trace_rasters and raster_trace.available()
+    if args.trace_rasters and not trace:
+        print('Pillow is not installed; --trace-rasters ignored (pip install Pillow)')
+    if trace:
+        variant += '+trace-' + raster_trace.settings_key(args.trace_levels, args.trace_size, args.trace_tolerance)
+        variant += f'-f{args.trace_min_fidelity:g}'
+    if args.minify:
+        variant += f'+min{args.precision}'
+    cache = BuildCache(CACHE_DIR, enabled=not args.no_cache, variant=variant)
+    present = {fn for fn, _ in items}
+    
+    # Hash only what the catalog has not seen at its current mtime/size
+    start = time.perf_counter()
+    with stats.stage('hash'):
+        stale = items if args.no_cache else catalog.stale(items)
+        fresh = {fn for fn, _ in stale}
+        for fn, _ in items:
+            if fn not in fresh:
+                stats.add('hash', fn, cached=True)
+        timed_hash = functools.partial(build_stats.timed_call, asset_catalog.hash_file)
+        for (fn, path), (seconds, digests) in zip(stale, pool_map(jobs, timed_hash, [p for _, p in stale])):
+            catalog.record(fn, path, digests)
+            stats.add('hash', fn, seconds, read=os.path.getsize(path), cached=False)
+        catalog.commit()
+        hashes = catalog.sha1s()
+    hash_time = time.perf_counter() - start
+    # Only these need rendering; the rest are taken from the build cache
+    build_version = f'{NORMALIZER_VERSION}:{variant}'
+    changed = set(catalog.unprocessed(build_version)) if cache.enabled else set(hashes)
+    if cache.enabled:
+        print(f'Catalog: {len(changed)} of {len(items)} originals new or changed since the last {variant} build')
+    
+    # Deduplicate by sha1, first filename in sorted order wins
+    seen = {}
+    winners = []
+    for fn, path in items:
+        h = hashes[fn]
         if h in seen:
             print(f'Skipping duplicate: {fn} (same as {seen[h]})')
             continue
         seen[h] = fn
-        
-        name = os.path.splitext(fn)[0]
-        symbol_id = 'druplicon-' + slugify(name)
-        
-        if ext == '.svg':
-            # Process SVG with color normalization
-            with open(path, 'r', encoding='utf-8', errors='ignore') as fh:
-                txt = fh.read()
-            vb, inner = normalize_svg(txt)
-            if inner is None:
+        winners.append((fn, path, symbol_id_for(fn)))
+    if args.near_duplicates:
+        with stats.stage('near-duplicates'):
+            winners = drop_near_duplicates(winners, catalog, jobs, args.hash_algo, args.hash_threshold, stats)
+    
+    # Rasters replaced by their traced paths
+    traced = {}
+    if trace:
+        with stats.stage('trace'):
+            traced = trace_rasters(winners, hashes, jobs, args, stats)
+    
+    # The file actually embedded or published for each winner
+    sources = {fn: path for fn, path, _ in winners}
+    raster_fns = [fn for fn, _, _ in winners
+                  if os.path.splitext(fn)[1].lower() in RASTER_MIME_TYPES and fn not in traced]
+    if optimize:
+        n = len(raster_fns)
+        with stats.stage('optimize-rasters'):
+            results = pool_map(jobs, functools.partial(build_stats.timed_call, raster_optimize.optimize_raster),
+                               [sources[fn] for fn in raster_fns], [hashes[fn] for fn in raster_fns],
+                               [OPTIMIZED_DIR] * n, [RASTER_DISPLAY_SIZE] * n,
+                               [args.raster_scale] * n, [args.raster_format] * n)
+        for fn, (seconds, (opt_path, _)) in zip(raster_fns, results):
+            stats.add('optimize-rasters', fn, seconds, read=os.path.getsize(sources[fn]),
+                      written=build_stats.file_size(opt_path))
+            sources[fn] = opt_path
+        raster_optimize.print_report([report for _, (_, report) in results])
+    
+    # External raster files, keyed by their content-hashed name
+    rasters = {}
+    hrefs = {}
+    if args.external_rasters:
+        for fn, path, symbol_id in winners:
+            if fn in raster_fns:
+                src = sources[fn]
+                h = hashes[fn] if src == path else sha1_file(src)
+                name = raster_filename(symbol_id, h, os.path.splitext(src)[1])
+                rasters[name] = src
+                hrefs[fn] = f'{raster_prefix}{RASTER_DIRNAME}/{name}'
+    
+    # Render cache misses straight to symbol files, possibly in parallel
+    start = time.perf_counter()
+    rendered = {}  # fn -> (kind, symbol file or None)
+    with stats.stage('render'):
+        for fn, _, _ in winners:
+            cached = cache.get(fn) if fn not in changed else None
+            if cached is not None:
+                rendered[fn] = cached
+                stats.add('render', fn, cached=True)
+        cache.hits = len(rendered)
+        todo = [w for w in winners if w[0] not in rendered]
+        cache.misses = len(todo)
+        precision = args.precision if args.minify else None
+        results = pool_map(jobs, functools.partial(build_stats.timed_call, render_symbol_file),
+                           [cache.symbol_path(hashes[w[0]], w[2]) for w in todo],
+                           [sources[w[0]] for w in todo], [w[0] for w in todo], [w[2] for w in todo],
+                           [hrefs.get(w[0]) for w in todo], [precision] * len(todo),
+                           [traced.get(w[0]) for w in todo])
+        for (fn, _, symbol_id), (seconds, (kind, written, report)) in zip(todo, results):
+            rendered[fn] = (kind, cache.put(fn, cache.symbol_path(hashes[fn], symbol_id), kind, written, report))
+            stats.add('render', fn, seconds, read=os.path.getsize(sources[fn]),
+                      written=build_stats.file_size(rendered[fn][1]), cached=False)
+    render_time = time.perf_counter() - start
+    
+    symbols = []  # (symbol_id, symbol file)
+    manifest = []
+    details = {}  # symbol_id -> source fields for the index
+    inline_delta = 0  # extra sprite bytes if external rasters were inlined
+    for fn, path, symbol_id in winners:
+        kind, file = rendered[fn]
+        if file is None:
+            if kind == 'svg':
                 print(f'Skipping invalid SVG: {fn}')
-                continue
-            symbol = f'<symbol id="{symbol_id}" viewBox="{vb}">{inner}</symbol>'
-            symbols.append(symbol)
+            continue
+        symbols.append((symbol_id, file))
+        details[symbol_id] = symbol_details(fn, sources[fn], kind, hashes[fn])
+        if kind == 'svg':
             manifest.append(f'{symbol_id}: {fn} (SVG, normalized)')
             print(f'Added SVG: {symbol_id}')
+        elif kind == 'traced':
+            manifest.append(f"{symbol_id}: {fn} (traced raster, {len(traced[fn]['layers'])} opacity layer(s))")
+            print(f'Added traced raster: {symbol_id}')
+        elif fn in hrefs:
+            inline_delta += inline_raster_size(sources[fn], symbol_id) - os.path.getsize(file)
+            manifest.append(f'{symbol_id}: {fn} (external raster {hrefs[fn]})')
+            print(f'Added raster: {symbol_id} -> {hrefs[fn]}')
+        else:
+            manifest.append(f'{symbol_id}: {fn} (embedded raster)')
+            print(f'Added raster: {symbol_id}')
+    
+    if args.minify:
+        print_minify_report(cache, winners)
+    
+    library = None
+    if args.shared_library:
+        with stats.stage('shared-library'):
+            library = symbol_library.SymbolLibrary('druplicons')
+            stub_dir = tempfile.mkdtemp(prefix='druplicon-stubs-')
+            raster_ids = {symbol_id_for(fn) for fn, (kind, _) in rendered.items() if kind == 'raster'}
+            symbols = share_symbols(symbols, library, SHARD_DIR if sharded else BASE, stub_dir, raster_ids)
+    
+    # Write sprite (or shards) and the symbol index
+    with stats.stage('write') as totals:
+        if sharded:
+            locations = write_shards(symbols, args.shard_per_symbol, args.shard_size)
         else:
-            # Embed raster image
-            symbol = embed_raster_as_svg(path, symbol_id)
-            if symbol:
-                symbols.append(symbol)
-                manifest.append(f'{symbol_id}: {fn} (embedded raster)')
-                print(f'Added raster: {symbol_id}')
-    
-    # Write sprite
-    with open(OUT_SVG, 'w', encoding='utf-8') as out:
-        out.write('<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" style="display:none">\n')
-        for s in symbols:
-            out.write(s + '\n')
-        out.write('</svg>\n')
+            write_sprite(OUT_SVG, [file for _, file in symbols])
+            if os.path.isdir(SHARD_DIR):
+                shutil.rmtree(SHARD_DIR)
+            locations = {symbol_id: os.path.basename(OUT_SVG) for symbol_id, _ in symbols}
+        index = write_index(symbols, locations, details)
+        totals['written'] += sum(build_stats.file_size(os.path.join(BASE, shard)) for shard in index['shards'])
+        totals['written'] += build_stats.file_size(INDEX_JSON) + build_stats.file_size(INDEX_JS)
+    if library:
+        with stats.stage('shared-library'):
+            library.save()
+            shutil.rmtree(stub_dir)
+    # After writing: with --no-cache this removes the temporary symbol files
+    with stats.stage('cache-save'):
+        if cache.enabled:
+            # Changed originals that were not rendered (duplicates) must not keep an old symbol
+            for fn in changed - set(rendered):
+                cache.index.pop(fn, None)
+            catalog.mark_processed(present, build_version)
+        cache.save(present)
+        catalog.close()
     
     # Write manifest
     manifest_path = os.path.join(BASE, 'druplicon-manifest.txt')
     with open(manifest_path, 'w', encoding='utf-8') as f:
         f.write('\n'.join(manifest))
     
-    print(f'\nWrote sprite with {len(symbols)} symbols to {OUT_SVG}')
+    if args.external_rasters:
+        with stats.stage('publish-rasters') as totals:
+            raster_bytes = publish_rasters(rasters)
+            totals['written'] += raster_bytes
+    elif os.path.isdir(RASTER_DIR):
+        shutil.rmtree(RASTER_DIR)
+    
+    if sharded:
+        sizes = [os.path.getsize(os.path.join(BASE, shard)) for shard in index['shards']]
+        print(f'\nWrote {len(symbols)} symbols to {len(sizes)} shards in {SHARD_DIR} '
+              f'({min(sizes, default=0)}-{max(sizes, default=0)} bytes each, {sum(sizes)} total)')
+    else:
+        print(f'\nWrote sprite with {len(symbols)} symbols to {OUT_SVG}')
+    print(f'Symbol index written to {INDEX_JSON} and {os.path.basename(INDEX_JS)}')
+    if args.external_rasters:
+        if not sharded:
+            sprite_bytes = os.path.getsize(OUT_SVG)
+            print(f'Sprite size: {sprite_bytes} bytes with external rasters, '
+                  f'{sprite_bytes + inline_delta} bytes with rasters inlined')
+        print(f'External rasters: {len(rasters)} files, {raster_bytes} bytes in {RASTER_DIR}')
     print(f'Manifest written to {manifest_path}')
+    if library:
+        print(library.summary())
+    if cache.enabled:
+        print(f'Build cache: {cache.hits} reused, {cache.misses} rebuilt')
+    print(f'Timing (jobs={jobs}): hashed {len(stale)} files in {hash_time:.3f}s, '
+          f'rendered {cache.misses} symbols in {render_time:.3f}s')
+    stats.finish(args)
+    sprite_stream.print_peak(path for _, path in items)
 
 if __name__ == '__main__':
     main()
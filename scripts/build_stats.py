@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Per-stage timing and a structured report for the asset pipelines.
+
+The crawler and both sprite builders print free-text progress, which does
+not say whether a slow run spent its time on the network, hashing, colour
+normalization, base64 or writing XML. Each of them keeps a `BuildStats`:
+
+- `stage(name)` times a block of the run (wall clock, summed per stage)
+- `add(stage, name, seconds, read, written, cached)` records one input:
+  its time in that stage, bytes read and written, and whether it came from
+  a cache (counted as a hit or miss of that stage)
+- `timed(stage, name)` does both for work on one input done in this thread
+- `count(group, **counters)` keeps other totals, e.g. asset store statuses
+
+A stage's wall time and the sum of its per-file times differ when its
+files are processed in parallel, or when only one of the two was recorded.
+
+With `--stats` the run ends with a table of stages, cache hit rates, peak
+memory and the `--stats-top` slowest inputs; `--report FILE` writes the same
+data plus every per-file record as JSON (REPORT_VERSION). Stage totals
+are always recorded. The per-file records grow with the number of inputs,
+so a run that prints neither passes `keep_files=False` (see `wanted()`)
+and keeps only the totals.
+
+Work done in a process pool is timed inside the worker with `timed_call()`,
+so per-file times are the time spent on that file, not pool latency. Peak
+memory is the peak RSS of this process and of its finished worker
+processes (`resource`, not available on Windows), plus the traced Python
+heap if tracemalloc is still running (`--trace-memory`) when the run ends.
+"""
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_VERSION = 1
+DEFAULT_TOP = 10
+
+
+def add_arguments(parser):
+    parser.add_argument('--stats', action='store_true',
+                        help='print per-stage timing, cache hits, peak memory and the slowest inputs')
+    parser.add_argument('--stats-top', type=int, default=DEFAULT_TOP, metavar='N',
+                        help=f'slowest inputs listed by --stats (default {DEFAULT_TOP})')
+    parser.add_argument('--report', metavar='FILE',
+                        help='write the --stats data and per-file records as JSON (e.g. build-report.json)')
+
+
+def wanted(args):
+    """Whether the run asked for --stats or --report, the only users of per-file records."""
+    return bool(args.stats or args.report)
+
+
+def timed_call(fn, *args):
+    """(seconds, fn(*args)); use with functools.partial to time work inside pool workers."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def file_size(path):
+    """Size of `path`, or 0 if it does not exist."""
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
+
+
+def _max_rss(who):
+    if resource is None:
+        return None
+    rss = resource.getrusage(who).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024  # bytes on macOS, KB elsewhere
+
+
+def peak_memory():
+    """{'rss', 'children_rss', 'traced'} peaks in bytes (None where unavailable)."""
+    return {
+        'rss': _max_rss(resource.RUSAGE_SELF) if resource else None,
+        'children_rss': _max_rss(resource.RUSAGE_CHILDREN) if resource else None,
+        'traced': tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None,
+    }
+
+
+class BuildStats:
+    """Stage timings, per-file records and counters of one run (thread-safe)."""
+
+    def __init__(self, tool, keep_files=True):
+        self.tool = tool
+        self.keep_files = keep_files
+        self.started = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        # name -> {'seconds' (wall), 'runs', 'files', 'file_seconds', 'read', 'written', 'hits', 'misses'}
+        self.stages = {}
+        self.files = []  # {'stage', 'name', 'seconds', 'read', 'written', 'cached'}
+        self.counters = {}  # group -> {name: value}
+
+    def _stage(self, name):
+        return self.stages.setdefault(name, {'seconds': 0.0, 'runs': 0, 'files': 0, 'file_seconds': 0.0,
+                                             'read': 0, 'written': 0, 'hits': 0, 'misses': 0})
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time a block as part of stage `name`; yields the stage totals (add output bytes to 'written')."""
+        with self._lock:
+            totals = self._stage(name)
+        start = time.perf_counter()
+        try:
+            yield totals
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                totals['seconds'] += elapsed
+                totals['runs'] += 1
+
+    def add(self, stage, name, seconds=0.0, read=0, written=0, cached=None):
+        """Record one input's work in `stage`; `cached` True/False counts a cache hit/miss."""
+        with self._lock:
+            s = self._stage(stage)
+            s['files'] += 1
+            s['file_seconds'] += seconds
+            s['read'] += read
+            s['written'] += written
+            if cached is not None:
+                s['hits' if cached else 'misses'] += 1
+            if self.keep_files:
+                self.files.append({'stage': stage, 'name': name, 'seconds': seconds, 'read': read,
+                                   'written': written, 'cached': cached})
+
+    @contextlib.contextmanager
+    def timed(self, stage, name):
+        """Time serial work on one input as part of `stage`.
+
+        Yields the record, whose 'read', 'written' and 'cached' the block may set.
+        """
+        record = {'read': 0, 'written': 0, 'cached': None}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            elapsed = time.perf_counter() - start
+            self.add(stage, name, elapsed, record['read'], record['written'], record['cached'])
+            with self._lock:
+                totals = self._stage(stage)
+                totals['seconds'] += elapsed
+                totals['runs'] += 1
+
+    def count(self, group, **counters):
+        with self._lock:
+            totals = self.counters.setdefault(group, {})
+            for key, value in counters.items():
+                totals[key] = totals.get(key, 0) + value
+
+    def slowest(self, n):
+        """The `n` inputs with the most total time, as (name, seconds, {stage: seconds}).
+
+        Cache hits are left out of the per-stage breakdown.
+        """
+        per_name = {}
+        for f in self.files:
+            if f['cached']:
+                continue
+            stages = per_name.setdefault(f['name'], {})
+            stages[f['stage']] = stages.get(f['stage'], 0.0) + f['seconds']
+        ranked = sorted(per_name.items(), key=lambda item: (-sum(item[1].values()), item[0]))
+        return [(name, sum(stages.values()), stages) for name, stages in ranked[:n]]
+
+    def data(self):
+        return {
+            'version': REPORT_VERSION,
+            'tool': self.tool,
+            'argv': sys.argv[1:],
+            'started': self.started.isoformat(timespec='seconds'),
+            'seconds': time.perf_counter() - self._start,
+            'peak_memory': peak_memory(),
+            'stages': self.stages,
+            'counters': self.counters,
+            'files': self.files,
+        }
+
+    def finish(self, args):
+        """Print the summary for --stats and write --report; call at the end of a run."""
+        if not (args.stats or args.report):
+            return
+        data = self.data()
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as fh:
+                json.dump(data, fh, indent=1)
+                fh.write('\n')
+        if args.stats:
+            self.print_summary(data, args.stats_top)
+        if args.report:
+            print(f'Build report written to {args.report}')
+
+    def print_summary(self, data, top):
+        print(f'\nBuild stats ({self.tool}, {data["seconds"]:.3f}s):')
+        print(f'  {"stage":18} {"wall s":>8} {"files":>6} {"file s":>8} {"read":>12} {"written":>12}  cache')
+        for name, s in self.stages.items():
+            lookups = s['hits'] + s['misses']
+            cache = f'{s["hits"]}/{lookups} hits' if lookups else ''
+            wall = f'{s["seconds"]:8.3f}' if s['runs'] else f'{"-":>8}'
+            print(f'  {name:18} {wall} {s["files"]:6} {s["file_seconds"]:8.3f} {s["read"]:12} {s["written"]:12}'
+                  f'  {cache}')
+        for group, totals in self.counters.items():
+            print(f'  {group}: ' + ', '.join(f'{k} {v}' for k, v in totals.items()))
+        mem = data['peak_memory']
+        parts = [f'{label} {mem[key] / 1e6:.1f} MB' for key, label in
+                 (('rss', 'RSS'), ('children_rss', 'child processes RSS'), ('traced', 'traced heap')) if mem[key]]
+        if parts:
+            print('  Peak memory: ' + ', '.join(parts))
+        slow = self.slowest(top)
+        if slow:
+            print(f'  Slowest {len(slow)} inputs:')
+            for name, seconds, stages in slow:
+                # Stages under a millisecond are noise next to the slow ones
+                detail = ', '.join(f'{stage} {t:.3f}s' for stage, t in stages.items() if t >= 0.0005)
+                print(f'    {seconds:8.3f}s  {name} ({detail})')
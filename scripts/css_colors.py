@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""CSS colour parsing and luminance shared by the sprite builders.
+
+Both `scripts/build_druplicon_sprite.py` and
+`presentations/ca-slides/assets/build-logo-sprite.py` turn fill/stroke
+colours into greyscale levels. The same handful of colour strings recur
+thousands of times per build, so parsing is memoized with a bounded LRU.
+
+Understands `#rgb`, `#rgba`, `#rrggbb`, `#rrggbbaa`, `rgb()`/`rgba()`
+(integers or percentages, comma or space separated), `hsl()`/`hsla()`, the
+full CSS named-colour table and `transparent`. `none`, `currentColor` and
+anything unparseable yield None.
+
+Luminance weights are selectable: `rec709` (ITU-R BT.709, used by the
+druplicon sprite) and `rec601` (ITU-R BT.601, used by the CMS logo sheet).
+
+Usage: python3 scripts/css_colors.py   # prints a per-call microbenchmark
+"""
+import colorsys
+import functools
+import re
+import timeit
+
+LUMINANCE_MODELS = {
+    'rec709': (0.2126, 0.7152, 0.0722),
+    'rec601': (0.299, 0.587, 0.114),
+}
+
+NAMED_COLORS = {
+    'aliceblue': '#f0f8ff', 'antiquewhite': '#faebd7', 'aqua': '#00ffff',
+    'aquamarine': '#7fffd4', 'azure': '#f0ffff', 'beige': '#f5f5dc',
+    'bisque': '#ffe4c4', 'black': '#000000', 'blanchedalmond': '#ffebcd',
+    'blue': '#0000ff', 'blueviolet': '#8a2be2', 'brown': '#a52a2a',
+    'burlywood': '#deb887', 'cadetblue': '#5f9ea0', 'chartreuse': '#7fff00',
+    'chocolate': '#d2691e', 'coral': '#ff7f50', 'cornflowerblue': '#6495ed',
+    'cornsilk': '#fff8dc', 'crimson': '#dc143c', 'cyan': '#00ffff',
+    'darkblue': '#00008b', 'darkcyan': '#008b8b', 'darkgoldenrod': '#b8860b',
+    'darkgray': '#a9a9a9', 'darkgreen': '#006400', 'darkgrey': '#a9a9a9',
+    'darkkhaki': '#bdb76b', 'darkmagenta': '#8b008b', 'darkolivegreen': '#556b2f',
+    'darkorange': '#ff8c00', 'darkorchid': '#9932cc', 'darkred': '#8b0000',
+    'darksalmon': '#e9967a', 'darkseagreen': '#8fbc8f', 'darkslateblue': '#483d8b',
+    'darkslategray': '#2f4f4f', 'darkslategrey': '#2f4f4f', 'darkturquoise': '#00ced1',
+    'darkviolet': '#9400d3', 'deeppink': '#ff1493', 'deepskyblue': '#00bfff',
+    'dimgray': '#696969', 'dimgrey': '#696969', 'dodgerblue': '#1e90ff',
+    'firebrick': '#b22222', 'floralwhite': '#fffaf0', 'forestgreen': '#228b22',
+    'fuchsia': '#ff00ff', 'gainsboro': '#dcdcdc', 'ghostwhite': '#f8f8ff',
+    'gold': '#ffd700', 'goldenrod': '#daa520', 'gray': '#808080',
+    'green': '#008000', 'greenyellow': '#adff2f', 'grey': '#808080',
+    'honeydew': '#f0fff0', 'hotpink': '#ff69b4', 'indianred': '#cd5c5c',
+    'indigo': '#4b0082', 'ivory': '#fffff0', 'khaki': '#f0e68c',
+    'lavender': '#e6e6fa', 'lavenderblush': '#fff0f5', 'lawngreen': '#7cfc00',
+    'lemonchiffon': '#fffacd', 'lightblue': '#add8e6', 'lightcoral': '#f08080',
+    'lightcyan': '#e0ffff', 'lightgoldenrodyellow': '#fafad2', 'lightgray': '#d3d3d3',
+    'lightgreen': '#90ee90', 'lightgrey': '#d3d3d3', 'lightpink': '#ffb6c1',
+    'lightsalmon': '#ffa07a', 'lightseagreen': '#20b2aa', 'lightskyblue': '#87cefa',
+    'lightslategray': '#778899', 'lightslategrey': '#778899', 'lightsteelblue': '#b0c4de',
+    'lightyellow': '#ffffe0', 'lime': '#00ff00', 'limegreen': '#32cd32',
+    'linen': '#faf0e6', 'magenta': '#ff00ff', 'maroon': '#800000',
+    'mediumaquamarine': '#66cdaa', 'mediumblue': '#0000cd', 'mediumorchid': '#ba55d3',
+    'mediumpurple': '#9370db', 'mediumseagreen': '#3cb371', 'mediumslateblue': '#7b68ee',
+    'mediumspringgreen': '#00fa9a', 'mediumturquoise': '#48d1cc', 'mediumvioletred': '#c71585',
+    'midnightblue': '#191970', 'mintcream': '#f5fffa', 'mistyrose': '#ffe4e1',
+    'moccasin': '#ffe4b5', 'navajowhite': '#ffdead', 'navy': '#000080',
+    'oldlace': '#fdf5e6', 'olive': '#808000', 'olivedrab': '#6b8e23',
+    'orange': '#ffa500', 'orangered': '#ff4500', 'orchid': '#da70d6',
+    'palegoldenrod': '#eee8aa', 'palegreen': '#98fb98', 'paleturquoise': '#afeeee',
+    'palevioletred': '#db7093', 'papayawhip': '#ffefd5', 'peachpuff': '#ffdab9',
+    'peru': '#cd853f', 'pink': '#ffc0cb', 'plum': '#dda0dd',
+    'powderblue': '#b0e0e6', 'purple': '#800080', 'rebeccapurple': '#663399',
+    'red': '#ff0000', 'rosybrown': '#bc8f8f', 'royalblue': '#4169e1',
+    'saddlebrown': '#8b4513', 'salmon': '#fa8072', 'sandybrown': '#f4a460',
+    'seagreen': '#2e8b57', 'seashell': '#fff5ee', 'sienna': '#a0522d',
+    'silver': '#c0c0c0', 'skyblue': '#87ceeb', 'slateblue': '#6a5acd',
+    'slategray': '#708090', 'slategrey': '#708090', 'snow': '#fffafa',
+    'springgreen': '#00ff7f', 'steelblue': '#4682b4', 'tan': '#d2b48c',
+    'teal': '#008080', 'thistle': '#d8bfd8', 'tomato': '#ff6347',
+    'turquoise': '#40e0d0', 'violet': '#ee82ee', 'wheat': '#f5deb3',
+    'white': '#ffffff', 'whitesmoke': '#f5f5f5', 'yellow': '#ffff00',
+    'yellowgreen': '#9acd32',
+}
+
+FUNC_RE = re.compile(r'(rgba?|hsla?)\s*\(\s*([^)]*)\)$')
+
+
+def _channel(token):
+    """An rgb() channel (0-255 number or percentage) clamped to 0-255."""
+    if token.endswith('%'):
+        value = float(token[:-1]) * 255 / 100
+    else:
+        value = float(token)
+    return max(0, min(255, round(value)))
+
+
+def _alpha(token):
+    value = float(token[:-1]) / 100 if token.endswith('%') else float(token)
+    return max(0.0, min(1.0, value))
+
+
+def _hue(token):
+    token = token.lower()
+    for unit, scale in (('deg', 1), ('grad', 0.9), ('rad', 57.29577951308232), ('turn', 360)):
+        if token.endswith(unit):
+            return float(token[:-len(unit)]) * scale
+    return float(token)
+
+
+def _hex(value):
+    if len(value) in (3, 4):
+        value = ''.join(c * 2 for c in value)
+    if len(value) not in (6, 8):
+        return None
+    try:
+        channels = [int(value[i:i + 2], 16) for i in range(0, len(value), 2)]
+    except ValueError:
+        return None
+    alpha = channels[3] / 255 if len(channels) == 4 else 1.0
+    return channels[0], channels[1], channels[2], alpha
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_rgba(color):
+    """Return (r, g, b, alpha) with 0-255 channels, or None."""
+    if not color:
+        return None
+    s = color.strip().lower()
+    if s == 'transparent':
+        return 0, 0, 0, 0.0
+    if s.startswith('#'):
+        return _hex(s[1:])
+    if s in NAMED_COLORS:
+        return _hex(NAMED_COLORS[s][1:])
+    m = FUNC_RE.match(s)
+    if not m:
+        return None
+    func, args = m.groups()
+    # Accept both "1, 2, 3, 0.5" and "1 2 3 / 0.5"
+    parts = [p for p in re.split(r'[\s,/]+', args) if p]
+    if len(parts) not in (3, 4):
+        return None
+    try:
+        alpha = _alpha(parts[3]) if len(parts) == 4 else 1.0
+        if func.startswith('rgb'):
+            return _channel(parts[0]), _channel(parts[1]), _channel(parts[2]), alpha
+        h = (_hue(parts[0]) % 360) / 360
+        sat = max(0.0, min(1.0, float(parts[1].rstrip('%')) / 100))
+        light = max(0.0, min(1.0, float(parts[2].rstrip('%')) / 100))
+        r, g, b = colorsys.hls_to_rgb(h, light, sat)
+        return round(r * 255), round(g * 255), round(b * 255), alpha
+    except ValueError:
+        return None
+
+
+def parse_rgb(color):
+    """Return (r, g, b) for a visible colour; None for none/transparent/unknown."""
+    rgba = parse_rgba(color)
+    if rgba is None or rgba[3] == 0:
+        return None
+    return rgba[:3]
+
+
+def luminance(rgb, model='rec709'):
+    """Weighted luminance (0-1) of an (r, g, b) tuple with 0-255 channels."""
+    wr, wg, wb = LUMINANCE_MODELS[model]
+    r, g, b = rgb[:3]
+    return (wr * r + wg * g + wb * b) / 255.0
+
+
+@functools.lru_cache(maxsize=1024)
+def color_luminance(color, model='rec709'):
+    """Luminance (0-1) of a CSS colour string, or None if it has no colour."""
+    rgb = parse_rgb(color)
+    return None if rgb is None else luminance(rgb, model)
+
+
+def microbenchmark(number=200000):
+    """Per-call cost of cached vs uncached parsing for typical inputs."""
+    samples = ['#0678be', '#fff', 'rgb(10, 20, 30)', 'rgba(0,0,0,.5)', 'hsl(210, 50%, 40%)', 'rebeccapurple']
+    print(f'{number} calls per sample')
+    for sample in samples:
+        cached = timeit.timeit(lambda: color_luminance(sample), number=number)
+        uncached = timeit.timeit(lambda: luminance(parse_rgba.__wrapped__(sample)), number=number // 10) * 10
+        print(f'  {sample:22} cached {cached / number * 1e9:7.0f} ns/call   '
+              f'uncached {uncached / number * 1e9:7.0f} ns/call')
+    print(f'  cache: {color_luminance.cache_info()}')
+
+
+if __name__ == '__main__':
+    microbenchmark()
@@ -1,16 +1,70 @@
 #!/usr/bin/env python3
 """Download druplicon images from topic pages.
 
-Usage: python3 scripts/download_druplicons.py
+Usage: python3 scripts/download_druplicons.py [--workers N] [--host-delay SECONDS] [--offline]
+                                             [--restart] [--stats] [--report FILE]
 
 This script fetches druplicon links from the topic pages and downloads
 the primary image (preferring SVG) into the presentations/ca-slides/assets/drupal/originals folder.
+
+Detail pages and images are fetched by a bounded thread pool (`--workers`),
+with requests to any single host spaced at least `--host-delay` seconds apart.
+Filenames are assigned serially in crawl order, so the output files and
+`druplicons_metadata.csv` are the same regardless of the worker count.
+
+Every saved original, and the detail page and image URL it came from, is
+recorded in the asset catalog shared with the sprite builder
+(`drupal/.asset-catalog.sqlite`, see `asset_catalog.py`);
+`druplicons_metadata.csv` is exported from it.
+
+Images are downloaded into the content-addressed store in `asset_store.py`
+(`drupal/.asset-store/<sha256><ext>`, not committed) and copied into
+`originals/` from there; `originals/druplicons.lock.json` records the
+SHA256, validators and saved filename of every image URL. Reruns revalidate
+with conditional requests, so only files that changed upstream are
+transferred, and an original whose content already matches is not
+rewritten. All requests go through the pooled keep-alive client in
+`http_client.py`.
+
+Progress is appended to a crawl journal (`drupal/.crawl-journal.jsonl`,
+not committed, see `CrawlJournal`) as the crawl goes: topic and index pages
+fetched, the image resolved for each detail page, and each download. An
+interrupted run, or one where pages or downloads failed, resumes from it,
+skipping everything already done. Once a crawl finishes cleanly only the
+index links survive: the next crawl fetches every detail page again, but
+stops paginating at the first index page holding only druplicons the
+finished crawl knew, taking the pages after it from the journal. `--restart` ignores the journal and crawls
+everything again.
+
+Pages are streamed into the HTML parser as they arrive (`HttpClient.stream`)
+rather than read whole first. A detail page is abandoned as soon as its
+`/files/druplicons/` SVG turns up, since nothing later on it is preferred;
+the run reports bytes read and parse time per page.
+
+`--stats` / `--report FILE` time page fetches, HTML parsing and image
+downloads per URL (see `build_stats.py`).
+
+`--offline` does not crawl: it checks every locked original against its
+SHA256 and restores missing or modified ones from the store, exiting
+non-zero if any cannot be restored.
 """
+from concurrent.futures import ThreadPoolExecutor
 from html.parser import HTMLParser
 from urllib.parse import urljoin, urlparse
-import urllib.request
+import argparse
+import codecs
+import json
 import os
+import shutil
 import sys
+import threading
+import time
+import urllib.error
+
+from asset_catalog import AssetCatalog, CATALOG_NAME
+from asset_store import AssetStore, OfflineError, sha256_file
+from build_stats import BuildStats, add_arguments as add_stats_arguments
+from http_client import HttpClient
 
 TOPIC_URLS = [
     'https://www.druplicon.org/druplicons?item[0]=topics:11',
@@ -26,73 +80,301 @@ PAGINATE_PAGES = 10
 BASE = 'https://www.druplicon.org'
 OUTDIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'presentations', 'ca-slides', 'assets', 'drupal', 'originals')
 os.makedirs(OUTDIR, exist_ok=True)
+STORE_DIR = os.path.join(os.path.dirname(OUTDIR), '.asset-store')
+JOURNAL_FILE = os.path.join(os.path.dirname(OUTDIR), '.crawl-journal.jsonl')
+LOCK_FILE = os.path.join(OUTDIR, 'druplicons.lock.json')
+CATALOG_FILE = os.path.join(os.path.dirname(OUTDIR), CATALOG_NAME)
+
+DEFAULT_WORKERS = 4
+IMAGE_PREFERENCE = ('.svg', '.png', '.jpg', '.jpeg')  # detail page artwork, best first
+DEFAULT_HOST_DELAY = 0.25
+USER_AGENT = 'druplicon-downloader/1.0'
+
+
+class HostRateLimiter:
+    """Space out requests to the same host by at least `interval` seconds."""
+
+    def __init__(self, interval=0.0):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        if self.interval <= 0:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class CrawlJournal:
+    """Append-only log of crawl progress, replayed to resume an interrupted crawl.
+
+    One JSON object per line, flushed as soon as the step is done:
+
+        {"topic": url, "links": [...]}                       topic page fetched
+        {"index": n, "links": [...]}                         index page n fetched
+        {"page": url, "image": url or null}                  detail page resolved
+        {"download": url, "target": name, "entry": {...}}    image saved (lock entry)
+        {"complete": true, "links": [...]}                   the crawl finished
+
+    Everything counts as done only since the last "complete"; a new crawl
+    fetches topic pages, index pages and detail pages again, so images
+    changed upstream are picked up. What a finished crawl leaves behind is
+    the links of each index page and every detail page it knew ("links"):
+    they let the next crawl stop paginating at the first page holding only
+    known druplicons. complete() compacts the file to just that, and is only
+    called when nothing failed, so a partial crawl is resumed instead.
+    """
+
+    def __init__(self, path, restart=False):
+        self.path = path
+        self._lock = threading.Lock()
+        self.topics = {}  # topic url -> links, this crawl
+        self.index_pages = {}  # page number -> links, this crawl
+        self.downloads = {}  # image url -> {'target', 'entry'}, this crawl
+        self.known_pages = {}  # page number -> links, latest of any crawl
+        self.images = {}  # detail page -> image url or None, this crawl
+        self.finished_links = set()  # detail pages known when the last crawl finished
+        self.failures = 0  # pages and downloads that failed in this run
+        valid = 0
+        if os.path.exists(path) and not restart:
+            with open(path, 'rb') as fh:
+                for line in fh:
+                    try:
+                        self._replay(json.loads(line))
+                    except ValueError:
+                        break  # torn last line of an interrupted run
+                    valid += len(line)
+        self.resumed = bool(self.topics or self.index_pages or self.images or self.downloads)
+        mode = 'r+b' if valid else 'wb'
+        self._fh = open(path, mode)
+        self._fh.truncate(valid)
+        self._fh.seek(valid)
+
+    def _replay(self, rec):
+        if 'complete' in rec:
+            self.finished_links = self.known_links() | set(rec.get('links', ()))
+            self.topics.clear()
+            self.index_pages.clear()
+            self.images.clear()
+            self.downloads.clear()
+        elif 'topic' in rec:
+            self.topics[rec['topic']] = rec['links']
+        elif 'index' in rec:
+            self.index_pages[rec['index']] = self.known_pages[rec['index']] = rec['links']
+        elif 'page' in rec:
+            self.images[rec['page']] = rec['image']
+        elif 'download' in rec:
+            self.downloads[rec['download']] = {'target': rec['target'], 'entry': rec['entry']}
+
+    def known_links(self):
+        links = set(self.images)
+        for page_links in self.known_pages.values():
+            links.update(page_links)
+        return links
+
+    def record(self, **rec):
+        with self._lock:
+            self._replay(rec)
+            self._fh.write(json.dumps(rec, sort_keys=True).encode('utf-8') + b'\n')
+            self._fh.flush()
+
+    def failed(self):
+        """Count a failed page or download; the crawl is then not marked complete."""
+        with self._lock:
+            self.failures += 1
+
+    def restore(self, store):
+        """Put the lock entries of this crawl's downloads back into `store`.
 
+        Downloads whose blob is gone or modified are forgotten, so they are
+        fetched again.
+        """
+        for url, done in list(self.downloads.items()):
+            entry = done['entry']
+            blob = store.blob_path(entry['sha256'], entry['ext'])
+            if os.path.exists(blob) and sha256_file(blob) == entry['sha256']:
+                store.entries[url] = entry
+            else:
+                del self.downloads[url]
+
+    def summary(self):
+        return (f'Crawl journal: resuming with {len(self.topics)} topic pages, {len(self.index_pages)} index pages, '
+                f'{len(self.images)} detail pages and {len(self.downloads)} downloads done')
+
+    def complete(self):
+        """Mark the crawl finished and compact the journal to what later crawls reuse."""
+        with self._lock:
+            self._fh.close()
+            tmp = self.path + '.part'
+            with open(tmp, 'w', encoding='utf-8') as fh:
+                for n, links in sorted(self.known_pages.items()):
+                    fh.write(json.dumps({'index': n, 'links': links}, sort_keys=True) + '\n')
+                fh.write(json.dumps({'complete': True, 'links': sorted(self.known_links())}) + '\n')
+            os.replace(tmp, self.path)
+
+    def close(self):
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+
+
+LIMITER = HostRateLimiter()
+CLIENT = HttpClient(headers={'User-Agent': USER_AGENT}, timeout=30)
+STATS = BuildStats('download_druplicons')
+
+
+class DrupliconLinkParser(HTMLParser):
+    """Collects links to druplicon detail pages, in page order and once each."""
+
+    done = False  # needs the whole page
 
-class HrefImgParser(HTMLParser):
     def __init__(self):
         super().__init__()
-        self.hrefs = []
-        self.imgs = []
+        self.links = {}  # used as an ordered set
 
     def handle_starttag(self, tag, attrs):
-        attrs = dict(attrs)
-        if tag == 'a' and 'href' in attrs:
-            self.hrefs.append(attrs['href'])
-        if tag == 'img' and 'src' in attrs:
-            self.imgs.append(attrs['src'])
+        if tag == 'a':
+            href = dict(attrs).get('href')
+            if href and '/druplicon/' in href:
+                self.links.setdefault(urljoin(BASE, href))
+
 
+class BestImageParser(HTMLParser):
+    """Picks a detail page's druplicon artwork (`/files/druplicons/`) as it is fed.
 
-def fetch(url):
-    req = urllib.request.Request(url, headers={'User-Agent': 'druplicon-downloader/1.0'})
-    with urllib.request.urlopen(req, timeout=30) as r:
-        return r.read().decode('utf-8', errors='ignore')
+    The first image of the most preferred type (IMAGE_PREFERENCE) wins, and
+    the first artwork of any type if none matches. `done` is set at the
+    first SVG, since nothing later can beat it.
+    """
+
+    def __init__(self, page_url):
+        super().__init__()
+        self.page_url = page_url
+        self.first = None
+        self.best = {}  # preference rank -> first image of that type
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag != 'img' or self.done:
+            return
+        src = dict(attrs).get('src')
+        if not src:
+            return
+        img = urljoin(self.page_url, src)
+        if '/files/druplicons/' not in img:
+            return
+        self.first = self.first or img
+        path = img.lower().split('?')[0]
+        for rank, ext in enumerate(IMAGE_PREFERENCE):
+            if path.endswith(ext):
+                self.best.setdefault(rank, img)
+                self.done = rank == 0
+                break
+
+    def result(self):
+        return self.best[min(self.best)] if self.best else self.first
+
+
+def fetch_into(url, parser):
+    """Stream the page at `url` into `parser`, stopping once `parser.done`.
+
+    Returns (bytes read, parse seconds, whether the whole page was read).
+    Network and parse time are recorded separately in STATS.
+    """
+    LIMITER.wait(url)
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    start = time.perf_counter()
+    parse_time = 0.0
+    whole = True
+    with CLIENT.stream(url) as resp:
+        for chunk in resp.chunks():
+            t = time.perf_counter()
+            parser.feed(decoder.decode(chunk))
+            parse_time += time.perf_counter() - t
+            if parser.done:
+                whole = False
+                break
+    if whole:
+        t = time.perf_counter()
+        parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+        parse_time += time.perf_counter() - t
+    STATS.add('fetch-page', url, time.perf_counter() - start - parse_time, read=resp.bytes_read)
+    STATS.add('parse', url, parse_time)
+    STATS.count('pages', fetched=1, bytes=resp.bytes_read, stopped_early=int(not whole))
+    return resp.bytes_read, parse_time, whole
+
+
+def fetch_links(url):
+    """Druplicon detail page links on the page at `url`, with the fetch size and parse time."""
+    parser = DrupliconLinkParser()
+    read, parse_time, _ = fetch_into(url, parser)
+    return list(parser.links), read, parse_time
 
 
 def find_druplicon_links(topic_html):
-    p = HrefImgParser()
-    p.feed(topic_html)
-    links = []
-    for h in p.hrefs:
-        if '/druplicon/' in h:
-            full = urljoin(BASE, h)
-            if full not in links:
-                links.append(full)
-    return links
-
-
-def find_druplicon_links_paginated():
-    links = []
+    parser = DrupliconLinkParser()
+    parser.feed(topic_html)
+    parser.close()
+    return list(parser.links)
+
+
+def find_druplicon_links_paginated(journal=None):
+    """Links from the paginated index, newest first.
+
+    With a `journal`, pages already fetched by this crawl are not fetched
+    again, and the walk stops at the first page whose links were all known
+    when the last crawl finished; the rest come from that crawl's pages.
+    """
+    links = {}  # used as an ordered set
     for page in range(PAGINATE_PAGES):
-        url = f'https://www.druplicon.org/druplicons?page={page}'
-        try:
-            html = fetch(url)
-        except Exception:
-            break
-        new = find_druplicon_links(html)
+        if journal and page in journal.index_pages:
+            new = journal.index_pages[page]
+        else:
+            url = f'https://www.druplicon.org/druplicons?page={page}'
+            try:
+                new, _, _ = fetch_links(url)
+            except urllib.error.HTTPError as e:
+                if e.code == 404:  # past the last page
+                    break
+                print('Failed to fetch index page', page, e, file=sys.stderr)
+                if journal:
+                    journal.failed()
+                break
+            except Exception as e:
+                print('Failed to fetch index page', page, e, file=sys.stderr)
+                if journal:
+                    journal.failed()
+                break
+            if journal:
+                journal.record(index=page, links=new)
         if not new:
             break
-        for n in new:
-            if n not in links:
-                links.append(n)
-    return links
+        links.update(dict.fromkeys(new))
+        if journal and journal.finished_links and journal.finished_links.issuperset(new):
+            later = [n for p, page_links in sorted(journal.known_pages.items()) if p > page for n in page_links]
+            print(f'Index page {page} holds only known druplicons; taking {len(later)} links of later pages '
+                  f'from the journal')
+            links.update(dict.fromkeys(later))
+            break
+    return list(links)
 
 
 def find_best_image(page_html, page_url):
-    p = HrefImgParser()
-    p.feed(page_html)
-    imgs = [urljoin(page_url, src) for src in p.imgs]
-    # filter for actual druplicon artwork in /druplicons/ folder
-    imgs = [i for i in imgs if '/files/druplicons/' in i]
-    # prefer svg, then png, then jpg
-    for ext in ('.svg', '.png', '.jpg', '.jpeg'):
-        for img in imgs:
-            if img.lower().split('?')[0].endswith(ext):
-                return img
-    # fallback: return first match
-    return imgs[0] if imgs else None
-
-
-def download(url, outdir, slug):
+    parser = BestImageParser(page_url)
+    parser.feed(page_html)
+    return parser.result()
+
+
+def topic_target(url, outdir, slug):
+    """Filename for an image found via a topic page (slug-prefixed)."""
     parsed = urlparse(url)
     name = os.path.basename(parsed.path)
     if not name or name == 'image':
@@ -102,97 +384,243 @@ def download(url, outdir, slug):
         # prefix with slug to avoid collisions
         base, ext = os.path.splitext(name)
         name = f"{slug}_{base}{ext}"
-    target = os.path.join(outdir, name)
-    # avoid re-downloading
-    if os.path.exists(target):
+    return os.path.join(outdir, name)
+
+
+def index_target(link, img, outdir, claimed, store):
+    """Filename for an image found via the paginated index.
+
+    Reuses the file a previous run saved for the same image URL; otherwise
+    never overwrites: an existing file, or one already claimed earlier in
+    this run, gets a numeric suffix instead.
+    """
+    name = store.entries.get(img, {}).get('name')
+    known = name and os.path.join(outdir, name)
+    if known and os.path.exists(known) and known not in claimed:
+        return known
+    # Use page slug to create unique filename
+    slug = urlparse(link).path.rstrip('/').split('/')[-1] or 'druplicon'
+    ext = os.path.splitext(urlparse(img).path)[1] or '.svg'
+    target_path = os.path.join(outdir, f"{slug}{ext}")
+    i = 1
+    while os.path.exists(target_path) or target_path in claimed:
+        target_path = os.path.join(outdir, f"{slug}-{i}{ext}")
+        i += 1
+    return target_path
+
+
+def resolve_image(link, journal=None):
+    """Fetch a druplicon detail page and return its best image URL.
+
+    Pages this crawl's journal already resolved are not fetched again.
+    """
+    if journal and link in journal.images:
+        return journal.images[link]
+    parser = BestImageParser(link)
+    try:
+        read, parse_time, whole = fetch_into(link, parser)
+    except Exception as e:
+        print('  failed to fetch page', link, e, file=sys.stderr)
+        if journal:
+            journal.failed()
+        return None
+    img = parser.result()
+    if journal:
+        journal.record(page=link, image=img)
+    note = f'{read} bytes, parsed in {parse_time * 1000:.1f} ms' + ('' if whole else ', stopped at the SVG')
+    if not img:
+        print(f'  no image found for {link} ({note})')
+        return None
+    print(f'  image -> {img} ({note})')
+    return img
+
+
+def materialize(blob, target, sha256):
+    """Copy a store blob to `target` unless it already has that content."""
+    if os.path.exists(target) and sha256_file(target) == sha256:
+        return False
+    tmp = target + '.part'
+    shutil.copyfile(blob, tmp)
+    os.replace(tmp, target)
+    return True
+
+
+def download(url, target, store, journal=None):
+    """Fetch `url` into the store and copy it to `target`.
+
+    An image this crawl's journal already saved is only checked, not fetched.
+    """
+    done = journal and journal.downloads.get(url)
+    if done and done['target'] == os.path.basename(target):
+        entry = done['entry']
+        materialize(store.blob_path(entry['sha256'], entry['ext']), target, entry['sha256'])
+        STATS.add('download', os.path.basename(target), read=entry['size'], cached=True)
         return target
+    LIMITER.wait(url)
+    start = time.perf_counter()
     try:
-        urllib.request.urlretrieve(url, target)
+        blob, status = store.fetch(url, os.path.splitext(target)[1])
+        if status == 'changed':
+            print('  changed upstream:', url)
+        store.annotate(url, name=os.path.basename(target))
+        copied = materialize(blob, target, store.entries[url]['sha256'])
+        size = os.path.getsize(blob)
+        STATS.add('download', os.path.basename(target), time.perf_counter() - start, read=size,
+                  written=size if copied else 0, cached=status in ('not-modified', 'unchanged'))
+        if journal:
+            journal.record(download=url, target=os.path.basename(target), entry=store.entries[url])
         return target
     except Exception as e:
         print('download failed', url, e, file=sys.stderr)
+        if journal:
+            journal.failed()
         return None
 
 
-def main():
+def restore_offline(store):
+    """Check every locked original, restoring it from the store if needed.
+
+    Returns the number that could not be restored.
+    """
+    ok = restored = missing = 0
+    for url, entry in sorted(store.entries.items()):
+        if 'name' not in entry:
+            continue
+        target = os.path.join(OUTDIR, entry['name'])
+        with STATS.timed('restore', entry['name']) as record:
+            record['read'] = entry['size']
+            record['cached'] = os.path.exists(target) and sha256_file(target) == entry['sha256']
+            if record['cached']:
+                ok += 1
+                continue
+            try:
+                materialize(store.resolve(url), target, entry['sha256'])
+                record['written'] = entry['size']
+                restored += 1
+            except OfflineError as e:
+                print('  cannot restore', entry['name'], '-', e, file=sys.stderr)
+                missing += 1
+    print(f'Offline: {ok} originals match {os.path.basename(LOCK_FILE)}, {restored} restored, {missing} missing')
+    return missing
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'concurrent page/image fetches (default {DEFAULT_WORKERS}; 1 = serial)')
+    parser.add_argument('--host-delay', type=float, default=DEFAULT_HOST_DELAY,
+                        help=f'minimum seconds between requests to one host (default {DEFAULT_HOST_DELAY})')
+    parser.add_argument('--offline', action='store_true',
+                        help='do not crawl; verify originals against the lockfile and restore them from the store')
+    parser.add_argument('--restart', action='store_true',
+                        help='ignore the crawl journal: fetch every page again instead of resuming')
+    add_stats_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    LIMITER.interval = max(0.0, args.host_delay)
+    workers = max(1, args.workers)
+    store = AssetStore(STORE_DIR, LOCK_FILE, client=CLIENT)
+    if args.offline:
+        with STATS.stage('restore'):
+            missing = restore_offline(store)
+        STATS.finish(args)
+        sys.exit(1 if missing else 0)
+    journal = CrawlJournal(JOURNAL_FILE, restart=args.restart)
+    journal.restore(store)
+    if journal.resumed:
+        print(journal.summary())
     seen = set()
-    meta = []
+    # (page link, 'topic' | 'index', topic slug) in crawl order
+    entries = []
     # Collect links from topic pages and from the main paginated index
-    all_links = []
     for topic in TOPIC_URLS:
-        print('Fetching topic', topic)
-        try:
-            html = fetch(topic)
-        except Exception as e:
-            print('Failed to fetch topic', topic, e, file=sys.stderr)
-            continue
-        links = find_druplicon_links(html)
-        print('Found', len(links), 'druplicon links')
+        if topic in journal.topics:
+            links = journal.topics[topic]
+            print('Topic', topic, 'already fetched:', len(links), 'druplicon links')
+        else:
+            print('Fetching topic', topic)
+            try:
+                with STATS.stage('topics'):
+                    links, read, parse_time = fetch_links(topic)
+            except Exception as e:
+                print('Failed to fetch topic', topic, e, file=sys.stderr)
+                journal.failed()
+                continue
+            journal.record(topic=topic, links=links)
+            print('Found', len(links), f'druplicon links ({read} bytes, parsed in {parse_time * 1000:.1f} ms)')
         for link in links:
             if link in seen:
                 continue
             seen.add(link)
             # extract slug from URL
             slug = link.rstrip('/').split('/')[-1]
-            print('Processing', link)
-            try:
-                ph = fetch(link)
-            except Exception as e:
-                print('  failed to fetch page', e, file=sys.stderr)
-                continue
-            img = find_best_image(ph, link)
-            if not img:
-                print('  no image found for', link)
-                continue
-            print('  image ->', img)
-            saved = download(img, OUTDIR, slug)
-            meta.append((link, img, saved))
+            entries.append((link, 'topic', slug))
 
     # paginated index
     print('Fetching paginated index pages...')
-    pagelinks = find_druplicon_links_paginated()
+    with STATS.stage('index'):
+        pagelinks = find_druplicon_links_paginated(journal)
     print('Found', len(pagelinks), 'paginated links')
     for link in pagelinks:
         if link in seen:
             continue
         seen.add(link)
-        print('Processing', link)
-        try:
-            ph = fetch(link)
-        except Exception as e:
-            print('  failed to fetch page', e, file=sys.stderr)
-            continue
-        img = find_best_image(ph, link)
-        if not img:
-            print('  no image found for', link)
-            continue
-        print('  image ->', img)
-        # Use page slug to create unique filename
-        slug = urlparse(link).path.rstrip('/').split('/')[-1] or 'druplicon'
-        ext = os.path.splitext(urlparse(img).path)[1] or '.svg'
-        target_name = f"{slug}{ext}"
-        target_path = os.path.join(OUTDIR, target_name)
-        # avoid overwriting existing files with same name; add counter
-        i = 1
-        base_target = target_path
-        while os.path.exists(target_path):
-            target_path = os.path.join(OUTDIR, f"{slug}-{i}{ext}")
-            i += 1
-        try:
-            urllib.request.urlretrieve(img, target_path)
-            saved = target_path
-        except Exception as e:
-            print('download failed', img, e, file=sys.stderr)
-            saved = None
-        meta.append((link, img, saved))
-
-    # write metadata
-    metafile = os.path.join(OUTDIR, 'druplicons_metadata.csv')
-    with open(metafile, 'w', encoding='utf-8') as fh:
-        fh.write('page_url,image_url,saved_path\n')
-        for page, image, saved in meta:
-            fh.write(f'"{page}","{image}","{saved or ""}"\n')
+        entries.append((link, 'index', None))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        print(f'Resolving {len(entries)} druplicon pages with {workers} worker(s)...')
+        with STATS.stage('pages'):
+            images = list(pool.map(lambda link: resolve_image(link, journal), [link for link, _, _ in entries]))
+
+        # Assign filenames serially so the result does not depend on
+        # which download happens to finish first.
+        jobs = []
+        claimed = set()
+        for (link, source, slug), img in zip(entries, images):
+            if not img:
+                continue
+            if source == 'topic':
+                target = topic_target(img, OUTDIR, slug)
+            else:
+                target = index_target(link, img, OUTDIR, claimed, store)
+            claimed.add(target)
+            jobs.append((link, img, target))
+
+        # Two topic pages can share an image filename; fetch it once.
+        unique = {}
+        for _, img, target in jobs:
+            unique.setdefault(target, img)
+        print(f'Downloading {len(unique)} images...')
+        with STATS.stage('download'):
+            saved = dict(zip(unique, pool.map(lambda t: download(unique[t], t, store, journal), unique)))
+    store.save()
+    meta = [(link, img, saved[target] and os.path.basename(saved[target])) for link, img, target in jobs]
+
+    # Catalogue the originals and write the metadata CSV from the catalog
+    with STATS.stage('catalog'), AssetCatalog(CATALOG_FILE) as catalog:
+        catalog.refresh(OUTDIR)
+        catalog.set_pages(meta)
+        catalog.export_csv(os.path.join(OUTDIR, 'druplicons_metadata.csv'), OUTDIR)
+        print(catalog.summary())
+    if journal.failures:
+        journal.close()
+        print(f'{journal.failures} page(s) or download(s) failed; the crawl journal is kept, '
+              f'so the next run retries only those')
+    else:
+        journal.complete()
     print('Done. Saved', len(meta), 'items to', OUTDIR)
+    pages = STATS.counters.get('pages', {})
+    print(f"Pages: {pages.get('fetched', 0)} fetched, {pages.get('bytes', 0)} bytes read, "
+          f"{pages.get('stopped_early', 0)} stopped early at their SVG")
+    print(store.summary())
+    print(CLIENT.summary())
+    CLIENT.close()
+    STATS.count('asset store', **store.stats)
+    STATS.count('http', **CLIENT.stats)
+    STATS.finish(args)
 
 
 if __name__ == '__main__':
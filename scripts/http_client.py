@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Small keep-alive HTTP client shared by the asset downloaders.
+
+`urllib.request.urlopen` opens a fresh TCP (and TLS) connection for every
+request. The downloaders talk to the same few hosts over and over
+(druplicon.org, api.iconify.design, upload.wikimedia.org), so this module
+keeps idle `http.client` connections pooled per host and reuses them.
+
+- GET only, with redirects followed (up to `max_redirects`).
+- Responses are transparently decoded from gzip/deflate, and from brotli
+  when the optional `brotli` package is installed.
+- Error statuses raise `urllib.error.HTTPError` and connection failures
+  raise `urllib.error.URLError`, so callers written against urllib keep
+  working. 304 Not Modified is returned, not raised.
+- `stream()` returns the body as decoded chunks straight off the socket,
+  so a caller can parse as it reads and stop early; a connection left with
+  unread body is closed rather than pooled.
+- `stats` counts requests, connections opened and connections reused.
+- `max_per_host` caps how many requests run against one host at once when
+  the client is shared by several threads.
+
+Works against a local `python3 -m http.server` (set
+`SimpleHTTPRequestHandler.protocol_version = 'HTTP/1.1'` to get keep-alive).
+"""
+import contextlib
+import gzip
+import http.client
+import threading
+import urllib.error
+import zlib
+from urllib.parse import urljoin, urlsplit
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+STREAM_CHUNK = 16 * 1024
+# Errors that mean a pooled connection was closed by the server while idle
+STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                ConnectionResetError, BrokenPipeError)
+
+
+class Response:
+    def __init__(self, url, status, reason, headers, body):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+
+def decode_body(data, encoding):
+    """Undo a Content-Encoding of gzip, deflate or br."""
+    encoding = (encoding or '').strip().lower()
+    if not encoding or encoding == 'identity':
+        return data
+    if encoding in ('gzip', 'x-gzip'):
+        return gzip.decompress(data)
+    if encoding == 'deflate':
+        try:
+            return zlib.decompress(data)
+        except zlib.error:
+            # Some servers send raw deflate without the zlib header
+            return zlib.decompress(data, -zlib.MAX_WBITS)
+    if encoding == 'br' and brotli is not None:
+        return brotli.decompress(data)
+    raise ValueError(f'unsupported Content-Encoding: {encoding}')
+
+
+def stream_decoder(encoding):
+    """Function undoing a Content-Encoding one chunk at a time (see decode_body())."""
+    encoding = (encoding or '').strip().lower()
+    if not encoding or encoding == 'identity':
+        return lambda data: data
+    if encoding in ('gzip', 'x-gzip'):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+    if encoding == 'deflate':
+        state = {}
+
+        def inflate(data):
+            if 'd' not in state:
+                # zlib-wrapped if the first two bytes are a valid zlib header, else raw deflate
+                wrapped = len(data) >= 2 and data[0] & 0x0F == 8 and (data[0] << 8 | data[1]) % 31 == 0
+                state['d'] = zlib.decompressobj() if wrapped else zlib.decompressobj(-zlib.MAX_WBITS)
+            return state['d'].decompress(data)
+        return inflate
+    if encoding == 'br' and brotli is not None:
+        return brotli.Decompressor().process
+    raise ValueError(f'unsupported Content-Encoding: {encoding}')
+
+
+class StreamResponse:
+    """A response whose body is read on demand by `chunks()`."""
+
+    def __init__(self, url, resp, chunk_size=STREAM_CHUNK):
+        self.url = url
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = resp.headers
+        self.bytes_read = 0  # body bytes off the wire, before decoding
+        self._resp = resp
+        self._decode = stream_decoder(resp.getheader('Content-Encoding'))
+        self._chunk_size = chunk_size
+
+    def chunks(self):
+        """Yield the decoded body as it arrives."""
+        while True:
+            try:
+                data = self._resp.read1(self._chunk_size)
+            except OSError as e:
+                raise urllib.error.URLError(e)
+            if not data:
+                self._resp.read()  # marks a fully read Content-Length body closed, so it can be pooled
+                return
+            self.bytes_read += len(data)
+            out = self._decode(data)
+            if out:
+                yield out
+
+
+class HttpClient:
+    """Per-host pool of keep-alive connections."""
+
+    def __init__(self, headers=None, timeout=30, max_redirects=5, max_per_host=None):
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.max_per_host = max_per_host
+        self.accept_encoding = 'gzip, deflate, br' if brotli else 'gzip, deflate'
+        self._idle = {}
+        self._slots = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'connections': 0, 'reused': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _acquire(self, key, timeout):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.stats['reused'] += 1
+                return idle.pop(), True
+        scheme, host = key
+        cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        self._count('connections')
+        return cls(host, timeout=timeout), False
+
+    def _release(self, key, conn):
+        with self._lock:
+            self._idle.setdefault(key, []).append(conn)
+
+    def _host_slot(self, key):
+        """Context manager holding one of the host's `max_per_host` request slots."""
+        if not self.max_per_host:
+            return contextlib.nullcontext()
+        with self._lock:
+            return self._slots.setdefault(key, threading.BoundedSemaphore(self.max_per_host))
+
+    def _request_once(self, url, headers, timeout):
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        all_headers = {'Accept-Encoding': self.accept_encoding, **self.headers, **headers}
+        with self._host_slot(key):
+            return self._request_on_pool(key, path, all_headers, timeout)
+
+    def _request_on_pool(self, key, path, all_headers, timeout):
+        for attempt in (1, 2):
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request('GET', path, headers=all_headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except STALE_ERRORS as e:
+                conn.close()
+                if reused and attempt == 1:
+                    continue  # idle connection went away; retry on a fresh one
+                raise urllib.error.URLError(e)
+            except OSError as e:
+                conn.close()
+                raise urllib.error.URLError(e)
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            self._count('requests')
+            return resp, data
+
+    def _open_on_pool(self, key, path, all_headers, timeout):
+        """Send the request on a pooled connection; returns (conn, response) with the body unread."""
+        for attempt in (1, 2):
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request('GET', path, headers=all_headers)
+                resp = conn.getresponse()
+            except STALE_ERRORS as e:
+                conn.close()
+                if reused and attempt == 1:
+                    continue  # idle connection went away; retry on a fresh one
+                raise urllib.error.URLError(e)
+            except OSError as e:
+                conn.close()
+                raise urllib.error.URLError(e)
+            self._count('requests')
+            return conn, resp
+
+    def _finish(self, key, conn, resp):
+        """Pool the connection if its response was read to the end, else close it."""
+        if resp.isclosed() and not resp.will_close:
+            self._release(key, conn)
+        else:
+            conn.close()
+
+    @contextlib.contextmanager
+    def stream(self, url, headers=None, timeout=None, chunk_size=STREAM_CHUNK):
+        """GET `url`, following redirects, without reading the body; yields a `StreamResponse`.
+
+        Leaving the block before `chunks()` is exhausted closes the
+        connection, so the rest of the body is never transferred.
+        """
+        timeout = timeout or self.timeout
+        for _ in range(self.max_redirects + 1):
+            parts = urlsplit(url)
+            key = (parts.scheme, parts.netloc)
+            path = (parts.path or '/') + ('?' + parts.query if parts.query else '')
+            all_headers = {'Accept-Encoding': self.accept_encoding, **self.headers, **(headers or {})}
+            with self._host_slot(key):
+                conn, resp = self._open_on_pool(key, path, all_headers, timeout)
+                if resp.status in REDIRECT_CODES and resp.getheader('Location'):
+                    resp.read()
+                    self._finish(key, conn, resp)
+                    url = urljoin(url, resp.getheader('Location'))
+                    continue
+                if resp.status >= 400:
+                    conn.close()
+                    raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+                try:
+                    yield StreamResponse(url, resp, chunk_size)
+                finally:
+                    self._finish(key, conn, resp)
+                return
+        raise urllib.error.URLError(f'too many redirects: {url}')
+
+    def get(self, url, headers=None, timeout=None):
+        """GET `url`, following redirects. Returns a `Response`."""
+        timeout = timeout or self.timeout
+        for _ in range(self.max_redirects + 1):
+            resp, data = self._request_once(url, headers or {}, timeout)
+            if resp.status in REDIRECT_CODES and resp.getheader('Location'):
+                url = urljoin(url, resp.getheader('Location'))
+                continue
+            if resp.status >= 400:
+                raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+            if resp.status != 304:
+                data = decode_body(data, resp.getheader('Content-Encoding'))
+            return Response(url, resp.status, resp.reason, resp.headers, data)
+        raise urllib.error.URLError(f'too many redirects: {url}')
+
+    def close(self):
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+            self._idle.clear()
+
+    def summary(self):
+        s = self.stats
+        return (f"HTTP connections: {s['requests']} requests over {s['connections']} connections "
+                f"({s['reused']} reused)")
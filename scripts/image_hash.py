@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Perceptual hashes for finding near-duplicate raster icons.
+
+The druplicon crawler can save one piece of artwork several times: under
+`slug-1.png`, rescaled, or re-encoded as JPEG. SHA1 only catches byte-exact
+copies. These 64-bit hashes stay (nearly) the same across resizing and
+re-encoding, so two images whose hashes differ in only a few bits (small
+Hamming distance) are almost certainly the same picture:
+
+- `ahash`: 8x8 greyscale thumbnail, bit = pixel above the mean
+- `dhash`: 9x8 thumbnail, bit = pixel brighter than its right neighbour
+- `phash`: 32x32 thumbnail, bit = low-frequency DCT coefficient above the
+  median (most robust, slowest)
+
+Transparent areas are flattened onto white first, so a logo on a
+transparent background hashes like the same logo on white.
+
+SVGs are rendered to a SVG_RENDER_SIZE-pixel PNG first when CairoSVG is
+installed (`pip install cairosvg`; `svg_available()`), so a vector
+original and a raster export of it hash alike. Without it SVGs cannot be
+hashed (image_hash() returns None).
+
+Requires Pillow (`pip install Pillow`); without it `available()` is False.
+
+Usage: python3 scripts/image_hash.py [--algo dhash] image ...
+"""
+import argparse
+import functools
+import io
+import math
+
+try:
+    from PIL import Image
+except ImportError:  # optional
+    Image = None
+
+try:
+    import cairosvg
+except (ImportError, OSError):  # optional; OSError when the cairo library itself is missing
+    cairosvg = None
+
+ALGORITHMS = ('ahash', 'dhash', 'phash')
+# On the druplicon originals, rescaled/re-encoded copies hash 0 bits apart
+# under phash while the closest distinct artwork is 6 bits apart.
+DEFAULT_ALGORITHM = 'phash'
+DEFAULT_THRESHOLD = 4
+SVG_RENDER_SIZE = 256
+
+
+def available():
+    return Image is not None
+
+
+def svg_available():
+    return Image is not None and cairosvg is not None
+
+
+def _open(path):
+    if not path.lower().endswith('.svg'):
+        return Image.open(path)
+    if cairosvg is None:
+        raise ValueError('SVGs need CairoSVG to be hashed (pip install cairosvg)')
+    try:
+        png = cairosvg.svg2png(url=path, output_width=SVG_RENDER_SIZE)
+    except Exception as e:  # CairoSVG raises many types on malformed input
+        raise ValueError(f'cannot render {path}: {e}') from e
+    return Image.open(io.BytesIO(png))
+
+
+def _grey_pixels(path, width, height):
+    with _open(path) as img:
+        img.seek(0)  # first frame of animated GIFs
+        img = img.convert('RGBA')
+        background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+        img = Image.alpha_composite(background, img).convert('L')
+        img = img.resize((width, height), Image.LANCZOS)
+        return list(img.tobytes())
+
+
+def _bits(flags):
+    value = 0
+    for flag in flags:
+        value = (value << 1) | int(flag)
+    return value
+
+
+def ahash(path):
+    pixels = _grey_pixels(path, 8, 8)
+    mean = sum(pixels) / len(pixels)
+    return _bits(p > mean for p in pixels)
+
+
+def dhash(path):
+    pixels = _grey_pixels(path, 9, 8)
+    return _bits(pixels[row * 9 + col] > pixels[row * 9 + col + 1]
+                 for row in range(8) for col in range(8))
+
+
+@functools.lru_cache(maxsize=None)
+def _dct_table(n):
+    return [[math.cos(math.pi * (2 * x + 1) * u / (2 * n)) for x in range(n)] for u in range(n)]
+
+
+def phash(path):
+    n = 32
+    pixels = _grey_pixels(path, n, n)
+    table = _dct_table(n)
+    rows = [pixels[r * n:(r + 1) * n] for r in range(n)]
+    # Only the top-left 8x8 (lowest frequencies) is needed: DCT rows, then columns
+    row_dct = [[sum(c * v for c, v in zip(table[u], row)) for u in range(8)] for row in rows]
+    coeffs = [sum(table[v][r] * row_dct[r][u] for r in range(n)) for v in range(8) for u in range(8)]
+    low = coeffs[1:]  # the DC term only tracks overall brightness
+    median = sorted(low)[len(low) // 2]
+    return _bits(c > median for c in coeffs)
+
+
+HASHES = {'ahash': ahash, 'dhash': dhash, 'phash': phash}
+
+
+def image_hash(path, algo=DEFAULT_ALGORITHM):
+    """Hex string of the 64-bit hash, or None if the image cannot be decoded."""
+    try:
+        return f'{HASHES[algo](path):016x}'
+    except (OSError, ValueError):
+        return None
+
+
+def hamming(a, b):
+    return bin(int(a, 16) ^ int(b, 16)).count('1')
+
+
+def clusters(hashes, threshold):
+    """Group names whose hashes are all within `threshold` bits of each other.
+
+    `hashes` is an ordered {name: hex hash}; returns lists of two or more
+    names in input order. Every pair in a cluster must be close (complete
+    linkage): druplicons share one silhouette, so chaining A~B~C would
+    merge distinct artwork.
+    """
+    groups = []
+    for name, h in hashes.items():
+        for group in groups:
+            if all(hamming(h, hashes[other]) <= threshold for other in group):
+                group.append(name)
+                break
+        else:
+            groups.append([name])
+    return [g for g in groups if len(g) > 1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Print perceptual hashes and near-duplicate clusters.')
+    parser.add_argument('--algo', choices=ALGORITHMS, default=DEFAULT_ALGORITHM)
+    parser.add_argument('--threshold', type=int, default=DEFAULT_THRESHOLD,
+                        help=f'max Hamming distance (default {DEFAULT_THRESHOLD} of 64 bits)')
+    parser.add_argument('images', nargs='+')
+    args = parser.parse_args(argv)
+    if not available():
+        print('Pillow is not installed (pip install Pillow)')
+        return
+    hashes = {}
+    for path in args.images:
+        h = image_hash(path, args.algo)
+        print(f'{h or "-" * 16}  {path}')
+        if h:
+            hashes[path] = h
+    for group in clusters(hashes, args.threshold):
+        print('Cluster:', ', '.join(group))
+
+
+if __name__ == '__main__':
+    main()
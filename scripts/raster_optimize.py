@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Downscale and re-encode raster icons before they are embedded in a sprite.
+
+Both sprite builders show rasters in a 100x100 viewBox but embed the
+original files at full resolution. `optimize_raster()` resizes an image so
+its longest side is `size * scale` pixels (the default 100 x 2 keeps icons
+sharp on HiDPI screens), drops EXIF/ICC/text metadata and re-encodes it:
+
+- `png`  lossless PNG (optimize=True) for every input
+- `webp` / `avif`  lossy WebP/AVIF at `quality`, falling back to PNG when
+  the local Pillow build has no encoder for that format
+- `auto` lossless PNG for PNG/GIF, JPEG (quality 85) for JPEG inputs
+
+The smaller of the result and the original is kept, so the stage never
+makes an icon bigger. Results are cached in `cache_dir` by input SHA1 plus
+the settings, so unchanged inputs are not re-encoded on the next run.
+
+Requires Pillow (`pip install Pillow`). Without it `available()` is False
+and callers keep using the original files.
+"""
+import hashlib
+import io
+import os
+
+try:
+    from PIL import Image
+except ImportError:  # optional
+    Image = None
+
+FORMATS = ('auto', 'png', 'webp', 'avif')
+EXTENSIONS = {'PNG': '.png', 'JPEG': '.jpg', 'WEBP': '.webp', 'AVIF': '.avif', 'GIF': '.gif'}
+# Bump when the encoding logic changes so cached results are regenerated
+OPTIMIZER_VERSION = 1
+
+
+def available():
+    return Image is not None
+
+
+def settings_key(size, scale, fmt, quality):
+    return f'v{OPTIMIZER_VERSION}-{size}x{scale}-{fmt}-q{quality}'
+
+
+def _encoder_available(pil_format):
+    Image.init()
+    return pil_format in Image.SAVE
+
+
+def _encode(img, pil_format, quality):
+    buf = io.BytesIO()
+    if pil_format == 'PNG':
+        img.save(buf, 'PNG', optimize=True)
+    elif pil_format == 'JPEG':
+        img.convert('RGB').save(buf, 'JPEG', quality=quality, optimize=True, progressive=True)
+    else:
+        img.save(buf, pil_format, quality=quality)
+    return buf.getvalue()
+
+
+def _target_format(fmt, source_format):
+    if fmt == 'auto':
+        return 'JPEG' if source_format == 'JPEG' else 'PNG'
+    wanted = fmt.upper()
+    if wanted != 'PNG' and not _encoder_available(wanted):
+        return 'PNG'  # fallback when this Pillow build cannot encode WebP/AVIF
+    return wanted
+
+
+def optimize_raster(path, sha1, cache_dir, size=100, scale=2, fmt='auto', quality=85):
+    """Return (path to use, report dict) for one raster.
+
+    The returned path is either the cached optimized file or `path` itself
+    when re-encoding did not make the file smaller.
+    """
+    key = settings_key(size, scale, fmt, quality)
+    original_bytes = os.path.getsize(path)
+    report = {'file': os.path.basename(path), 'before': original_bytes, 'after': original_bytes,
+              'format': None, 'dimensions': None, 'cached': False}
+    os.makedirs(cache_dir, exist_ok=True)
+    stem = f'{sha1}-{key}'
+    for ext in set(EXTENSIONS.values()) | {'.orig'}:
+        cached = os.path.join(cache_dir, stem + ext)
+        if os.path.exists(cached):
+            report['cached'] = True
+            if ext == '.orig':
+                # Marker: re-encoding did not help, keep the original
+                return path, report
+            report['after'] = os.path.getsize(cached)
+            report['format'] = ext.lstrip('.')
+            return cached, report
+
+    with Image.open(path) as img:
+        source_format = img.format
+        img.load()
+        if img.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            img = img.convert('RGBA')
+        longest = size * scale
+        if max(img.size) > longest:
+            img.thumbnail((longest, longest), Image.LANCZOS)
+        report['dimensions'] = f'{img.size[0]}x{img.size[1]}'
+        # Encoders copy EXIF, ICC profiles and text chunks from img.info
+        img.info = {}
+        pil_format = _target_format(fmt, source_format)
+        data = _encode(img, pil_format, quality)
+
+    if len(data) >= original_bytes:
+        open(os.path.join(cache_dir, stem + '.orig'), 'wb').close()
+        return path, report
+    out = os.path.join(cache_dir, stem + EXTENSIONS[pil_format])
+    with open(out, 'wb') as fh:
+        fh.write(data)
+    report['after'] = len(data)
+    report['format'] = EXTENSIONS[pil_format].lstrip('.')
+    return out, report
+
+
+def print_report(reports):
+    """Per-file before/after sizes and a total."""
+    before = after = 0
+    for r in reports:
+        before += r['before']
+        after += r['after']
+        detail = f"{r['format'] or 'original kept'}"
+        if r['dimensions']:
+            detail += f", {r['dimensions']}"
+        if r['cached']:
+            detail += ', cached'
+        print(f"  {r['file']}: {r['before']} -> {r['after']} bytes ({detail})")
+    if reports:
+        saved = before - after
+        print(f'Raster optimisation: {before} -> {after} bytes '
+              f'({saved} saved, {100 * saved / before if before else 0:.1f}%) over {len(reports)} files')
+
+
+def sha1_file(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+    return h.hexdigest()
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""Trace raster druplicons into themeable vector paths.
+
+Raster icons are inlined as data URIs, so they ignore the `currentColor`
+theming SVG icons get and are far larger than an equivalent path.
+`trace()` turns one into at most three `<path fill="currentColor">` layers:
+
+1. The image is flattened onto white and scaled to `size` pixels on its
+   longest side (SUPERSAMPLE times that for the next step).
+2. Near-white pixels are background. The rest are posterized into up to
+   `levels` grey levels by k-means; levels closer than MERGE_DISTANCE or
+   covering under MIN_LAYER_SHARE of the ink are merged. Levels map, dark to
+   light, to the fill-opacity steps `build-logo-sprite.py` uses for
+   multi-shade logos (1, .7, .35).
+3. Each SUPERSAMPLE x SUPERSAMPLE block takes its majority level, which
+   removes the light halo that anti-aliased edges would otherwise become.
+4. Pixel-edge contours of each level are traced (holes wind the other
+   way, so the default nonzero fill rule keeps them open), specks under
+   MIN_AREA pixels are dropped and contours are simplified with
+   Ramer-Douglas-Peucker at `tolerance` pixels.
+
+Fidelity is the share of the pixels inked in either version that land in
+the same level after the traced paths are filled again, so photographic
+originals can be left as rasters. `trace_raster()` caches results by input
+SHA1 plus the settings.
+
+Pillow (`pip install Pillow`) is needed to decode the images; without it
+`available()` is False. Everything after decoding is pure Python.
+
+Usage: python3 scripts/raster_trace.py [--levels N] [--out DIR] image ...
+"""
+import argparse
+import json
+import math
+import os
+
+import svg_minify
+
+try:
+    from PIL import Image
+except ImportError:  # optional
+    Image = None
+
+# Bump when tracing output changes so cached results are regenerated
+TRACER_VERSION = 1
+OPACITIES = {1: (1,), 2: (1, .7), 3: (1, .7, .35)}
+DEFAULT_LEVELS = 3
+DEFAULT_SIZE = 128
+DEFAULT_TOLERANCE = 0.75
+DEFAULT_MIN_FIDELITY = 90.0
+SUPERSAMPLE = 4
+BACKGROUND_CUTOFF = 230  # grey level (on white) from which a pixel is background
+MERGE_DISTANCE = 32
+MIN_LAYER_SHARE = 0.02
+MIN_AREA = 4
+
+
+def available():
+    return Image is not None
+
+
+def settings_key(levels, size, tolerance):
+    return f'v{TRACER_VERSION}-l{levels}-s{size}-t{tolerance:g}'
+
+
+def _grey_pixels(path, size, factor):
+    """Greys of the image flattened onto white and scaled to `factor` x the grid.
+
+    Returns (greys, grid width, grid height); the grid's longest side is `size`.
+    """
+    with Image.open(path) as img:
+        img.seek(0)  # first frame of animated GIFs
+        img = img.convert('RGBA')
+        background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+        img = Image.alpha_composite(background, img).convert('L')
+        scale = size / max(img.size)
+        width, height = max(1, round(img.width * scale)), max(1, round(img.height * scale))
+        img = img.resize((width * factor, height * factor), Image.LANCZOS)
+        return img.tobytes(), width, height
+
+
+def _grey_levels(greys, levels):
+    """Representative grey levels of the ink pixels, dark to light."""
+    hist = [0] * 256
+    for g in greys:
+        hist[g] += 1
+    ink = sum(hist[:BACKGROUND_CUTOFF])
+    if not ink:
+        return []
+    # k-means over the histogram, seeded at the quantiles
+    centres = []
+    seen = 0
+    targets = [ink * (2 * i + 1) / (2 * levels) for i in range(levels)]
+    for g in range(BACKGROUND_CUTOFF):
+        seen += hist[g]
+        while targets and seen >= targets[0]:
+            centres.append(float(g))
+            targets.pop(0)
+    for _ in range(20):
+        sums = [[0, 0] for _ in centres]
+        for g in range(BACKGROUND_CUTOFF):
+            if hist[g]:
+                i = min(range(len(centres)), key=lambda c: abs(centres[c] - g))
+                sums[i][0] += g * hist[g]
+                sums[i][1] += hist[g]
+        updated = [s / n if n else c for (s, n), c in zip(sums, centres)]
+        if updated == centres:
+            break
+        centres = updated
+    # Merge levels that are too close to tell apart or barely used
+    centres = sorted(centres)
+    nearest = [min(range(len(centres)), key=lambda c: abs(centres[c] - g)) for g in range(BACKGROUND_CUTOFF)]
+    weights = [sum(hist[g] for g in range(BACKGROUND_CUTOFF) if nearest[g] == i) for i in range(len(centres))]
+    while len(centres) > 1:
+        gap, i = min((centres[i + 1] - centres[i], i) for i in range(len(centres) - 1))
+        if gap >= MERGE_DISTANCE:
+            light, j = min((w, j) for j, w in enumerate(weights))
+            if light >= MIN_LAYER_SHARE * ink:
+                break
+            # Fold the rare level into its closer neighbour
+            i = j - 1 if j == len(centres) - 1 or (j and centres[j] - centres[j - 1] < centres[j + 1] - centres[j]) else j
+        total = weights[i] + weights[i + 1]
+        centres[i:i + 2] = [(centres[i] * weights[i] + centres[i + 1] * weights[i + 1]) / total if total
+                            else (centres[i] + centres[i + 1]) / 2]
+        weights[i:i + 2] = [total]
+    return centres
+
+
+def _label_table(centres):
+    """256-byte table mapping a grey level to 0 (background) or its level 1..n."""
+    table = bytearray(256)
+    for g in range(BACKGROUND_CUTOFF):
+        table[g] = 1 + min(range(len(centres)), key=lambda c: abs(centres[c] - g))
+    return bytes(table)
+
+
+def _majority(labels, width, height, factor):
+    """Downsample a label grid by `factor`, each block taking its most common label."""
+    out_w, out_h = width // factor, height // factor
+    out = bytearray(out_w * out_h)
+    for by in range(out_h):
+        rows = [labels[(by * factor + dy) * width:(by * factor + dy + 1) * width] for dy in range(factor)]
+        for bx in range(out_w):
+            counts = {}
+            for row in rows:
+                for v in row[bx * factor:(bx + 1) * factor]:
+                    counts[v] = counts.get(v, 0) + 1
+            out[by * out_w + bx] = max(sorted(counts), key=counts.get)
+    return out, out_w, out_h
+
+
+def _contours(mask, width, height):
+    """Closed pixel-edge loops around the set cells of `mask`, corners only.
+
+    Edges run clockwise around filled pixels (inside on the right), so outer
+    boundaries and holes come out with opposite winding. At a vertex shared
+    by two diagonal pixels the walk turns right, keeping them separate.
+    """
+    def filled(x, y):
+        return 0 <= x < width and 0 <= y < height and mask[y * width + x]
+
+    edges = {}
+    for y in range(height):
+        for x in range(width):
+            if not mask[y * width + x]:
+                continue
+            if not filled(x, y - 1):
+                edges.setdefault((x, y), []).append((x + 1, y))
+            if not filled(x + 1, y):
+                edges.setdefault((x + 1, y), []).append((x + 1, y + 1))
+            if not filled(x, y + 1):
+                edges.setdefault((x + 1, y + 1), []).append((x, y + 1))
+            if not filled(x - 1, y):
+                edges.setdefault((x, y + 1), []).append((x, y))
+    loops = []
+    while edges:
+        start = next(iter(edges))
+        loop = [start]
+        prev, cur = start, edges[start].pop()
+        if not edges[start]:
+            del edges[start]
+        while cur != start:
+            loop.append(cur)
+            options = edges[cur]
+            if len(options) > 1:
+                dx, dy = cur[0] - prev[0], cur[1] - prev[1]
+                right = (cur[0] - dy, cur[1] + dx)
+                nxt = right if right in options else options[0]
+                options.remove(nxt)
+            else:
+                nxt = options.pop()
+            if not options:
+                del edges[cur]
+            prev, cur = cur, nxt
+        # Keep only the corners
+        n = len(loop)
+        corners = [p for i, p in enumerate(loop)
+                   if (p[0] - loop[i - 1][0], p[1] - loop[i - 1][1]) !=
+                   (loop[(i + 1) % n][0] - p[0], loop[(i + 1) % n][1] - p[1])]
+        loops.append(corners)
+    return loops
+
+
+def _area(loop):
+    return sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(loop, loop[1:] + loop[:1])) / 2
+
+
+def _distance(p, a, b):
+    """Distance from point p to segment ab."""
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    length = dx * dx + dy * dy
+    if not length:
+        return ((p[0] - a[0]) ** 2 + (p[1] - a[1]) ** 2) ** 0.5
+    t = max(0, min(1, ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / length))
+    return ((p[0] - a[0] - t * dx) ** 2 + (p[1] - a[1] - t * dy) ** 2) ** 0.5
+
+
+def _simplify(loop, tolerance):
+    """Ramer-Douglas-Peucker on a closed loop, split at the point farthest from loop[0]."""
+    if len(loop) <= 4:
+        return loop
+    far = max(range(len(loop)), key=lambda i: (loop[i][0] - loop[0][0]) ** 2 + (loop[i][1] - loop[0][1]) ** 2)
+    keep = {0, far}
+    stack = [(0, far), (far, len(loop))]
+    while stack:
+        lo, hi = stack.pop()
+        a, b = loop[lo], loop[hi % len(loop)]
+        best, index = 0, None
+        for i in range(lo + 1, hi):
+            d = _distance(loop[i], a, b)
+            if d > best:
+                best, index = d, i
+        if index is not None and best > tolerance:
+            keep.add(index)
+            stack += [(lo, index), (index, hi)]
+    return [loop[i] for i in sorted(keep)]
+
+
+def _fill(loops, width, height):
+    """Pixels whose centres the loops cover under the nonzero rule."""
+    mask = bytearray(width * height)
+    edges = [(a, b) for loop in loops for a, b in zip(loop, loop[1:] + loop[:1]) if a[1] != b[1]]
+    for y in range(height):
+        cy = y + 0.5
+        crossings = []
+        for (x0, y0), (x1, y1) in edges:
+            if min(y0, y1) <= cy < max(y0, y1):
+                crossings.append((x0 + (cy - y0) * (x1 - x0) / (y1 - y0), 1 if y1 > y0 else -1))
+        crossings.sort()
+        winding = 0
+        for (xa, w), (xb, _) in zip(crossings, crossings[1:]):
+            winding += w
+            if winding:
+                # Pixels whose centre x + 0.5 lies in [xa, xb)
+                for x in range(max(0, math.ceil(xa - 0.5)), min(width, math.ceil(xb - 0.5))):
+                    mask[y * width + x] = 1
+    return mask
+
+
+def _path_data(loops):
+    segments = []
+    for loop in loops:
+        segments.append(('M', list(loop[0])))
+        segments.extend(('L', list(p)) for p in loop[1:])
+        segments.append(('Z', []))
+    return svg_minify.format_path(segments, 0)
+
+
+def trace(path, levels=DEFAULT_LEVELS, size=DEFAULT_SIZE, tolerance=DEFAULT_TOLERANCE):
+    """Trace one image. Returns {'viewBox', 'layers': [{'opacity', 'd'}], 'fidelity'} or None.
+
+    None means the image could not be decoded or has no ink.
+    """
+    try:
+        greys, width, height = _grey_pixels(path, size, SUPERSAMPLE)
+    except (OSError, ValueError):
+        return None
+    centres = _grey_levels(greys, levels)
+    if not centres:
+        return None
+    labels, width, height = _majority(greys.translate(_label_table(centres)),
+                                      width * SUPERSAMPLE, height * SUPERSAMPLE, SUPERSAMPLE)
+    opacities = OPACITIES[len(centres)]
+    traced = bytearray(width * height)
+    layers = []
+    for level, opacity in enumerate(opacities, 1):
+        mask = bytes(1 if v == level else 0 for v in labels)
+        loops = [_simplify(loop, tolerance) for loop in _contours(mask, width, height)
+                 if abs(_area(loop)) >= MIN_AREA]
+        loops = [loop for loop in loops if len(loop) >= 3]
+        if not loops:
+            continue
+        for i, v in enumerate(_fill(loops, width, height)):
+            if v:
+                traced[i] = level
+        layers.append({'opacity': opacity, 'd': _path_data(loops)})
+    inked = sum(1 for a, b in zip(labels, traced) if a or b)
+    same = sum(1 for a, b in zip(labels, traced) if a and a == b)
+    return {
+        'viewBox': f'0 0 {width} {height}',
+        'layers': layers,
+        'fidelity': round(100 * same / inked, 1) if inked else 0.0,
+    }
+
+
+def layer_markup(result):
+    """`<path>` elements for a trace() result."""
+    out = []
+    for layer in result['layers']:
+        opacity = '' if layer['opacity'] == 1 else f' fill-opacity="{svg_minify.format_number(layer["opacity"], 2)}"'
+        out.append(f'<path fill="currentColor"{opacity} d="{layer["d"]}"/>')
+    return ''.join(out)
+
+
+def trace_raster(path, sha1, cache_dir, levels=DEFAULT_LEVELS, size=DEFAULT_SIZE, tolerance=DEFAULT_TOLERANCE):
+    """trace() with results cached in `cache_dir` by input SHA1 and settings.
+
+    Returns (result or None, cached).
+    """
+    cached = os.path.join(cache_dir, f'{sha1}-{settings_key(levels, size, tolerance)}.json')
+    if os.path.exists(cached):
+        try:
+            with open(cached, 'r', encoding='utf-8') as fh:
+                return json.load(fh), True
+        except (OSError, ValueError):
+            pass
+    result = trace(path, levels, size, tolerance)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(cached, 'w', encoding='utf-8') as fh:
+        json.dump(result, fh)
+    return result, False
+
+
+def print_report(reports, min_fidelity):
+    """Per-file raster vs traced sizes and fidelity, and a total for the traced ones.
+
+    Each report has 'file', 'before' (inline raster bytes), 'after' (traced
+    symbol bytes or None), 'layers', 'fidelity' and 'cached'.
+    """
+    before = after = traced = 0
+    for r in reports:
+        if r['after'] is None:
+            print(f"  {r['file']}: not traceable, raster kept")
+            continue
+        detail = f"{r['layers']} layer{'' if r['layers'] == 1 else 's'}, fidelity {r['fidelity']:.1f}%"
+        if r['cached']:
+            detail += ', cached'
+        if r['fidelity'] < min_fidelity:
+            print(f"  {r['file']}: raster kept ({detail} < {min_fidelity:g}%)")
+            continue
+        print(f"  {r['file']}: {r['before']} -> {r['after']} bytes ({detail})")
+        before += r['before']
+        after += r['after']
+        traced += 1
+    print(f'Raster tracing: {traced} of {len(reports)} rasters traced, {before} -> {after} bytes '
+          f'({100 * (before - after) / before if before else 0:.1f}% saved)')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Trace raster icons into currentColor SVG paths.')
+    parser.add_argument('--levels', type=int, choices=sorted(OPACITIES), default=DEFAULT_LEVELS)
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE, help='trace grid, longest side in pixels')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='path simplification tolerance in grid pixels')
+    parser.add_argument('--out', help='write <name>.svg for each traced image here')
+    parser.add_argument('images', nargs='+')
+    args = parser.parse_args(argv)
+    if not available():
+        print('Pillow is not installed (pip install Pillow)')
+        return
+    for path in args.images:
+        result = trace(path, args.levels, args.size, args.tolerance)
+        if result is None:
+            print(f'{path}: not traceable')
+            continue
+        markup = layer_markup(result)
+        print(f"{path}: {len(result['layers'])} layer(s), {len(markup)} bytes, fidelity {result['fidelity']:.1f}%")
+        if args.out:
+            os.makedirs(args.out, exist_ok=True)
+            name = os.path.splitext(os.path.basename(path))[0] + '.svg'
+            with open(os.path.join(args.out, name), 'w', encoding='utf-8') as fh:
+                fh.write(f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{result["viewBox"]}">{markup}</svg>\n')
+
+
+if __name__ == '__main__':
+    main()
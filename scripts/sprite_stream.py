@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Chunked output helpers and peak-memory tracing shared by the sprite builders.
+
+Both builders used to read every raster whole, base64-encode it into a
+string and format that into the symbol, so one multi-MB PNG existed in
+memory several times over and a sprite was only written once all of it
+had been built. These helpers let them write each symbol as soon as it is
+ready instead:
+
+- `write_base64()` encodes a file to an open binary stream CHUNK_SIZE bytes
+  at a time (a multiple of 3, so chunk outputs join without `=` padding)
+- `copy_file()` appends a finished symbol file to a sprite the same way
+- `write_atomic()` writes a file through `<name>.part` so an interrupted
+  build never leaves half a symbol behind
+- `partial()` opens a scratch file that is removed if its block raises
+
+`start_trace()` / `print_peak()` use tracemalloc to report the peak Python
+heap of a build next to its largest input. With streaming the peak does not
+grow with the number of inputs, but it includes a fixed part: the copy
+buffer (CHUNK_SIZE, or the file size if smaller) and the interpreter's own
+working set, a few hundred KB. For multi-MB inputs the peak is below the
+input size; for inputs of a few KB it is many times larger.
+"""
+import base64
+import contextlib
+import os
+import shutil
+import tracemalloc
+
+CHUNK_SIZE = 3 * 64 * 1024
+
+
+def _chunk(path, chunk_size):
+    """`chunk_size`, or less for a smaller file: read() allocates the full size."""
+    size = os.path.getsize(path)
+    return max(3, min(chunk_size, size + (-size % 3)))
+
+
+def base64_size(n):
+    """Length of the base64 encoding of `n` bytes."""
+    return 4 * ((n + 2) // 3)
+
+
+def write_base64(out, path, chunk_size=CHUNK_SIZE):
+    """Append base64 of the file at `path` to binary stream `out`; returns bytes written."""
+    written = 0
+    chunk_size = _chunk(path, chunk_size)
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b''):
+            data = base64.b64encode(chunk)
+            out.write(data)
+            written += len(data)
+    return written
+
+
+def copy_file(out, path, chunk_size=CHUNK_SIZE):
+    with open(path, 'rb') as fh:
+        shutil.copyfileobj(fh, out, _chunk(path, chunk_size))
+
+
+def write_atomic(path, write):
+    """Call `write(fh)` on `<path>.part`, then move it into place.
+
+    The partial file is removed if `write` raises.
+    """
+    tmp = f'{path}.part'
+    try:
+        with open(tmp, 'wb') as fh:
+            write(fh)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+@contextlib.contextmanager
+def partial(path):
+    """`with partial(path) as fh:` writes `path`, which is removed if the block raises."""
+    try:
+        with open(path, 'wb') as fh:
+            yield fh
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+
+def start_trace():
+    tracemalloc.start()
+
+
+def print_peak(inputs):
+    """Print the traced peak heap against the largest of `inputs` (file paths)."""
+    if not tracemalloc.is_tracing():
+        return
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    largest = max((os.path.getsize(p) for p in inputs if os.path.isfile(p)), default=0)
+    ratio = f', {peak / largest:.1f}x' if largest else ''
+    print(f'Peak memory: {peak / 1e6:.2f} MB traced (largest input {largest / 1e6:.2f} MB{ratio})')
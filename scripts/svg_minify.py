@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""Precision/path minifier for SVG symbols, shared by the sprite builders.
+
+Downloaded logos and druplicons carry editor precision (`184.373975`),
+Inkscape/Sodipodi/Sketch metadata and wrapper groups that never render.
+`minify_tree()` works on an ElementTree root in place:
+
+- path data is parsed to absolute coordinates, rounded to `precision`
+  decimals and re-emitted choosing the shorter of the absolute or relative
+  form per segment (relative offsets are taken between *rounded* points, so
+  rounding error never accumulates), with lines collapsed to H/V and
+  implicit repeated commands;
+- `points` and plain numeric geometry attributes are rounded the same way;
+- `<metadata>`, editor-namespace elements and attributes, unreferenced ids,
+  empty groups and attribute-less wrapper groups are removed;
+- identical `<defs>` children are merged and references rewritten.
+
+Every rewritten path/points value is parsed back and compared with the
+original coordinates; if any point moved by more than half a unit in the
+last kept decimal the original value is kept (counted in `fallbacks`).
+
+Usage: python3 scripts/svg_minify.py [--precision N] file.svg ...
+"""
+import argparse
+import re
+from xml.etree import ElementTree as ET
+
+SVG_NS = 'http://www.w3.org/2000/svg'
+XLINK_NS = 'http://www.w3.org/1999/xlink'
+EDITOR_NAMESPACES = (
+    'http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd',
+    'http://www.inkscape.org/namespaces/inkscape',
+    'http://www.bohemiancoding.com/sketch/ns',
+    'http://ns.adobe.com/AdobeIllustrator/10.0/',
+    'http://ns.adobe.com/Graphs/1.0/',
+    'http://ns.adobe.com/SaveForWeb/1.0/',
+    'http://ns.adobe.com/Extensibility/1.0/',
+)
+DEFAULT_PRECISION = 3
+PARAM_COUNTS = {'M': 2, 'L': 2, 'H': 1, 'V': 1, 'C': 6, 'S': 4, 'Q': 4, 'T': 2, 'A': 7, 'Z': 0}
+GEOMETRY_ATTRS = ('x', 'y', 'width', 'height', 'cx', 'cy', 'r', 'rx', 'ry', 'x1', 'y1', 'x2', 'y2')
+
+NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+PLAIN_NUMBER_RE = re.compile(r'\s*[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?\s*$')
+FLAG_RE = re.compile(r'[01]')
+SEP_RE = re.compile(r'[\s,]*')
+REF_RE = re.compile(r'#([A-Za-z_][\w.:-]*)')
+
+
+def namespace(name):
+    return name[1:].split('}', 1)[0] if name.startswith('{') else None
+
+
+def local_name(name):
+    return name.rsplit('}', 1)[-1]
+
+
+def parse_path(d):
+    """Absolute segments [(cmd, params)] of path data; raises ValueError.
+
+    H/V come back as L with both coordinates, so a path and its minified
+    form can be compared point by point.
+    """
+    segments = []
+    x = y = sx = sy = 0.0
+    cmd = None
+    pos = SEP_RE.match(d).end()
+    while pos < len(d):
+        if d[pos].isalpha():
+            cmd = d[pos]
+            if cmd.upper() not in PARAM_COUNTS:
+                raise ValueError(f'unknown path command {cmd!r}')
+            pos = SEP_RE.match(d, pos + 1).end()
+            if cmd in 'Zz':
+                segments.append(('Z', []))
+                x, y = sx, sy
+                continue
+        elif cmd is None or cmd in 'Zz':
+            raise ValueError('path data without a command')
+        upper = cmd.upper()
+        params = []
+        for k in range(PARAM_COUNTS[upper]):
+            m = (FLAG_RE if upper == 'A' and k in (3, 4) else NUMBER_RE).match(d, pos)
+            if not m:
+                raise ValueError(f'bad path data at offset {pos}')
+            params.append(float(m.group()))
+            pos = SEP_RE.match(d, m.end()).end()
+        rel = cmd.islower()
+        if upper == 'H':
+            upper, params = 'L', [params[0] + x if rel else params[0], y]
+        elif upper == 'V':
+            upper, params = 'L', [x, params[0] + y if rel else params[0]]
+        elif upper == 'A':
+            if rel:
+                params[5] += x
+                params[6] += y
+        elif rel:
+            params = [v + (x if i % 2 == 0 else y) for i, v in enumerate(params)]
+        segments.append((upper, params))
+        x, y = params[-2], params[-1]
+        if upper == 'M':
+            sx, sy = x, y
+            cmd = 'l' if rel else 'L'  # further pairs are implicit lineto
+    return segments
+
+
+def format_number(v, precision):
+    s = f'{v:.{precision}f}'
+    if '.' in s:
+        s = s.rstrip('0').rstrip('.')
+    if s in ('-0', '', '-'):
+        return '0'
+    if s.startswith('0.'):
+        return s[1:]
+    if s.startswith('-0.'):
+        return '-' + s[2:]
+    return s
+
+
+def join_numbers(numbers):
+    """Join formatted numbers, dropping separators where the parse is unambiguous."""
+    out = []
+    last = ''
+    for s in numbers:
+        if last and not (s[0] == '-' or (s[0] == '.' and '.' in last)):
+            out.append(' ')
+        out.append(s)
+        last = s
+    return ''.join(out)
+
+
+def join_arc(numbers):
+    """Arc parameters; the single-digit flags need no separators at all."""
+    return join_numbers(numbers[:3]) + ' ' + numbers[3] + numbers[4] + join_numbers(numbers[5:])
+
+
+def _segment_forms(cmd, params, cur, precision):
+    """(letter, numbers) candidates for one segment, given the rounded current point."""
+    r = [round(v, precision) for v in params]
+    cx, cy = cur
+    fmt = lambda v: format_number(v, precision)  # noqa: E731
+    if cmd == 'A':
+        head = [fmt(r[0]), fmt(r[1]), fmt(r[2]), str(int(r[3])), str(int(r[4]))]
+        return r, [('A', head + [fmt(r[5]), fmt(r[6])]),
+                   ('a', head + [fmt(r[5] - cx), fmt(r[6] - cy)])]
+    if cmd == 'L' and r[1] == cy and r[0] != cx:
+        return r, [('H', [fmt(r[0])]), ('h', [fmt(r[0] - cx)])]
+    if cmd == 'L' and r[0] == cx:
+        return r, [('V', [fmt(r[1])]), ('v', [fmt(r[1] - cy)])]
+    rel = [fmt(v - (cx if i % 2 == 0 else cy)) for i, v in enumerate(r)]
+    return r, [(cmd, [fmt(v) for v in r]), (cmd.lower(), rel)]
+
+
+def format_path(segments, precision):
+    out = []
+    prev = None  # last command letter written
+    last = ''  # last number written, to decide whether a separator is needed
+    cur = start = (0.0, 0.0)
+    for cmd, params in segments:
+        if cmd == 'Z':
+            out.append('z')
+            prev, last = 'z', ''
+            cur = start
+            continue
+        rounded, forms = _segment_forms(cmd, params, cur, precision)
+        best = None
+        for letter, numbers in forms:
+            # A repeated command (or lineto straight after moveto) needs no letter
+            implicit = letter not in 'Mm' and (letter == prev or (prev, letter) in (('M', 'L'), ('m', 'l')))
+            text = join_arc(numbers) if cmd == 'A' else join_numbers(numbers)
+            if not implicit:
+                text = letter + text
+            elif not (text[0] == '-' or (text[0] == '.' and '.' in last)):
+                text = ' ' + text
+            if best is None or len(text) <= len(best[1]):  # ties go to the relative form
+                best = (letter, text, numbers[-1])
+        letter, text, last = best
+        out.append(text)
+        prev = letter
+        cur = (rounded[-2], rounded[-1])
+        if cmd == 'M':
+            start = cur
+    return ''.join(out)
+
+
+def _close_enough(a, b, tolerance):
+    if len(a) != len(b):
+        return False
+    for (ca, pa), (cb, pb) in zip(a, b):
+        if ca != cb or len(pa) != len(pb):
+            return False
+        if any(abs(u - v) > tolerance for u, v in zip(pa, pb)):
+            return False
+    return True
+
+
+def minify_path(d, precision=DEFAULT_PRECISION):
+    """Minified path data, or None if it cannot be verified against `d`."""
+    try:
+        original = parse_path(d)
+        result = format_path(original, precision)
+        check = parse_path(result)
+    except ValueError:
+        return None
+    tolerance = 0.5 * 10 ** -precision + 1e-9
+    return result if _close_enough(original, check, tolerance) else None
+
+
+def minify_points(value, precision=DEFAULT_PRECISION):
+    numbers = [float(n) for n in NUMBER_RE.findall(value)]
+    result = join_numbers([format_number(n, precision) for n in numbers])
+    check = [float(n) for n in NUMBER_RE.findall(result)]
+    tolerance = 0.5 * 10 ** -precision + 1e-9
+    if len(check) != len(numbers) or any(abs(u - v) > tolerance for u, v in zip(numbers, check)):
+        return None
+    return result
+
+
+def _is_cruft(el):
+    return local_name(el.tag) == 'metadata' or namespace(el.tag) in EDITOR_NAMESPACES
+
+
+def _references(root):
+    """Every #id mentioned in attributes or text (url(#x), href, CSS)."""
+    refs = set()
+    for el in root.iter():
+        for value in el.attrib.values():
+            if '#' in value:
+                refs.update(REF_RE.findall(value))
+        if el.text and '#' in el.text:
+            refs.update(REF_RE.findall(el.text))
+    return refs
+
+
+def rewrite_refs(root, mapping):
+    """Point `#old` references (url(), href, CSS) anywhere under `root` at `#mapping[old]`."""
+    if not mapping:
+        return
+    sub = lambda m: '#' + mapping.get(m.group(1), m.group(1))  # noqa: E731
+    for el in root.iter():
+        for name, value in el.attrib.items():
+            if '#' in value:
+                el.set(name, REF_RE.sub(sub, value))
+        if el.text and '#' in el.text:
+            el.text = REF_RE.sub(sub, el.text)
+
+
+def prefix_ids(root, prefix):
+    """Prefix every id below `root`, and the references to them; returns how many.
+
+    Used when several documents are merged into one, so their ids cannot
+    collide. `root`'s own id is left alone.
+    """
+    mapping = {}
+    for el in root.iter():
+        ident = el.get('id')
+        if el is not root and ident is not None:
+            mapping[ident] = prefix + ident
+            el.set('id', prefix + ident)
+    rewrite_refs(root, mapping)
+    return len(mapping)
+
+
+def def_key(el):
+    """Bytes identifying a definition by its content, ignoring its id."""
+    attrs = sorted((k, v) for k, v in el.attrib.items() if k != 'id')
+    clone = ET.Element(el.tag, dict(attrs))
+    clone.text = el.text
+    clone.extend(list(el))
+    return ET.tostring(clone)
+
+
+def merge_defs(root, stats):
+    """Drop `<defs>` children identical to an earlier one; point refs at the first."""
+    seen = {}
+    mapping = {}
+    for defs in [el for el in root.iter() if local_name(el.tag) == 'defs']:
+        for child in list(defs):
+            ident = child.get('id')
+            if ident is None:
+                continue
+            key = def_key(child)
+            if key in seen:
+                if seen[key] != ident:
+                    mapping[ident] = seen[key]
+                defs.remove(child)
+                stats['merged_defs'] += 1
+            else:
+                seen[key] = ident
+    rewrite_refs(root, mapping)
+
+
+def _clean(parent, refs, precision, stats):
+    i = 0
+    while i < len(parent):
+        el = parent[i]
+        if _is_cruft(el):
+            parent.remove(el)
+            stats['removed_elements'] += 1
+            continue
+        for name in [n for n in el.attrib if namespace(n) in EDITOR_NAMESPACES]:
+            del el.attrib[name]
+        if el.get('id') is not None and el.get('id') not in refs:
+            del el.attrib['id']
+        tag = local_name(el.tag)
+        if tag == 'path' and el.get('d'):
+            stats['paths'] += 1
+            d = minify_path(el.get('d'), precision)
+            if d is None:
+                stats['fallbacks'] += 1
+            else:
+                el.set('d', d)
+        elif tag in ('polygon', 'polyline') and el.get('points'):
+            points = minify_points(el.get('points'), precision)
+            if points is None:
+                stats['fallbacks'] += 1
+            else:
+                el.set('points', points)
+        for name in GEOMETRY_ATTRS:
+            value = el.get(name)
+            if value is not None and PLAIN_NUMBER_RE.match(value):
+                el.set(name, format_number(float(value), precision))
+        _clean(el, refs, precision, stats)
+        if tag in ('g', 'defs') and len(el) == 0 and not (el.text or '').strip():
+            parent.remove(el)
+            stats['removed_elements'] += 1
+            continue
+        if tag == 'g' and not el.attrib:
+            # Attribute-less wrapper group: splice its children into the parent
+            children = list(el)
+            children[-1].tail = (children[-1].tail or '') + (el.tail or '')
+            parent.remove(el)
+            for offset, child in enumerate(children):
+                parent.insert(i + offset, child)
+            stats['unwrapped_groups'] += 1
+            i += len(children)
+            continue
+        i += 1
+
+
+def minify_tree(root, precision=DEFAULT_PRECISION):
+    """Minify an SVG element tree in place; returns a stats dict."""
+    stats = {'paths': 0, 'fallbacks': 0, 'removed_elements': 0, 'unwrapped_groups': 0, 'merged_defs': 0}
+    merge_defs(root, stats)
+    for name in [n for n in root.attrib if namespace(n) in EDITOR_NAMESPACES]:
+        del root.attrib[name]
+    _clean(root, _references(root), precision, stats)
+    return stats
+
+
+def minify_svg_text(svg_text, precision=DEFAULT_PRECISION):
+    """(minified markup, stats) for an SVG document; (svg_text, None) if it does not parse."""
+    ET.register_namespace('', SVG_NS)
+    ET.register_namespace('xlink', XLINK_NS)
+    try:
+        root = ET.fromstring(svg_text.encode('utf-8'))
+    except ET.ParseError:
+        return svg_text, None
+    stats = minify_tree(root, precision)
+    return ET.tostring(root, encoding='unicode'), stats
+
+
+def format_stats(name, before, after, stats):
+    detail = f"{stats['paths']} paths"
+    if stats['fallbacks']:
+        detail += f", {stats['fallbacks']} kept unverified"
+    for key, label in (('removed_elements', 'removed'), ('unwrapped_groups', 'groups unwrapped'),
+                       ('merged_defs', 'defs merged')):
+        if stats[key]:
+            detail += f', {stats[key]} {label}'
+    return f'  {name}: {before} -> {after} bytes ({after - before:+d}; {detail})'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report what the sprite minifier saves on SVG files.')
+    parser.add_argument('--precision', type=int, default=DEFAULT_PRECISION,
+                        help=f'decimal places kept in coordinates (default {DEFAULT_PRECISION})')
+    parser.add_argument('files', nargs='+')
+    args = parser.parse_args(argv)
+    total_before = total_after = 0
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as fh:
+            text = fh.read()
+        result, stats = minify_svg_text(text, args.precision)
+        if stats is None:
+            print(f'  {path}: not well-formed, skipped')
+            continue
+        before, after = len(text.encode('utf-8')), len(result.encode('utf-8'))
+        total_before += before
+        total_after += after
+        print(format_stats(path, before, after, stats))
+    print(f'Total: {total_before} -> {total_after} bytes ({total_after - total_before:+d})')
+
+
+if __name__ == '__main__':
+    main()
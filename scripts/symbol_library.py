@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Shared `<symbol>` library written by both sprite builders.
+
+A deck that uses both `cms-logos.svg` and `druplicon-sprite.svg` downloads
+any artwork the two have in common twice. With `--shared-library` each
+builder instead adds its (already normalized) artwork here, keyed by a hash
+of the symbol content, and emits a stub that draws it with `<use>`:
+
+    <symbol id="druplicon-x" viewBox="0 0 100 100">
+      <use href="../shared-symbols.svg#s-1a2b3c4d5e6f7a8b" x="0" y="0" width="100" height="100"/>
+    </symbol>
+
+so every unique artwork is stored once across all generated sprites.
+
+- `presentations/ca-slides/assets/shared-symbols.svg` holds one symbol per
+  line, sorted by id. Markup is stored with the whitespace between tags
+  removed and newlines folded to spaces; ids are `s-` plus the first 16 hex
+  digits of the SHA256 of that markup and the canonical viewBox.
+- `shared-symbols.json` records which builder (`owner`) uses each symbol
+  under which of its own ids. A build replaces only its own entries, so the
+  builders can run in any order; symbols no builder uses are dropped.
+
+New symbols are spooled to a temporary directory and merged into the
+sorted library on `save()`, so only one symbol is held in memory at a time.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATH = os.path.join(ROOT, 'presentations', 'ca-slides', 'assets', 'shared-symbols.svg')
+INDEX_VERSION = 1
+HEADER = '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" style="display:none">\n'
+FOOTER = '</svg>\n'
+SYMBOL_RE = re.compile(r'<symbol id="([^"]*)" viewBox="([^"]*)">(.*)</symbol>\s*$', re.S)
+BETWEEN_TAGS_RE = re.compile(r'>\s+<')
+NEWLINE_RE = re.compile(r'\s*[\r\n]\s*')
+
+
+def canonical_viewbox(viewbox):
+    """'0.0 0.0 24.0 24.0' and '0,0,24,24' both become '0 0 24 24'."""
+    return ' '.join(f'{float(v):g}' for v in viewbox.replace(',', ' ').split())
+
+
+def canonical_markup(inner):
+    """Markup on one line; whitespace between tags and line breaks are insignificant in SVG."""
+    return NEWLINE_RE.sub(' ', BETWEEN_TAGS_RE.sub('><', inner.strip()))
+
+
+def symbol_hash(viewbox, inner):
+    text = canonical_viewbox(viewbox) + '\n' + canonical_markup(inner)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def parse_symbol(text):
+    """(id, viewBox, inner markup) of a rendered `<symbol>`, or None."""
+    m = SYMBOL_RE.match(text)
+    return m.groups() if m else None
+
+
+class SymbolLibrary:
+    """One builder's view of the shared library."""
+
+    def __init__(self, owner, path=DEFAULT_PATH):
+        self.owner = owner
+        self.path = path
+        self.index_path = os.path.splitext(path)[0] + '.json'
+        self.entries = {}  # library id -> {'viewBox', 'bytes', 'users': {owner: [ids]}}
+        self.new = {}  # library id -> spooled symbol file
+        self.spool = tempfile.mkdtemp(prefix='shared-symbols-')
+        if os.path.exists(self.index_path) and os.path.exists(path):
+            with open(self.index_path, 'r', encoding='utf-8') as fh:
+                data = json.load(fh)
+            if data.get('version') == INDEX_VERSION:
+                self.entries = data['symbols']
+        for entry in self.entries.values():
+            entry['users'].pop(owner, None)
+
+    def add(self, viewbox, inner, user_id):
+        """Add artwork used by this owner as `user_id`; returns its library id."""
+        lib_id = 's-' + symbol_hash(viewbox, inner)[:16]
+        entry = self.entries.get(lib_id)
+        if entry is None:
+            vb = canonical_viewbox(viewbox)
+            file = os.path.join(self.spool, lib_id + '.svg')
+            with open(file, 'w', encoding='utf-8') as fh:
+                fh.write(f'<symbol id="{lib_id}" viewBox="{vb}">{canonical_markup(inner)}</symbol>')
+            entry = self.entries[lib_id] = {'viewBox': vb, 'bytes': os.path.getsize(file), 'users': {}}
+            self.new[lib_id] = file
+        entry['users'].setdefault(self.owner, []).append(user_id)
+        return lib_id
+
+    def href(self, lib_id, from_dir):
+        """URL of a library symbol relative to a sprite written in `from_dir`."""
+        rel = os.path.relpath(self.path, from_dir).replace(os.sep, '/')
+        return f'{rel}#{lib_id}'
+
+    def use_attrs(self, lib_id, from_dir):
+        """Attributes of a `<use>` drawing a library symbol over its own viewBox."""
+        x, y, w, h = self.entries[lib_id]['viewBox'].split()
+        return {'href': self.href(lib_id, from_dir), 'x': x, 'y': y, 'width': w, 'height': h}
+
+    def use(self, lib_id, from_dir):
+        attrs = ''.join(f' {k}="{v}"' for k, v in self.use_attrs(lib_id, from_dir).items())
+        return f'<use{attrs}/>'
+
+    def _old_lines(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as fh:
+            for line in fh:
+                if line.startswith('<symbol id="'):
+                    yield line[len('<symbol id="'):line.index('"', len('<symbol id="'))], line
+
+    def save(self):
+        """Merge new symbols into the library, drop unused ones, and write the index."""
+        self.entries = {k: e for k, e in self.entries.items() if any(e['users'].values())}
+        for entry in self.entries.values():
+            entry['users'] = {owner: sorted(ids) for owner, ids in entry['users'].items() if ids}
+        tmp = self.path + '.part'
+        with open(tmp, 'w', encoding='utf-8') as out:
+            out.write(HEADER)
+            pending = sorted(k for k in self.new if k in self.entries)
+            # Both streams are sorted by id: merge them
+            for lib_id, line in self._old_lines():
+                while pending and pending[0] < lib_id:
+                    self._copy_new(out, pending.pop(0))
+                if lib_id in self.entries:
+                    out.write(line)
+            for lib_id in pending:
+                self._copy_new(out, lib_id)
+            out.write(FOOTER)
+        os.replace(tmp, self.path)
+        with open(self.index_path, 'w', encoding='utf-8') as fh:
+            json.dump({'version': INDEX_VERSION, 'symbols': self.entries}, fh, indent=1, sort_keys=True)
+            fh.write('\n')
+        shutil.rmtree(self.spool, ignore_errors=True)
+
+    def _copy_new(self, out, lib_id):
+        with open(self.new[lib_id], 'r', encoding='utf-8') as fh:
+            shutil.copyfileobj(fh, out)
+        out.write('\n')
+
+    def summary(self):
+        mine = [e for e in self.entries.values() if self.owner in e['users']]
+        uses = sum(len(e['users'][self.owner]) for e in mine)
+        shared = sum(1 for e in mine if len(e['users']) > 1)
+        return (f'Shared library: {self.owner} uses {len(mine)} symbols for {uses} ids '
+                f'({uses - len(mine)} deduplicated, {shared} shared with other builders, '
+                f'{sum(1 for k in self.new if k in self.entries)} new); '
+                f'{len(self.entries)} symbols in {os.path.basename(self.path)}')
@@ -0,0 +1,8 @@
+"""Behaviour tests for the shared modules in scripts/.
+
+Run from the repository root with `python -m pytest scripts/tests` or
+`python -m unittest discover -s scripts/tests -t scripts`. Both put
+`scripts/` on the import path, so the modules are imported by name as the
+scripts themselves do. Nothing here touches the network: HTTP tests run
+against a local `http.server` (see `server.py`).
+"""
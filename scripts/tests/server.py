@@ -0,0 +1,78 @@
+"""Local keep-alive HTTP server for the HTTP client and asset store tests."""
+import gzip
+import http.server
+import threading
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, as the client expects
+
+    def setup(self):
+        super().setup()
+        self.server.counts['connections'] += 1
+
+    def do_GET(self):
+        self.server.counts['requests'] += 1
+        self.server.seen.append((self.path, dict(self.headers)))
+        route = self.server.routes.get(self.path)
+        if route is None:
+            self.reply(404, {}, b'not found')
+            return
+        if callable(route):
+            route = route(self)
+        self.reply(*route)
+
+    def reply(self, status, headers, body=b''):
+        headers = dict(headers)
+        if headers.pop('gzip', False) and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
+        etag = headers.get('ETag')
+        if etag and self.headers.get('If-None-Match') == etag:
+            status, body = 304, b''
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client stopped reading early
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalServer:
+    """`with LocalServer(routes) as server:`; `server.url(path)` points at it.
+
+    `routes` maps a path to (status, headers, body), or to a function of the
+    request handler returning one. A true 'gzip' header compresses the body
+    for clients that accept it, and a route with an ETag answers a matching
+    If-None-Match with 304. `counts` has the requests and connections seen,
+    `seen` each request's path and headers.
+    """
+
+    def __init__(self, routes):
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.routes = routes
+        self.httpd.counts = {'requests': 0, 'connections': 0}
+        self.httpd.seen = []
+        self.counts = self.httpd.counts
+        self.seen = self.httpd.seen
+        self.routes = routes
+
+    def url(self, path):
+        host, port = self.httpd.server_address
+        return f'http://{host}:{port}{path}'
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+
+from asset_catalog import AssetCatalog
+
+PNG_1x2 = (b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x02'
+           b'\x08\x06\x00\x00\x00\x00\x00\x00\x00')
+
+
+class AssetCatalogTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = os.path.join(tmp.name, 'originals')
+        os.mkdir(self.dir)
+        self.write('a.png', PNG_1x2)
+        self.write('b.svg', b'<svg/>')
+        self.write('notes.txt', b'not an image')
+        self.catalog = AssetCatalog(os.path.join(tmp.name, 'catalog.sqlite'))
+        self.addCleanup(self.catalog.close)
+
+    def write(self, name, data, age=10):
+        path = os.path.join(self.dir, name)
+        with open(path, 'wb') as fh:
+            fh.write(data)
+        # Old enough for the directory listing to be trusted
+        past = os.stat(path).st_mtime - age
+        os.utime(path, (past, past))
+        os.utime(self.dir, (past, past))
+
+    def test_refresh_catalogues_images(self):
+        hashes = self.catalog.refresh(self.dir)
+        self.assertEqual(sorted(hashes), ['a.png', 'b.svg'])
+        row = self.catalog.get('a.png')
+        self.assertEqual((row['mime'], row['width'], row['height'], row['size']), ('image/png', 1, 2, len(PNG_1x2)))
+        self.assertIsNone(self.catalog.dimensions('b.svg'))
+
+    def test_only_changed_files_are_hashed(self):
+        self.catalog.refresh(self.dir)
+        self.catalog.stats['hashed'] = 0
+        self.write('b.svg', b'<svg viewBox="0 0 1 1"/>', age=5)
+        self.catalog.refresh(self.dir)
+        self.assertEqual(self.catalog.stats['hashed'], 1)
+
+    def test_unchanged_directory_is_listed_from_the_catalog(self):
+        self.catalog.refresh(self.dir)
+        self.assertEqual([name for name, _ in self.catalog.listing(self.dir)], ['a.png', 'b.svg'])
+        self.assertEqual(self.catalog.stats['listed'], 1)
+        os.remove(os.path.join(self.dir, 'b.svg'))
+        self.assertEqual([name for name, _ in self.catalog.listing(self.dir)], ['a.png'])
+        self.assertEqual(self.catalog.stats['removed'], 1)
+
+    def test_directories_are_listed_apart(self):
+        other = os.path.join(os.path.dirname(self.dir), 'other')
+        os.mkdir(other)
+        with open(os.path.join(other, 'c.png'), 'wb') as fh:
+            fh.write(PNG_1x2)
+        past = os.stat(other).st_mtime - 10
+        os.utime(other, (past, past))
+        self.catalog.refresh(self.dir)
+        self.catalog.refresh(other)
+        for _ in range(2):  # read, then from the catalog
+            self.assertEqual(self.catalog.listing(self.dir),
+                             [('a.png', os.path.join(self.dir, 'a.png')), ('b.svg', os.path.join(self.dir, 'b.svg'))])
+            self.assertEqual(self.catalog.listing(other), [('c.png', os.path.join(other, 'c.png'))])
+        self.assertEqual(self.catalog.stats['listed'], 4)
+        self.assertEqual(self.catalog.stats['removed'], 0)
+
+    def test_listing_keeps_to_the_extensions_asked_for(self):
+        self.catalog.refresh(self.dir, extensions=('.svg',))
+        self.assertEqual([name for name, _ in self.catalog.listing(self.dir, ('.svg',))], ['b.svg'])
+        self.assertEqual(self.catalog.stats['listed'], 1)
+        # Listed for fewer extensions than asked for: the directory is read again
+        self.assertEqual([name for name, _ in self.catalog.listing(self.dir)], ['a.png', 'b.svg'])
+        self.assertEqual(self.catalog.stats['listed'], 1)
+        self.catalog.refresh(self.dir)
+        self.assertEqual([name for name, _ in self.catalog.listing(self.dir, ('.png',))], ['a.png'])
+        self.assertEqual(self.catalog.stats['listed'], 2)
+
+    def test_unprocessed_tracks_version_and_content(self):
+        self.catalog.refresh(self.dir)
+        self.assertEqual(self.catalog.unprocessed('v1'), ['a.png', 'b.svg'])
+        self.catalog.mark_processed(['a.png', 'b.svg'], 'v1')
+        self.assertEqual(self.catalog.unprocessed('v1'), [])
+        self.assertEqual(self.catalog.unprocessed('v2'), ['a.png', 'b.svg'])
+        self.catalog.set_phash('b.svg', 'phash', 'ff')
+        self.write('b.svg', b'<svg viewBox="0 0 2 2"/>', age=5)
+        self.catalog.refresh(self.dir)
+        self.assertEqual(self.catalog.unprocessed('v1'), ['b.svg'])
+        self.assertIsNone(self.catalog.phash('b.svg', 'phash'))
+
+    def test_csv_round_trip_escapes_fields(self):
+        self.catalog.refresh(self.dir)
+        page = 'https://example.org/druplicon/"quoted",page'
+        self.catalog.set_pages([(page, 'https://example.org/a.png', 'a.png'),
+                                ('https://example.org/druplicon/none', 'https://example.org/x.png', None)])
+        csv_path = os.path.join(self.dir, 'meta.csv')
+        self.catalog.export_csv(csv_path, '/srv/originals')
+        with open(csv_path, encoding='utf-8') as fh:
+            self.assertEqual(fh.read().splitlines()[1],
+                             '"https://example.org/druplicon/""quoted"",page","https://example.org/a.png",'
+                             '"/srv/originals/a.png"')
+        self.assertEqual(self.catalog.import_csv(csv_path), 2)
+        self.assertEqual(self.catalog.pages()[0], (page, 'https://example.org/a.png', 'a.png'))
+        self.assertEqual(self.catalog.get('a.png')['image_url'], 'https://example.org/a.png')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import unittest
+
+from asset_store import AssetStore, OfflineError
+from http_client import HttpClient
+from tests.server import LocalServer
+
+LOGO = b'<svg viewBox="0 0 10 10"/>'
+
+
+class AssetStoreTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = os.path.join(tmp.name, 'store')
+        self.lock = os.path.join(tmp.name, 'lock.json')
+        self.routes = {'/logo.svg': (200, {'ETag': '"v1"'}, LOGO), '/other.svg': (200, {}, b'<svg/>')}
+        self.server = LocalServer(self.routes)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.client = HttpClient()
+        self.addCleanup(self.client.close)
+
+    def store(self):
+        return AssetStore(self.dir, self.lock, self.client)
+
+    def test_revalidates_and_detects_changes(self):
+        url = self.server.url('/logo.svg')
+        store = self.store()
+        path, status = store.fetch(url, '.svg')
+        self.assertEqual(status, 'downloaded')
+        with open(path, 'rb') as fh:
+            self.assertEqual(fh.read(), LOGO)
+        store.save()
+
+        store = self.store()
+        self.assertEqual(store.fetch(url, '.svg'), (path, 'not-modified'))
+        self.assertEqual(self.server.seen[-1][1].get('If-None-Match'), '"v1"')
+
+        self.routes['/logo.svg'] = (200, {'ETag': '"v2"'}, LOGO + b'\n')
+        new_path, status = store.fetch(url, '.svg')
+        self.assertEqual(status, 'changed')
+        self.assertNotEqual(new_path, path)
+
+    def test_offline_resolve_checks_the_blob(self):
+        url = self.server.url('/logo.svg')
+        store = self.store()
+        path, _ = store.fetch(url, '.svg')
+        store.save()
+        self.assertEqual(self.store().resolve(url), path)
+        with self.assertRaises(OfflineError):
+            self.store().resolve(self.server.url('/other.svg'))
+        with open(path, 'ab') as fh:
+            fh.write(b' ')
+        with self.assertRaises(OfflineError):
+            self.store().resolve(url)
+
+    def test_save_drops_unused_urls_and_blobs(self):
+        store = self.store()
+        keep, _ = store.fetch(self.server.url('/logo.svg'), '.svg')
+        drop, _ = store.fetch(self.server.url('/other.svg'), '.svg')
+        store.save([self.server.url('/logo.svg')])
+        self.assertTrue(os.path.exists(keep))
+        self.assertFalse(os.path.exists(drop))
+        with open(self.lock, encoding='utf-8') as fh:
+            self.assertEqual(list(json.load(fh)['assets']), [self.server.url('/logo.svg')])
+
+    def test_retries_server_errors(self):
+        replies = [(503, {}, b'busy'), (200, {}, LOGO)]
+        self.routes['/flaky.svg'] = lambda handler: replies.pop(0)
+        store = self.store()
+        _, status = store.fetch(self.server.url('/flaky.svg'), '.svg', retries=1, backoff=0)
+        self.assertEqual((status, store.stats['retried']), ('downloaded', 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+from download_druplicons import CrawlJournal
+
+PAGE = 'https://www.druplicon.org/druplicon/a'
+IMAGE = 'https://www.druplicon.org/sites/default/files/druplicons/a.svg'
+
+
+class CrawlJournalTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'journal.jsonl')
+
+    def reopen(self, journal):
+        journal.close()
+        journal = CrawlJournal(self.path)
+        self.addCleanup(journal.close)
+        return journal
+
+    def test_interrupted_crawl_resumes(self):
+        journal = CrawlJournal(self.path)
+        journal.record(index=0, links=[PAGE])
+        journal.record(page=PAGE, image=IMAGE)
+        journal = self.reopen(journal)
+        self.assertTrue(journal.resumed)
+        self.assertEqual(journal.index_pages, {0: [PAGE]})
+        self.assertEqual(journal.images, {PAGE: IMAGE})
+
+    def test_torn_last_line_is_dropped(self):
+        journal = CrawlJournal(self.path)
+        journal.record(page=PAGE, image=IMAGE)
+        journal.close()
+        with open(self.path, 'ab') as fh:
+            fh.write(b'{"page": "https://www.dru')
+        journal = CrawlJournal(self.path)
+        journal.record(topic='t', links=[])
+        journal = self.reopen(journal)
+        self.assertEqual(journal.images, {PAGE: IMAGE})
+        self.assertEqual(journal.topics, {'t': []})
+
+    def test_completed_crawl_keeps_only_index_links(self):
+        journal = CrawlJournal(self.path)
+        journal.record(index=0, links=[PAGE])
+        journal.record(page=PAGE, image=IMAGE)
+        journal.complete()
+        journal = self.reopen(journal)
+        self.assertFalse(journal.resumed)
+        self.assertEqual(journal.images, {})  # detail pages are fetched again
+        self.assertEqual(journal.known_pages, {0: [PAGE]})
+        self.assertEqual(journal.finished_links, {PAGE})
+
+    def test_restart_ignores_the_journal(self):
+        journal = CrawlJournal(self.path)
+        journal.record(page=PAGE, image=IMAGE)
+        journal.close()
+        journal = CrawlJournal(self.path, restart=True)
+        self.addCleanup(journal.close)
+        self.assertEqual(journal.images, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
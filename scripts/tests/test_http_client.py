@@ -0,0 +1,65 @@
+import unittest
+import urllib.error
+
+from http_client import HttpClient
+from tests.server import LocalServer
+
+BODY = b'<svg viewBox="0 0 10 10"/>' * 100
+BIG = b'x' * (4 * 1024 * 1024)
+
+
+class HttpClientTest(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalServer({
+            '/logo.svg': (200, {'ETag': '"v1"'}, BODY),
+            '/moved': (302, {'Location': '/logo.svg'}, b''),
+            '/gzipped.svg': (200, {'gzip': True}, BODY),
+            '/big': (200, {}, BIG),
+        })
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.client = HttpClient()
+        self.addCleanup(self.client.close)
+
+    def test_redirect_is_followed(self):
+        resp = self.client.get(self.server.url('/moved'))
+        self.assertEqual((resp.status, resp.url, resp.body), (200, self.server.url('/logo.svg'), BODY))
+
+    def test_gzip_body_is_decoded(self):
+        resp = self.client.get(self.server.url('/gzipped.svg'))
+        self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(resp.body, BODY)
+        with self.client.stream(self.server.url('/gzipped.svg')) as streamed:
+            self.assertEqual(b''.join(streamed.chunks()), BODY)
+            self.assertLess(streamed.bytes_read, len(BODY))
+
+    def test_304_is_returned_not_raised(self):
+        resp = self.client.get(self.server.url('/logo.svg'), headers={'If-None-Match': '"v1"'})
+        self.assertEqual((resp.status, resp.body), (304, b''))
+
+    def test_error_status_raises_http_error(self):
+        with self.assertRaises(urllib.error.HTTPError) as caught:
+            self.client.get(self.server.url('/missing'))
+        self.assertEqual(caught.exception.code, 404)
+
+    def test_connections_are_reused(self):
+        for _ in range(3):
+            self.client.get(self.server.url('/logo.svg'))
+        with self.client.stream(self.server.url('/logo.svg')) as resp:
+            self.assertEqual(b''.join(resp.chunks()), BODY)
+        self.assertEqual(self.client.stats, {'requests': 4, 'connections': 1, 'reused': 3})
+        self.assertEqual(self.server.counts['connections'], 1)
+
+    def test_leaving_a_stream_early_closes_its_connection(self):
+        with self.client.stream(self.server.url('/big'), chunk_size=1024) as resp:
+            next(resp.chunks())
+        self.assertLess(resp.bytes_read, len(BIG))
+        # The next request needs a new connection, which is then pooled
+        self.client.get(self.server.url('/logo.svg'))
+        self.client.get(self.server.url('/logo.svg'))
+        self.assertEqual(self.client.stats, {'requests': 3, 'connections': 2, 'reused': 1})
+        self.assertEqual(self.server.counts['connections'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import image_hash
+from asset_catalog import AssetCatalog
+from build_druplicon_sprite import drop_near_duplicates
+from build_stats import BuildStats
+
+SQUARE_SVG = (b'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 64 64">'
+              b'<rect width="64" height="64" fill="#fff"/><rect x="8" y="8" width="24" height="48"/></svg>')
+
+
+@unittest.skipUnless(image_hash.available(), 'needs Pillow')
+class NearDuplicatesTest(unittest.TestCase):
+    def setUp(self):
+        from PIL import Image, ImageDraw
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        with open(os.path.join(self.dir, 'logo.svg'), 'wb') as fh:
+            fh.write(SQUARE_SVG)
+        for name, box in (('logo-big.png', (16, 16, 63, 111)), ('other.png', (16, 16, 111, 63))):
+            img = Image.new('RGB', (128, 128), 'white')
+            ImageDraw.Draw(img).rectangle(box, fill='black')
+            img.save(os.path.join(self.dir, name))
+            if name == 'logo-big.png':
+                img.resize((64, 64)).save(os.path.join(self.dir, 'logo.png'))
+        self.catalog = AssetCatalog(os.path.join(self.dir, 'catalog.sqlite'))
+        self.addCleanup(self.catalog.close)
+        self.catalog.refresh(self.dir)
+
+    def survivors(self, names):
+        winners = [(fn, os.path.join(self.dir, fn), os.path.splitext(fn)[0]) for fn in names]
+        with contextlib.redirect_stdout(io.StringIO()):
+            kept = drop_near_duplicates(winners, self.catalog, 1, 'ahash', 4, BuildStats('test'))
+        return [fn for fn, _, _ in kept]
+
+    def test_largest_raster_wins_without_a_vector(self):
+        self.assertEqual(self.survivors(['logo-big.png', 'logo.png', 'other.png']), ['logo-big.png', 'other.png'])
+
+    def test_vector_wins_over_its_raster_twin(self):
+        self.assertEqual(self.survivors(['logo.png', 'logo.svg', 'other.png']), ['logo.svg', 'other.png'])
+
+
+if __name__ == '__main__':
+    unittest.main()
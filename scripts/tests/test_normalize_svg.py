@@ -0,0 +1,71 @@
+import unittest
+
+from build_druplicon_sprite import normalize_svg, paint_value
+
+
+def normalized(body):
+    return normalize_svg(f'<svg viewBox="0 0 10 10">{body}</svg>')[1]
+
+
+class NormalizeSvgTest(unittest.TestCase):
+    def test_comments_and_cdata_pass_through(self):
+        self.assertEqual(normalized('<!-- <path fill="red"/> --><path fill="red" d="M0 0"/>'),
+                         '<!-- <path fill="red"/> --><path fill="currentColor" opacity="0.213" d="M0 0"/>')
+        self.assertEqual(normalized('<text><![CDATA[ fill="red" <b> ]]></text>'),
+                         '<text><![CDATA[ fill="red" <b> ]]></text>')
+
+    def test_style_blocks_and_comments(self):
+        self.assertEqual(normalized('<style>.a{fill:red}</style><!-- fill="red" -->'),
+                         '<style>.a{fill:currentColor;opacity:0.213}</style><!-- fill="red" -->')
+        self.assertEqual(normalized('<style><![CDATA[.a{fill:#000;stroke:#fff}]]></style>'),
+                         '<style><![CDATA[.a{fill:currentColor;fill-opacity:0.000;'
+                         'stroke:currentColor;stroke-opacity:1.000}]]></style>')
+
+    def test_references_and_keywords_are_kept(self):
+        body = '<path fill="url(#g)" stroke="currentColor" d="M0 0"/><g fill="inherit"/>'
+        self.assertEqual(normalized(body), body)
+
+    def test_fill_and_stroke_get_their_own_opacity(self):
+        self.assertEqual(normalized('<path fill="#fff" stroke="#000" d="M0 0"/>'),
+                         '<path fill="currentColor" fill-opacity="1.000" '
+                         'stroke="currentColor" stroke-opacity="0.000" d="M0 0"/>')
+        self.assertEqual(normalized('<path style="fill:#fff;stroke:#000" d="M0 0"/>'),
+                         '<path style="fill:currentColor;fill-opacity:1.000;'
+                         'stroke:currentColor;stroke-opacity:0.000" d="M0 0"/>')
+        # an explicit opacity stays; the paint gets its own
+        self.assertEqual(normalized("<path fill='white' opacity='.5'/>"),
+                         "<path fill='currentColor' fill-opacity=\"1.000\" opacity='.5'/>")
+
+    def test_root_element(self):
+        self.assertEqual(normalize_svg('<?xml version="1.0"?><!DOCTYPE svg><svg width="20px" height="10"><g/></svg>'),
+                         ('0 0 20 10', '<g/>'))
+        self.assertEqual(normalize_svg('<svg viewBox="0 0 1 1"><g>'), (None, None))
+
+
+class PaintValueTest(unittest.TestCase):
+    def test_opaque_colour_maps_luminance_to_opacity(self):
+        self.assertEqual(normalized('<path fill="#fff" d="M0 0"/>'),
+                         '<path fill="currentColor" opacity="1.000" d="M0 0"/>')
+
+    def test_fully_transparent_colours_are_not_painted(self):
+        for colour in ('rgba(0,0,0,0)', '#0000', '#00000000', 'transparent'):
+            with self.subTest(colour=colour):
+                self.assertEqual(paint_value(colour), ('none', None, False))
+                self.assertEqual(normalized(f'<path fill="{colour}" d="M0 0"/>'),
+                                 '<path fill="none" d="M0 0"/>')
+
+    def test_translucent_colour_scales_luminance_by_alpha(self):
+        # Nearly opaque black stays as dark as opaque black
+        self.assertEqual(paint_value('#000')[1], paint_value('rgba(0,0,0,.99)')[1])
+        self.assertEqual(normalized('<path fill="rgba(0,0,0,.99)" d="M0 0"/>'),
+                         '<path fill="currentColor" fill-opacity="0.000" d="M0 0"/>')
+        # At the same alpha white is still lighter than black
+        self.assertEqual(normalized('<path fill="rgba(255,255,255,.5)" d="M0 0"/>'),
+                         '<path fill="currentColor" fill-opacity="0.500" d="M0 0"/>')
+        self.assertEqual(normalized('<path style="stroke:#00000080" d="M0 0"/>'),
+                         '<path style="stroke:currentColor;stroke-opacity:0.000" d="M0 0"/>')
+        self.assertAlmostEqual(paint_value('rgba(255,255,255,.99)')[1], 0.99)
+
+
+if __name__ == '__main__':
+    unittest.main()